@@ -4,9 +4,8 @@ from dataclasses import dataclass, field
 import time
 import string
 import secrets
-import hashlib
 from queue import Queue
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Set
 
 import streamlit as st
 import os
@@ -17,11 +16,13 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 if current_dir not in sys.path:
     sys.path.insert(0, current_dir)
 from aptos_sdk.async_client import RestClient
+from utils.client_pool import get_client
+from utils.entropy import generate_entropy_layers
+from utils.challenge_pool import challenge_pool
+from utils.abuse_limiter import SessionState  # re-exported for pages
 from aptos_sdk.account import Account
 from aptos_sdk.transactions import EntryFunction
 from aptos_sdk.bcs import Serializer
-from ecdsa import SigningKey, VerifyingKey, SECP256k1
-from ecdsa.util import sigencode_der, sigdecode_der
 from collections import defaultdict
 from itertools import islice
 import random
@@ -55,6 +56,9 @@ DOMAINS = {
     'cyrillic': "абвгдеёжзийклмнопрстуфхцчшщъыьэюя",
 }
 
+# Pregenerate challenge seeds in the background so 'Start Authentication' is instant
+challenge_pool.start()
+
 COLORS = ["red", "green", "blue", "yellow"]
 DIRECTIONS = ["Up", "Down", "Left", "Right", "Skip"]
 DIRECTION_MAP = {
@@ -68,28 +72,6 @@ SYSTEM_WALLET_PRIVATE_KEY = os.getenv('APTOS_PRIVATE_KEY')
 def generate_nonce() -> str:
     return secrets.token_hex(32)
 
-def keccak256(data: str) -> str:
-    return hashlib.sha3_256(data.encode('utf-8')).hexdigest()
-
-def generate_entropy_layers(seed: str, layers: int) -> List[int]:
-    arr = []
-    cur = seed
-    for _ in range(layers):
-        random_bytes = secrets.token_bytes(2).hex()
-        h = keccak256(cur)
-        val = int(h[:8], 16)
-        arr.append(val)
-        cur = h + random_bytes
-    return arr
-
-@dataclass
-class SessionState:
-    failure_count: int = 0
-    first_failure_ts: Optional[float] = None
-    last_failure_ts: Optional[float] = None
-    d: int = 1
-    high_abuse: bool = False
-
 @dataclass
 class Transaction:
     """Represents a single transaction in the system"""
@@ -99,14 +81,14 @@ class Transaction:
     amount: float  # Amount in APT
     timestamp: float  # Unix timestamp
     is_credit: bool  # True if receiving funds, False if sending
-    status: str  # "completed", "pending", "failed"
+    status: str  # "completed", "pending", "failed", "unknown" (not confirmed in time)
     description: str = ""  # Optional description
 
 @dataclass
 class App:
     queue: Queue = field(default_factory=Queue)
     wallet: Optional[Account] = None
-    client: RestClient = field(default_factory=lambda: RestClient("https://testnet.aptoslabs.com/v1"))
+    client: RestClient = field(default_factory=get_client)  # Shared process-wide pooled client
     system_wallet: Optional[Account] = None
     is_registered: bool = False
     is_authenticated: bool = False
@@ -114,7 +96,9 @@ class App:
     direction_mapping: Dict[str, str] = field(default_factory=dict)
     recent_characters: List[str] = field(default_factory=list)
     favorite_characters: List[str] = field(default_factory=list)
-    transactions: List[Transaction] = field(default_factory=list)  # Track all transactions
+    transactions: List[Transaction] = field(default_factory=list)  # Track all transactions, newest first
+    known_txn_hashes: Set[str] = field(default_factory=set)  # Hashes already in `transactions`
+    history_watermarks: Dict[str, int] = field(default_factory=dict)  # Next sequence number to sync per address
 
     async def get_account_balance(self, address):
         """Get account balance in APT"""
@@ -123,36 +107,72 @@ class App:
             return 0
 
         try:
-            resources = await self.client.account_resources(address)
-            apt_balance = 0
-            for resource in resources:
-                if resource['type'] == '0x1::coin::CoinStore<0x1::aptos_coin::AptosCoin>':
-                    apt_balance = int(resource['data']['coin']['value']) / 100000000  # Convert from octas to APT
-                    break
-            logging.info("Fetch resources , got resources:", resources)
+            # Ask the node for the APT balance only (view function / single resource)
+            from utils.balance import fetch_apt_balance
+            apt_balance = await fetch_apt_balance(self.client, address)
             logging.info(f"Fetched balance for {address}: {apt_balance} APT")
             return apt_balance
         except Exception as e:
             logging.error(f"Error fetching balance for {address}: {str(e)}")
             raise Exception(f"Failed to check balance: {str(e)}")
 
-    def get_account_balance_sync(self, address):
-        """Synchronous wrapper for get_account_balance"""
+    def get_account_balance_sync(self, address, fresh=False):
+        """Synchronous wrapper for get_account_balance.
+
+        Served from the shared balance cache; concurrent callers for the same
+        address share one node request. Pass ``fresh=True`` to bypass the cache.
+        """
         try:
-            # Use our clean nest_asyncio implementation
-            # Important: Create a fresh coroutine each time, never reuse
-            from utils.nest_runner import async_to_sync
-            # We call the function directly to get a fresh coroutine
-            return async_to_sync(self.get_account_balance(address))
-        except ValueError as e:
-            logging.error(f"Coroutine error: {str(e)}")
-            # Try one more time with a new coroutine
-            return async_to_sync(self.get_account_balance(address))
+            from utils.balance_cache import balance_cache
+            return balance_cache.get(address, lambda: self.get_account_balance(address), fresh=fresh)
         except Exception as e:
             logging.error(f"Error in get_account_balance_sync: {str(e)}")
             # Return 0 for balance rather than crashing completely
             return 0.0
 
+    def get_balances(self, addresses=None, concurrency=None):
+        """Fetch balances for many addresses at once.
+
+        Requests fan out concurrently (bounded by ``concurrency``) over the shared
+        connection pool, and successful results also refresh the balance cache.
+
+        Args:
+            addresses: Addresses to look up; defaults to the system wallet, this
+                wallet and every counterparty in ``transactions``
+            concurrency: Max requests in flight
+
+        Returns:
+            BulkBalanceResult with ``balances`` and per-address ``errors``
+        """
+        from utils.balance import fetch_apt_balances
+        from utils.balance_cache import balance_cache
+        from utils.nest_runner import async_to_sync
+
+        if addresses is None:
+            addresses = self.known_addresses()
+        result = async_to_sync(fetch_apt_balances(self.client, addresses, concurrency))
+        for address, balance in result.balances.items():
+            balance_cache.put(address, balance)
+        return result
+
+    def known_addresses(self):
+        """Addresses this app has seen: system wallet, this wallet and transaction counterparties"""
+        addresses = []
+        if self.system_wallet:
+            addresses.append(str(self.system_wallet.address()))
+        elif SYSTEM_WALLET_ADDRESS.startswith("0x") and "NOT_SET" not in SYSTEM_WALLET_ADDRESS:
+            addresses.append(SYSTEM_WALLET_ADDRESS)
+        if self.wallet:
+            addresses.append(str(self.wallet.address()))
+        for txn in self.transactions:
+            addresses.extend(a for a in (txn.sender, txn.recipient) if a and a.startswith("0x"))
+        return list(dict.fromkeys(addresses))
+
+    def prefetch_balance(self, address):
+        """Start fetching a balance in the background so it overlaps other work"""
+        from utils.balance_cache import balance_cache
+        return balance_cache.prefetch(address, lambda: self.get_account_balance(address))
+
     def add_transaction(self, txn_hash, sender, recipient, amount, is_credit=None, status="completed", description=""):
         """Add a transaction to the transaction history"""
         if is_credit is None:
@@ -174,13 +194,76 @@ class App:
             description=description
         )
 
-        # Add to transaction list
-        self.transactions.append(txn)
+        # Add to transaction list, keeping it sorted newest first
+        from utils.history_sync import insert_transaction
+        insert_transaction(self.transactions, self.known_txn_hashes, txn)
         logging.info(f"Added transaction to history: {txn_hash} {'Credit' if is_credit else 'Debit'} {amount} APT")
 
         return txn
 
-    async def fetch_account_transactions(self, address=None, limit=20):
+    def track_transaction(self, txn):
+        """Move a pending transaction to completed/failed in the background once it commits"""
+        from utils.confirmation_tracker import track_transaction
+        return track_transaction(self.client, txn)
+
+    async def fetch_account_transaction_page(self, address, limit=20, start=None):
+        """Fetch one page of an account's transactions, starting at sequence number ``start``
+
+        The body is stream-decoded into compact TransactionRecords; the large
+        changes/events/signature parts are never materialized.
+        """
+        from utils.txn_decoder import fetch_transaction_records
+        return await fetch_transaction_records(self.client, address, limit=limit, start=start)
+
+    def process_account_transactions(self, transactions, address):
+        """Convert node transactions (TransactionRecords or raw dicts) into Transaction records (coin transfers only)"""
+        from utils.txn_decoder import TransactionRecord, record_from_dict
+
+        processed_txns = []
+        for txn in transactions:
+            try:
+                if not isinstance(txn, TransactionRecord):
+                    txn = record_from_dict(txn)
+
+                # Extract basic transaction data
+                txn_hash = txn.hash
+                txn_version = txn.version or 0
+                sender = txn.sender or ''
+                timestamp = txn.timestamp / 1000000  # Convert to seconds
+                function = txn.function or ''
+
+                # Only process coin transfers for now
+                if '0x1::coin::transfer' in function:
+                    args = txn.arguments
+                    if len(args) >= 2:
+                        recipient = args[0]
+                        amount_octas = int(args[1])
+                        amount_apt = amount_octas / 100000000  # Convert octas to APT
+
+                        # Determine if credit or debit
+                        is_credit = recipient == address
+
+                        # Create transaction object
+                        transaction = Transaction(
+                            txn_hash=txn_hash,
+                            sender=sender,
+                            recipient=recipient,
+                            amount=amount_apt,
+                            timestamp=timestamp,
+                            is_credit=is_credit,
+                            status="completed",
+                            description=f"Transaction {txn_version}"
+                        )
+
+                        processed_txns.append(transaction)
+
+            except Exception as e:
+                logging.error(f"Error processing transaction: {str(e)}")
+                continue
+
+        return processed_txns
+
+    async def fetch_account_transactions(self, address=None, limit=20, start=None):
         """Fetch transaction history for the given address from the blockchain"""
         if not address and self.wallet:
             address = str(self.wallet.address())
@@ -190,67 +273,31 @@ class App:
             return []
 
         try:
-            # Use Aptos SDK to get account transactions
-            # We need to handle this differently since AsyncRestClient doesn't have get_account_transactions
-            from utils.aptos_sync import RestClientSync
-
-            # Create a sync client with the same URL as our async client
-            sync_client = RestClientSync(self.client.base_url)
-
-            # Use the sync client to get transactions
-            transactions = sync_client.get_account_transactions(address, limit=limit)
-
-            # Process transactions to identify credits and debits
-            processed_txns = []
-            for txn in transactions:
-                try:
-                    # Extract basic transaction data
-                    txn_hash = txn.get('hash', '')
-                    txn_version = txn.get('version', 0)
-                    sender = txn.get('sender', '')
-                    timestamp = txn.get('timestamp', 0) / 1000000  # Convert to seconds
-
-                    # Extract payload data to determine transaction type and amount
-                    payload = txn.get('payload', {})
-                    function = payload.get('function', '')
-
-                    # Only process coin transfers for now
-                    if '0x1::coin::transfer' in function:
-                        args = payload.get('arguments', [])
-                        if len(args) >= 2:
-                            recipient = args[0]
-                            amount_octas = int(args[1])
-                            amount_apt = amount_octas / 100000000  # Convert octas to APT
-
-                            # Determine if credit or debit
-                            is_credit = recipient == address
-
-                            # Create transaction object
-                            transaction = Transaction(
-                                txn_hash=txn_hash,
-                                sender=sender,
-                                recipient=recipient,
-                                amount=amount_apt,
-                                timestamp=timestamp,
-                                is_credit=is_credit,
-                                status="completed",
-                                description=f"Transaction {txn_version}"
-                            )
-
-                            processed_txns.append(transaction)
-
-                except Exception as e:
-                    logging.error(f"Error processing transaction: {str(e)}")
-                    continue
-
-            return processed_txns
+            transactions = await self.fetch_account_transaction_page(address, limit=limit, start=start)
+            return self.process_account_transactions(transactions, address)
 
         except Exception as e:
             logging.error(f"Error fetching transactions for {address}: {str(e)}")
             return []
 
+    async def sync_account_transactions(self, address):
+        """Fetch only transactions newer than the stored watermark and merge them in.
+
+        Returns:
+            Number of new transactions added to the history
+        """
+        from utils.history_sync import fetch_new_transactions, merge_transactions
+
+        raw_txns, watermark = await fetch_new_transactions(
+            self.fetch_account_transaction_page, address, self.history_watermarks.get(address)
+        )
+        self.history_watermarks[address] = watermark
+        return merge_transactions(
+            self.transactions, self.known_txn_hashes, self.process_account_transactions(raw_txns, address)
+        )
+
     def fetch_account_transactions_sync(self, address=None, limit=20):
-        """Synchronous wrapper for fetch_account_transactions using nest_asyncio"""
+        """Synchronous wrapper for fetch_account_transactions"""
         if not address and self.wallet:
             address = str(self.wallet.address())
 
@@ -259,7 +306,7 @@ class App:
             return []
 
         try:
-            # Use our clean nest_asyncio implementation
+            # Run on the shared background event loop
             from utils.nest_runner import async_to_sync
             return async_to_sync(self.fetch_account_transactions(address, limit=limit))
         except Exception as e:
@@ -273,19 +320,10 @@ class App:
             return False
 
         try:
-            # Fetch transactions from blockchain
-            new_txns = self.fetch_account_transactions_sync(str(self.wallet.address()))
-
-            # Add new transactions that aren't already in our list
-            existing_txn_hashes = {txn.txn_hash for txn in self.transactions}
-
-            for txn in new_txns:
-                if txn.txn_hash not in existing_txn_hashes:
-                    self.transactions.append(txn)
-
-            # Sort by timestamp, most recent first
-            self.transactions.sort(key=lambda x: x.timestamp, reverse=True)
-
+            # Fetch only transactions past the stored watermark and merge them in order
+            from utils.nest_runner import async_to_sync
+            added = async_to_sync(self.sync_account_transactions(str(self.wallet.address())))
+            logging.info(f"Synced {added} new transactions")
             return True
         except Exception as e:
             logging.error(f"Error updating transaction history: {str(e)}")
@@ -420,6 +458,7 @@ pages = {
     "📝 Registration": "registration",
     "🔐 Authentication": "authentication",
     "👤 Account": "account",
+    "🔏 Verify Signatures": "verify_signatures",
 }
 
 # Show Transaction History once wallet is connected
@@ -550,6 +589,12 @@ else:
         page_module.__dict__.update(page_globals)
         spec.loader.exec_module(page_module)
 
+    elif current_page == "verify_signatures":
+        spec = importlib.util.spec_from_file_location("verify_signatures", "pages/verify_signatures.py")
+        page_module = importlib.util.module_from_spec(spec)
+        page_module.__dict__.update(page_globals)
+        spec.loader.exec_module(page_module)
+
 # Footer
 st.sidebar.markdown("---")
 st.sidebar.markdown("Made with ❤️ using Streamlit")
\ No newline at end of file
@@ -1,7 +1,7 @@
 import streamlit as st
 from typing import Dict, List, Callable, Optional
 
-from utils.auth_utils import run_one_round_authentication
+from utils.auth_utils import GRID_STYLESHEET, run_one_round_authentication
 
 def one_round_auth(
     secret: str,
@@ -64,7 +64,7 @@ def one_round_auth(
         return sess['success']
 
     # Display the challenge grid
-    st.markdown(sess['grid_html'], unsafe_allow_html=True)
+    st.markdown(GRID_STYLESHEET + sess['grid_html'], unsafe_allow_html=True)
 
     # Show direction mapping as reference if requested
     if show_reference:
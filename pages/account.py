@@ -4,6 +4,7 @@ import logging
 
 # Import helper functions
 from utils.helpers import redirect_if_direct_access
+from utils.challenge_alphabet import format_codepoints
 
 # Check if accessed directly and redirect if needed
 if redirect_if_direct_access():
@@ -23,7 +24,7 @@ st.code(str(app.wallet.address()))
 
 st.markdown("**Selected Secret:**")
 if app.selected_secret:
-    st.code(f"{app.selected_secret} (U+{ord(app.selected_secret):04X})")
+    st.code(f"{app.selected_secret} ({format_codepoints(app.selected_secret)})")
 else:
     st.info("No secret selected yet")
 
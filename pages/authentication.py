@@ -1,10 +1,12 @@
 import streamlit as st
 import logging
-from collections import defaultdict
-import random
 
 # Import helper functions
 from utils.helpers import redirect_if_direct_access
+from utils.auth_utils import GRID_STYLESHEET, OnePVerifier
+from utils.abuse_limiter import abuse_limiter
+from utils.challenge_pool import challenge_pool
+from utils.challenge_token import ChallengeTokenError, issue_token, read_token
 
 # Check if accessed directly and redirect if needed
 if redirect_if_direct_access():
@@ -19,7 +21,7 @@ from pages import app
 # Get access to necessary variables
 try:
     # Try to get from the main app
-    from app import SessionState, generate_nonce, generate_entropy_layers, DOMAINS, COLORS, DIRECTIONS, DIRECTION_MAP
+    from app import SessionState, generate_nonce, DOMAINS, COLORS, DIRECTIONS, DIRECTION_MAP
 except ImportError:
     # Fallback to session state if direct page access
     logging.info("Direct page access detected, using session state for app variables")
@@ -43,7 +45,6 @@ except ImportError:
         DIRECTIONS = st.session_state.DIRECTIONS
         DIRECTION_MAP = st.session_state.DIRECTION_MAP
         generate_nonce = st.session_state.get('generate_nonce')
-        generate_entropy_layers = st.session_state.get('generate_entropy_layers')
     else:
         # Provide defaults if not available
         logging.warning("Missing app constants, using defaults")
@@ -53,21 +54,10 @@ except ImportError:
         DIRECTION_MAP = {"Up": "U", "Down": "D", "Left": "L", "Right": "R", "Skip": "S"}
 
         # Define fallback functions
-        import secrets, hashlib
+        import secrets
         def generate_nonce():
             return secrets.token_hex(32)
 
-        def generate_entropy_layers(seed, layers):
-            arr = []
-            cur = seed
-            for _ in range(layers):
-                random_bytes = secrets.token_bytes(2).hex()
-                h = hashlib.sha3_256(cur.encode('utf-8')).hexdigest()
-                val = int(h[:8], 16)
-                arr.append(val)
-                cur = h + random_bytes
-            return arr
-
 if not app.wallet:
     st.error("❌ Please connect a wallet first")
     st.info("👈 Go to 'Import/Generate Wallet' to get started")
@@ -96,127 +86,52 @@ st.markdown("""
 4. **Verification** - System verifies your responses
 """)
 
-# Initialize 1P verifier and solver components
-class OnePVerifier:
-    def __init__(self, secret: str, public_key_hex: str):
-        self.secret = secret
-        self.public_key = public_key_hex
-        self.session_state = SessionState()
-        self.nonce = None
-        self.entropy_layers = []
-        self.offsets = []
-        self.rotateds = []
-        self.color_maps = []
-        self.expected_solutions = []
-        self.skip_rounds = []
-
-    def start_session(self) -> tuple[str, List[str], int]:
-        self.nonce = generate_nonce()
-        difficulty = self.session_state.d
-        total_rounds = difficulty + (difficulty // 2)
-        self.entropy_layers = generate_entropy_layers(self.nonce, total_rounds)
-        rounds_range = list(range(total_rounds))
-        self.skip_rounds = sorted(random.sample(rounds_range, k=total_rounds - difficulty))
-
-        self.offsets = []
-        self.rotateds = []
-        self.color_maps = []
-        self.expected_solutions = []
-        grids = []
-
-        # Build combined alphabet from all selected domains
-        alphabet = ""
-        for domain_chars in DOMAINS.values():
-            alphabet += domain_chars
-        alphabet = ''.join(set(alphabet))  # Remove duplicates
-
-        for idx in range(total_rounds):
-            offset = self.entropy_layers[idx] % len(alphabet)
-            self.offsets.append(offset)
-            rotated = alphabet[offset:] + alphabet[:offset]
-            self.rotateds.append(rotated)
-            color_map = {rotated[i]: COLORS[i % 4] for i in range(len(rotated))}
-            self.color_maps.append(color_map)
-
-            if idx in self.skip_rounds:
-                expected = "S"
-            else:
-                assigned_color = color_map.get(self.secret, None)
-                if assigned_color is None:
-                    expected = "S"
-                else:
-                    direction = app.direction_mapping.get(assigned_color, "Skip")
-                    expected = DIRECTION_MAP[direction]
-
-            self.expected_solutions.append(expected)
-            grids.append(self.display_grid(idx))
-
-        return self.nonce, grids, total_rounds
-
-    def display_grid(self, idx: int) -> str:
-        chars_by_color = defaultdict(list)
-        for ch, color in self.color_maps[idx].items():
-            chars_by_color[color].append(ch)
-
-        grid_html = f"""
-        <div style="border: 2px solid #333; padding: 15px; margin: 10px; background: #f8f9fa; border-radius: 8px;">
-        <h4>🎯 Round {idx + 1}</h4>
-        <p><strong>Find your secret character and note its color!</strong></p>
-        """
-
-        color_hex_map = {"red": "#FF0000", "green": "#00AA00", "blue": "#0066FF", "yellow": "#FFD700"}
-
-        for color in COLORS:
-            chars = chars_by_color[color]
-            if chars:
-                grid_html += f'<div style="margin: 8px 0;"><strong style="color: {color_hex_map[color]};">{color.upper()}:</strong> '
-                for char in chars:
-                    grid_html += f'<span style="color: {color_hex_map[color]}; font-size: 18px; margin: 2px; padding: 4px; background: white; border-radius: 4px;">{char}</span> '
-                grid_html += '</div>'
-
-        grid_html += '</div>'
-        return grid_html
-
-    def verify_solution(self, candidates: List[str]) -> bool:
-        allowed_skips = len(self.skip_rounds)
-        input_skips = candidates.count('S')
-
-        if input_skips > allowed_skips:
-            return False
-
-        for idx, expected in enumerate(self.expected_solutions):
-            if expected == "S":
-                if candidates[idx] != "S":
-                    return False
-            else:
-                if candidates[idx] == "S":
-                    continue
-                if candidates[idx].upper() != expected:
-                    return False
-
-        return True
+
+def make_verifier(difficulty: int) -> OnePVerifier:
+    # Cheap to build: the alphabet is shared and rounds come from the challenge token
+    public_key_hex = app.wallet.public_key().to_bytes()[1:].hex()
+    return OnePVerifier(app.selected_secret, public_key_hex, app.direction_mapping,
+                        COLORS, DIRECTION_MAP, DOMAINS, difficulty=difficulty)
+
+
+def verifier_from_token(token: str) -> OnePVerifier:
+    # Rebuilt from the signed token on every rerun; nothing else is stored
+    seed = read_token(token, str(app.wallet.address()))
+    verifier = make_verifier(seed.difficulty)
+    verifier.start_from(seed)
+    return verifier
+
 
 # Start authentication session
 st.markdown("---")
 st.subheader("🎯 1P Challenge")
 
+if app.auth_session is not None and 'token' not in app.auth_session:
+    # Session started before challenges were stored as tokens; start over
+    app.auth_session = None
+
 if app.auth_session is None:
+    # Recent failures for this wallet raise the difficulty, then block
+    abuse = abuse_limiter.state(str(app.wallet.address()))
+    if abuse.high_abuse:
+        st.error(f"🚫 Too many failed attempts ({abuse.failure_count}). Please try again later.")
+        st.stop()
+    if abuse.d > 1:
+        st.warning(f"⚠️ {abuse.failure_count} recent failed attempts: this challenge has {abuse.d} rounds to answer")
+
     st.info("Click 'Start Authentication' to begin the challenge")
 
     if st.button("🚀 Start Authentication", type="primary"):
         try:
-            # Create verifier with user's secret and public key
-            public_key_hex = app.wallet.public_key().to_bytes()[1:].hex()
-            verifier = OnePVerifier(app.selected_secret, public_key_hex)
-            nonce, grids, total_rounds = verifier.start_session()
+            # Pregenerated seed: no hashing in the click handler
+            seed = challenge_pool.take(abuse.d)
 
+            # Only the signed challenge and progress are kept; grids are rendered per round
             app.auth_session = {
-                'verifier': verifier,
-                'grids': grids,
-                'total_rounds': total_rounds,
+                'token': issue_token(seed, str(app.wallet.address())),
+                'total_rounds': len(seed.entropy_layers),
                 'current_round': 0,
                 'solutions': [],
-                'nonce': nonce
             }
             app.save_to_session()
             st.rerun()
@@ -228,11 +143,22 @@ else:
     current_round = session['current_round']
     total_rounds = session['total_rounds']
 
+    try:
+        verifier = verifier_from_token(session['token'])
+    except ChallengeTokenError as e:
+        st.error(f"❌ {e}. Please start a new challenge.")
+        if st.button("🔄 New Challenge", type="secondary"):
+            app.auth_session = None
+            app.save_to_session()
+            st.rerun()
+        st.stop()
+
     if current_round < total_rounds:
         st.progress((current_round) / total_rounds, f"Round {current_round + 1} of {total_rounds}")
 
         # Display current grid
-        st.markdown(session['grids'][current_round], unsafe_allow_html=True)
+        st.markdown(GRID_STYLESHEET + verifier.display_grid(current_round),
+                    unsafe_allow_html=True)
 
         # Show direction mapping as reference
         with st.expander("🧭 Your Direction Mapping Reference"):
@@ -272,6 +198,10 @@ else:
 
                 session['solutions'].append(direction_code)
                 session['current_round'] += 1
+                if session['current_round'] == total_rounds:
+                    # Checked once, on submission, so reruns never count it again
+                    session['verified'] = verifier.verify_attempt(
+                        session['solutions'], abuse_limiter, str(app.wallet.address()))
                 app.auth_session = session
                 app.save_to_session()
                 st.rerun()
@@ -281,10 +211,7 @@ else:
         st.success("🎉 All rounds completed!")
         st.info("Verifying your responses...")
 
-        verifier = session['verifier']
-        solutions = session['solutions']
-
-        if verifier.verify_solution(solutions):
+        if session.get('verified'):
             app.is_authenticated = True
             app.auth_session = None  # Clear session
             app.save_to_session()
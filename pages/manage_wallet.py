@@ -1,8 +1,15 @@
 import streamlit as st
 import logging
+import json
 
 # Import helper functions
 from utils.helpers import redirect_if_direct_access
+from utils.balance_cache import balance_cache
+from utils.challenge_alphabet import format_codepoints
+from utils.crypto_backend import use_backend
+from utils.signature_verifier import public_key_hex
+from utils.gas import GAS_SPEEDS, TRANSFER_MAX_GAS_AMOUNT, gas_estimator
+from utils.transfer_utils import transfer_apt_sync
 
 # Check if accessed directly and redirect if needed
 if redirect_if_direct_access():
@@ -36,6 +43,7 @@ with st.spinner("Checking your wallet balance..."):
 
         # Add a refresh button
         if st.button("🔄 Refresh Balance", type="secondary"):
+            balance_cache.invalidate(app.wallet.address())
             st.rerun()
 
     except Exception as e:
@@ -67,12 +75,24 @@ else:
             format="%.8f"
         )
 
+        speed = st.radio(
+            "Transaction Speed",
+            GAS_SPEEDS,
+            index=GAS_SPEEDS.index("normal"),
+            horizontal=True,
+            format_func=str.title,
+            help="Prioritized pays a higher gas price for faster inclusion"
+        )
+
+        # Cached estimate; only the very first render waits for the node
+        gas = gas_estimator.get(app.client, timeout=3)
+
         st.markdown("**Transaction Preview:**")
         st.markdown(f"""
         - **From:** Your Authenticated Wallet
         - **To:** `{recipient_address[:20] + '...' if len(recipient_address) > 20 else recipient_address}`
         - **Amount:** {amount} APT
-        - **Fee:** ~0.001 APT (estimated)
+        - **Fee:** ~{gas.fee_apt(speed):.8f} APT at {gas.price(speed)} octas/gas (max {gas.fee_apt(speed, TRANSFER_MAX_GAS_AMOUNT):.8f} APT)
         """)
 
         send_transaction = st.form_submit_button("🚀 Send Transaction", type="primary")
@@ -83,77 +103,45 @@ else:
         elif len(recipient_address) < 10:
             st.error("Invalid recipient address")
         else:
-            with st.spinner("Processing transaction through system wallet..."):
-                try:
-                    # Create transaction from system wallet
-                    amount_in_octas = int(amount * 100000000)
-
-                    # Create BCS serializer for the amount
-                    serializer = Serializer()
-                    serializer.u64(amount_in_octas)
-                    serialized_amount = serializer.output()
-
-                    # Make the transaction process more robust
-                    try:
-                        payload = EntryFunction.natural(
-                            "0x1::coin",
-                            "transfer",
-                            ["0x1::aptos_coin::AptosCoin"],
-                            [recipient_address, serialized_amount]
-                        )
-
-                        # Create and submit transaction - handling potential async issues
-                        from utils.aptos_sync import RestClientSync
-                        # Use the sync wrapper to ensure compatibility with streamlit
-                        sync_client = RestClientSync("https://testnet.aptoslabs.com/v1")
-
-                        # Create and process the transaction
-                        with st.spinner("Creating transaction..."):
-                            txn = sync_client.create_transaction(app.system_wallet.address(), payload)
-
-                        with st.spinner("Signing transaction..."):
-                            signed_txn = app.system_wallet.sign_transaction(txn)
-
-                        with st.spinner("Submitting transaction..."):
-                            txn_hash = sync_client.submit_transaction(signed_txn)
-
-                        with st.spinner("Waiting for confirmation..."):
-                            sync_client.wait_for_transaction(txn_hash, timeout=30)
-
-                    except Exception as e:
-                        st.error(f"Transaction failed: {str(e)}")
-                        st.warning("Please try again later.")
-
-                    # Record transaction in our history
-                    app.add_transaction(
-                        txn_hash=txn_hash,
-                        sender=str(app.system_wallet.address()),
-                        recipient=recipient_address,
-                        amount=amount,
-                        is_credit=False,
-                        status="completed",
-                        description=f"Transfer to {recipient_address[:10]}..."
-                    )
-
-                    st.session_state.app = app
-                    app.save_to_session()
-
-                    st.success("✅ Transaction sent successfully!")
-                    st.success(f"📋 Transaction Hash: `{txn_hash}`")
-                    st.markdown("📋 You can view this transaction in your **Transaction History** page")
-
-                    # Show transaction details
-                    with st.expander("Transaction Details", expanded=True):
-                        st.markdown(f"""
-                        - **Hash:** `{txn_hash}`
-                        - **From:** Your Authenticated Wallet
-                        - **To:** `{recipient_address}`
-                        - **Amount:** {amount} APT
-                        - **Status:** Confirmed ✅
-                        """)
-
-                except Exception as e:
-                    st.error(f"❌ Transaction failed: {str(e)}")
+            with st.spinner("Submitting transaction through system wallet..."):
+                # Sequence numbers are allocated locally, so concurrent sends don't race;
+                # returns once the node accepts the transaction
+                success, txn_hash, error = transfer_apt_sync(
+                    app.system_wallet, recipient_address, amount, app.client.base_url, speed=speed
+                )
+
+            if not success:
+                st.error(f"❌ Transaction failed: {error}")
+                st.warning("Please try again later.")
+            else:
+                # Record as pending; the confirmation tracker updates the status
+                txn = app.add_transaction(
+                    txn_hash=txn_hash,
+                    sender=str(app.system_wallet.address()),
+                    recipient=recipient_address,
+                    amount=amount,
+                    is_credit=False,
+                    status="pending",
+                    description=f"Transfer to {recipient_address[:10]}..."
+                )
+                app.track_transaction(txn)
+
+                st.session_state.app = app
+                app.save_to_session()
+
+                st.success("✅ Transaction submitted!")
+                st.success(f"📋 Transaction Hash: `{txn_hash}`")
+                st.markdown("📋 You can view this transaction in your **Transaction History** page")
+
+                # Show transaction details
+                with st.expander("Transaction Details", expanded=True):
+                    st.markdown(f"""
+                    - **Hash:** `{txn_hash}`
+                    - **From:** Your Authenticated Wallet
+                    - **To:** `{recipient_address}`
+                    - **Amount:** {amount} APT
+                    - **Status:** Pending ⏳ (updates automatically once confirmed)
+                    """)
 
 # Message signing
 st.markdown("---")
@@ -175,8 +163,9 @@ with st.form("sign_message"):
         else:
             try:
                 # Sign with original wallet for authenticity
-                signature = app.wallet.sign(message_to_sign.encode())
-                signature_hex = signature.hex()
+                signature = use_backend(app.wallet).sign(message_to_sign.encode())
+                signature_hex = str(signature)
+                public_key = public_key_hex(app.wallet)
 
                 st.success("✅ Message signed successfully!")
 
@@ -187,6 +176,15 @@ with st.form("sign_message"):
                     st.code(signature_hex)
                     st.markdown("**Signer Address:**")
                     st.code(str(app.wallet.address()))
+                    st.markdown("**Public Key:**")
+                    st.code(public_key)
+                    st.markdown("**Export line** (for 🔏 Verify Signatures):")
+                    st.code(json.dumps({
+                        'public_key': public_key,
+                        'message': message_to_sign,
+                        'signature': signature_hex,
+                        'address': str(app.wallet.address()),
+                    }, ensure_ascii=False), language="json")
 
             except Exception as e:
                 st.error(f"❌ Signing failed: {str(e)}")
@@ -216,7 +214,7 @@ with col2:
         st.markdown(f"""
         **Wallet Address:** `{app.wallet.address()}`
 
-        **Selected Secret:** {app.selected_secret} (U+{ord(app.selected_secret):04X})
+        **Selected Secret:** {app.selected_secret} ({format_codepoints(app.selected_secret)})
 
         **Registration Status:** ✅ Registered
 
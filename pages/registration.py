@@ -1,15 +1,20 @@
 import streamlit as st
 import logging
-from utils.transfer_utils import transfer_apt_sync
+from utils.transfer_utils import is_unconfirmed, transfer_apt_sync
+from utils.balance_cache import balance_cache
 from components.auth_component import one_round_auth
 
 # Import helper functions
 from utils.helpers import redirect_if_direct_access
+from utils.challenge_alphabet import format_codepoints, split_graphemes
 
 # Check if accessed directly and redirect if needed
 if redirect_if_direct_access():
     st.stop()
 
+# Seconds to wait for the registration payment to commit
+REGISTRATION_CONFIRMATION_TIMEOUT = 30
+
 from pages import app
 
 # Registration Page
@@ -85,7 +90,7 @@ if not available_chars:
     st.stop()
 
 # Apply search filter if provided
-chars_list = list(set(available_chars))  # Remove duplicates
+chars_list = list(dict.fromkeys(split_graphemes(available_chars)))  # Whole characters, no duplicates
 
 if search_term:
     # Simple filtering mechanism
@@ -154,7 +159,7 @@ for row_idx, row in enumerate(rows):
     cols = st.columns(len(row))
     for col_idx, char in enumerate(row):
         with cols[col_idx]:
-            unicode_info = f"\\nU+{ord(char):04X}" if show_unicode else ""
+            unicode_info = f"\\n{format_codepoints(char)}" if show_unicode else ""
             if st.button(f"{char}{unicode_info}",
                          key=f"char_{row_idx}_{col_idx}_p{page_num}",
                          use_container_width=True):
@@ -205,7 +210,7 @@ if not app.selected_secret and (app.recent_characters or app.favorite_characters
 
 # Show selected secret
 if app.selected_secret:
-    st.success(f"✅ Selected secret: **{app.selected_secret}** (U+{ord(app.selected_secret):04X})")
+    st.success(f"✅ Selected secret: **{app.selected_secret}** ({format_codepoints(app.selected_secret)})")
 
     # Add selected character to recent list if not already there
     if app.selected_secret not in app.recent_characters:
@@ -330,6 +335,7 @@ if app.selected_secret and app.direction_mapping and app.registration_auth and a
 
             # Add refresh button
             if st.button("🔄 Refresh Balance", type="secondary"):
+                balance_cache.invalidate(app.wallet.address())
                 st.rerun()
 
         except Exception as e:
@@ -382,8 +388,8 @@ if app.selected_secret and app.direction_mapping and app.registration_auth and a
     if confirm_registration and st.button("🚀 Complete Registration", type="primary"):
         with st.spinner("Processing registration..."):
             try:
-                # Check user wallet balance first
-                apt_balance = app.get_account_balance_sync(app.wallet.address())
+                # Check user wallet balance first, bypassing the cache before moving funds
+                apt_balance = app.get_account_balance_sync(app.wallet.address(), fresh=True)
 
                 if apt_balance < transfer_amount:
                     st.error(f"❌ Insufficient balance: You have {apt_balance} APT but are trying to transfer {transfer_amount} APT")
@@ -395,9 +401,28 @@ if app.selected_secret and app.direction_mapping and app.registration_auth and a
                     success, txn_hash, error_msg = transfer_apt_sync(
                         sender_account=app.wallet,
                         recipient_address=SYSTEM_WALLET_ADDRESS,
-                        amount_apt=transfer_amount
+                        amount_apt=transfer_amount,
+                        wait=True,  # registration requires the payment to be on chain
+                        timeout=REGISTRATION_CONFIRMATION_TIMEOUT
                     )
 
+                    if not success and is_unconfirmed(error_msg):
+                        # Sent, but not committed in time: don't invite a second payment
+                        txn = app.add_transaction(
+                            txn_hash=txn_hash,
+                            sender=str(app.wallet.address()),
+                            recipient=SYSTEM_WALLET_ADDRESS,
+                            amount=transfer_amount,
+                            is_credit=False,
+                            status="pending",
+                            description="1P Wallet Registration"
+                        )
+                        app.track_transaction(txn)
+                        app.save_to_session()
+                        st.warning(f"⏳ Payment `{txn_hash}` is still pending confirmation; it may still commit.")
+                        st.info("Check its status in **Transaction History** before paying again.")
+                        st.stop()
+
                     if not success:
                         st.error(f"Transaction failed: {error_msg}")
                         st.warning("Please check your balance and try again.")
@@ -429,7 +454,7 @@ if app.selected_secret and app.direction_mapping and app.registration_auth and a
                 with st.expander("Registration Summary", expanded=True):
                     st.markdown(f"""
                     - **Wallet:** `{app.wallet.address()}`
-                    - **Secret:** {app.selected_secret} (U+{ord(app.selected_secret):04X})
+                    - **Secret:** {app.selected_secret} ({format_codepoints(app.selected_secret)})
                     - **Amount Transferred:** {transfer_amount} APT
                     - **Transaction:** `{txn_hash}`
                     - **System Wallet:** `{SYSTEM_WALLET_ADDRESS}`
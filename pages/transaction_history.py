@@ -2,6 +2,7 @@
 # This page displays the user's transaction history, showing credits and debits
 
 import streamlit as st
+import time
 import logging
 
 # Import helper functions
@@ -21,6 +22,9 @@ if not app.wallet:
     st.info("👈 Go to 'Import/Generate Wallet' to get started")
     st.stop()
 
+# Start the balance lookup now so it runs alongside the history sync below
+app.prefetch_balance(app.wallet.address())
+
 # Button to refresh transaction history
 col1, col2 = st.columns([3, 1])
 with col1:
@@ -75,6 +79,14 @@ else:
 st.markdown("---")
 st.subheader("📝 Transaction List")
 
+pending_count = sum(1 for txn in app.transactions if txn.status == "pending")
+if pending_count:
+    st.info(f"⏳ {pending_count} transaction(s) pending confirmation; statuses update in the background")
+unknown_count = sum(1 for txn in app.transactions if txn.status == "unknown")
+if unknown_count:
+    st.warning(f"❔ {unknown_count} transaction(s) were not confirmed in time and may still commit; "
+               "check them on the explorer")
+
 if app.transactions:
     # Create tabs for all/credits/debits
     tab1, tab2, tab3 = st.tabs(["All Transactions", "Credits (Received)", "Debits (Sent)"])
@@ -0,0 +1,68 @@
+# Verify Signatures Page
+# Bulk-verifies signed messages uploaded as JSON Lines (one per line, as
+# exported by the "Sign Message" form in Manage Wallet)
+
+import streamlit as st
+import logging
+import io
+import json
+import time
+
+# Import helper functions
+from utils.helpers import redirect_if_direct_access
+from utils.signature_verifier import VERIFY_WORKERS, verify_lines
+
+# Check if accessed directly and redirect if needed
+if redirect_if_direct_access():
+    st.stop()
+
+st.header("🔏 Verify Signatures")
+st.markdown("Upload a `.jsonl` file with one signed message per line:")
+st.code('{"public_key": "0x…", "message": "…", "signature": "0x…", "address": "0x… (optional)"}', language="json")
+
+uploaded = st.file_uploader("Signed messages (JSON Lines)", type=["jsonl", "json", "txt"])
+
+if uploaded is not None and st.button("🔍 Verify", type="primary"):
+    results = []
+    progress = st.empty()
+    started = time.perf_counter()
+    try:
+        # Lines are streamed to the worker pool as they are read
+        for result in verify_lines(io.TextIOWrapper(uploaded, encoding="utf-8", errors="replace")):
+            results.append(result._asdict())
+            if len(results) % 1000 == 0:
+                progress.text(f"Verified {len(results):,} rows...")
+    except Exception as e:
+        logging.exception("Signature verification failed")
+        st.error(f"❌ Verification failed: {str(e)}")
+        st.stop()
+    elapsed = time.perf_counter() - started
+    progress.empty()
+
+    if not results:
+        st.warning("The file contains no rows")
+        st.stop()
+
+    valid = sum(1 for row in results if row['valid'])
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Rows", f"{len(results):,}")
+    with col2:
+        st.metric("Valid", f"{valid:,}")
+    with col3:
+        st.metric("Invalid", f"{len(results) - valid:,}")
+    st.caption(f"Verified in {elapsed:.2f}s ({len(results) / max(elapsed, 1e-9):,.0f} rows/s, "
+               f"up to {VERIFY_WORKERS} worker processes)")
+
+    if valid == len(results):
+        st.success("✅ All signatures are valid")
+    else:
+        st.error(f"❌ {len(results) - valid:,} rows failed verification")
+
+    st.dataframe(results, use_container_width=True)
+    st.download_button(
+        "📥 Download Results",
+        data="\n".join(json.dumps(row) for row in results),
+        file_name="verification_results.jsonl",
+        mime="application/jsonl",
+    )
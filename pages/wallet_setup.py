@@ -9,6 +9,7 @@ from aptos_sdk.account import Account
 
 # Import helper functions
 from utils.helpers import redirect_if_direct_access
+from utils.crypto_backend import generate_account
 
 # Check if accessed directly and redirect if needed
 if redirect_if_direct_access():
@@ -56,7 +57,7 @@ with col1:
     if st.button("Generate New Wallet", type="primary"):
         with st.spinner("Generating wallet..."):
             try:
-                app.wallet = Account.generate_secp256k1_ecdsa()
+                app.wallet = generate_account()
                 # Cache in session_state so the wallet persists during this browser session
                 # Persist wallet to session
                 app.save_to_session()
@@ -119,30 +120,18 @@ if app.wallet:
         if st.button("Request Testnet APT", type="secondary"):
             with st.spinner("🔄 Requesting tokens from faucet..."):
                 try:
-                    # Try to request tokens directly from Aptos testnet faucet
-                    import requests
-                    import json
-
-                    # Default faucet URL for Aptos testnet
-                    faucet_url = "https://faucet.testnet.aptoslabs.com/v1/fund"
-
-                    # Prepare the request payload
-                    payload = {
-                        "address": str(app.wallet.address()),
-                        "amount": 100000000,  # 1 APT in octas
-                    }
-
-                    # Make the request to the faucet
-                    response = requests.post(
-                        faucet_url,
-                        json=payload,
-                        headers={"Content-Type": "application/json"}
+                    # Request tokens from the Aptos testnet faucet on the shared async client
+                    from utils.faucet import request_faucet_funds
+                    from utils.nest_runner import async_to_sync
+
+                    success, txn_hash, error_msg = async_to_sync(
+                        request_faucet_funds(str(app.wallet.address()), 100000000)  # 1 APT in octas
                     )
 
-                    if response.status_code == 200:
-                        result = response.json()
-                        txn_hash = result.get('txn_hash', 'Unknown')
+                    if success:
                         st.success(f"✅ Successfully requested tokens!")
+                        from utils.balance_cache import balance_cache
+                        balance_cache.invalidate(app.wallet.address())
                         st.info(f"Transaction hash: `{txn_hash}`")
 
                         # Record the faucet transaction in our history
@@ -162,7 +151,7 @@ if app.wallet:
                         if st.button("Check Updated Balance"):
                             st.rerun()
                     else:
-                        st.error(f"Failed to request tokens: {response.text}")
+                        st.error(f"Failed to request tokens: {error_msg}")
                         st.info("Try using the manual faucet option below")
 
                         # Provide manual instructions as fallback
@@ -191,8 +180,8 @@ if app.wallet:
     if st.button("Check Balance", type="secondary"):
         with st.spinner("Checking balance..."):
             try:
-                # Get APT balance using the sync helper method
-                apt_balance = app.get_account_balance_sync(app.wallet.address())
+                # Get APT balance using the sync helper method (explicit check, skip the cache)
+                apt_balance = app.get_account_balance_sync(app.wallet.address(), fresh=True)
 
                 st.success(f"💰 Balance: **{apt_balance} APT**")
 
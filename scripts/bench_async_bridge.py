@@ -0,0 +1,93 @@
+"""
+Micro-benchmark: per-call overhead of the sync->async bridge.
+
+Compares the background-loop ``async_to_sync`` in utils.nest_runner with the
+two approaches it replaced:
+
+  * legacy nest_runner: grab/create a per-thread loop and run_until_complete
+  * legacy streamlit_async: new ThreadPoolExecutor + new event loop per call
+
+The background loop pays one cross-thread hop per call, so a bare
+run_until_complete on an already-warm per-thread loop is cheaper per call.
+What the bridge buys is that every call lands on the same loop, so pooled
+clients stay valid and no loop or executor is built and torn down per call.
+
+Usage:
+    python scripts/bench_async_bridge.py [--calls 5000]
+"""
+
+import argparse
+import asyncio
+import concurrent.futures
+import os
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.nest_runner import async_to_sync, submit  # noqa: E402
+
+
+async def noop():
+    await asyncio.sleep(0)
+    return 1
+
+
+def legacy_run_coroutine(coro):
+    try:
+        warnings.simplefilter("ignore", DeprecationWarning)
+        loop = asyncio.get_event_loop()
+        if loop.is_closed():
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+    except RuntimeError:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+    return loop.run_until_complete(coro)
+
+
+def legacy_thread_pool(coro_fn):
+    def run():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            return loop.run_until_complete(coro_fn())
+        finally:
+            loop.close()
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(run).result(timeout=60)
+
+
+def bench(label, fn, calls):
+    fn()  # warm-up
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<38} {elapsed / calls * 1e6:10.1f} us/call  {calls / elapsed:12.0f} calls/s")
+
+
+def bench_pipelined(label, calls):
+    start = time.perf_counter()
+    futures = [submit(noop()) for _ in range(calls)]
+    for f in futures:
+        f.result()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<38} {elapsed / calls * 1e6:10.1f} us/call  {calls / elapsed:12.0f} calls/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=5000)
+    args = parser.parse_args()
+
+    bench("async_to_sync (background loop)", lambda: async_to_sync(noop()), args.calls)
+    bench_pipelined("submit() pipelined futures", args.calls)
+    bench("legacy per-thread run_until_complete", lambda: legacy_run_coroutine(noop()), args.calls)
+    bench("legacy executor + new loop per call", lambda: legacy_thread_pool(noop), max(args.calls // 10, 1))
+
+
+if __name__ == "__main__":
+    main()
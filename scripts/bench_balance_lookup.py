@@ -0,0 +1,91 @@
+"""
+Benchmark: targeted balance lookup vs. scanning account_resources.
+
+Runs against a local fake node by default (with an account holding
+``--resources`` resources), or against a real node with ``--node-url`` and
+``--address``. Reports response bytes and mean latency per lookup.
+
+Usage:
+    python scripts/bench_balance_lookup.py [--resources 500] [--iterations 200]
+    python scripts/bench_balance_lookup.py --node-url https://testnet.aptoslabs.com/v1 --address 0x...
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.fake_node import FakeNode  # noqa: E402
+from utils.balance import APT_COIN_STORE, fetch_apt_balance_octas  # noqa: E402
+from utils.client_pool import get_client  # noqa: E402
+from utils.nest_runner import async_to_sync  # noqa: E402
+
+
+async def scan_resources(client, address):
+    """The previous implementation: download everything and scan."""
+    response = await client._get(endpoint=f"accounts/{address}/resources")
+    for resource in response.json():
+        if resource['type'] == APT_COIN_STORE:
+            return int(resource['data']['coin']['value']), len(response.content)
+    return 0, len(response.content)
+
+
+async def view_balance(client, address):
+    response = await client.client.post(
+        f"{client.base_url}/view",
+        json={"function": "0x1::coin::balance",
+              "type_arguments": ["0x1::aptos_coin::AptosCoin"],
+              "arguments": [address]},
+    )
+    return int(response.json()[0]), len(response.content)
+
+
+async def single_resource(client, address):
+    response = await client._get(endpoint=f"accounts/{address}/resource/{APT_COIN_STORE}")
+    return int(response.json()['data']['coin']['value']), len(response.content)
+
+
+def bench(label, fn, iterations):
+    value, size = async_to_sync(fn())  # warm-up, and payload size
+    start = time.perf_counter()
+    for _ in range(iterations):
+        async_to_sync(fn())
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34} {size:>10,d} bytes  {elapsed / iterations * 1000:8.2f} ms/lookup  (balance {value})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resources", type=int, default=500)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--node-url")
+    parser.add_argument("--address", default="0x" + "ab" * 32)
+    args = parser.parse_args()
+
+    node = None
+    node_url = args.node_url
+    if node_url is None:
+        node = FakeNode(resource_count=args.resources).start()
+        node_url = node.url
+        print(f"Fake node with {args.resources} resources at {node_url}")
+
+    client = get_client(node_url)
+    address = args.address
+    try:
+        bench("account_resources scan (old)", lambda: scan_resources(client, address), args.iterations)
+        bench("single CoinStore resource", lambda: single_resource(client, address), args.iterations)
+        bench("coin::balance view", lambda: view_balance(client, address), args.iterations)
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            async_to_sync(fetch_apt_balance_octas(client, address))
+        elapsed = time.perf_counter() - start
+        print(f"{'fetch_apt_balance_octas (new)':<34} {'':>16}  {elapsed / args.iterations * 1000:8.2f} ms/lookup")
+    finally:
+        if node is not None:
+            node.stop()
+
+
+if __name__ == "__main__":
+    main()
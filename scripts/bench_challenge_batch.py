@@ -0,0 +1,78 @@
+"""
+Benchmark: challenges generated and solved per second, scalar vs. batch.
+
+The scalar path is one OnePVerifier per challenge (start_session +
+expected_solutions + verify_solution). The batch path is
+utils.challenge_batch.generate_challenges + check_answers over the same
+nonces, secrets and mappings. The "hashing" line is the part of the batch
+path that stays in Python: deriving entropy layers and skip keys per nonce.
+
+Usage:
+    python scripts/bench_challenge_batch.py [--challenges 100000] [--difficulty 2]
+"""
+
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.auth_utils import OnePVerifier  # noqa: E402
+from utils.challenge_alphabet import ChallengeAlphabet  # noqa: E402
+from utils.challenge_batch import (  # noqa: E402
+    check_answers, encode_mapping, entropy_matrix, generate_challenges, skip_matrix, total_rounds
+)
+from utils.helpers import generate_nonce  # noqa: E402
+
+COLORS = ["red", "green", "blue", "yellow"]
+DIRECTION_MAP = {"Up": "U", "Down": "D", "Left": "L", "Right": "R", "Skip": "S"}
+DOMAINS = {
+    'ascii': string.ascii_letters + string.digits,
+    'emojis': "".join(chr(c) for c in range(0x1F300, 0x1F3C0)),
+    'japanese': "".join(chr(c) for c in range(0x3042, 0x3094, 2)),
+}
+
+
+def report(label, count, elapsed):
+    print(f"{label:<8} {count:>9,} challenges  {elapsed:7.2f} s  {count / elapsed:12,.0f} challenges/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--challenges", type=int, default=100000)
+    parser.add_argument("--difficulty", type=int, default=2)
+    args = parser.parse_args()
+
+    alphabet = ChallengeAlphabet(DOMAINS)
+    rng = random.Random(0)
+    nonces = [generate_nonce() for _ in range(args.challenges)]
+    secrets = [rng.choice(alphabet.chars) for _ in range(args.challenges)]
+    mapping = dict(zip(COLORS, ["Up", "Down", "Left", "Right"]))
+
+    scalar_count = max(args.challenges // 10, 1)
+    start = time.perf_counter()
+    for nonce, secret in zip(nonces[:scalar_count], secrets):
+        verifier = OnePVerifier(secret, "00", mapping, COLORS, DIRECTION_MAP, DOMAINS, difficulty=args.difficulty)
+        verifier.start_session(nonce)
+        verifier.verify_solution(verifier.expected_solutions)
+    report("scalar", scalar_count, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    rounds = total_rounds(args.difficulty)
+    entropy_matrix(nonces, rounds)
+    skip_matrix(nonces, rounds, rounds - args.difficulty)
+    report("hashing", args.challenges, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    batch = generate_challenges(nonces, [alphabet.index[s] for s in secrets],
+                                [encode_mapping(mapping, COLORS, DIRECTION_MAP)] * args.challenges,
+                                len(alphabet), args.difficulty)
+    assert check_answers(batch, batch.expected).all()
+    report("batch", args.challenges, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
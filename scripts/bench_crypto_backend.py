@@ -0,0 +1,59 @@
+"""
+Benchmark: secp256k1 key generation, signing and verification per backend.
+
+Runs every installed backend from utils.crypto_backend, plus the SDK's own
+secp256k1_ecdsa.PrivateKey as a baseline. Keys are loaded once, as the wallet does,
+so the numbers are per operation on an already loaded key.
+
+Usage:
+    python scripts/bench_crypto_backend.py [--iterations 2000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aptos_sdk import secp256k1_ecdsa  # noqa: E402
+
+from utils.crypto_backend import available_backends, get_backend  # noqa: E402
+
+MESSAGE = b"\x00" * 200  # about the size of a transfer's signing message
+
+
+def bench(label, fn, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<30} {elapsed / iterations * 1e6:9.1f} us/op  {iterations / elapsed:10,.0f} ops/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    sdk_key = secp256k1_ecdsa.PrivateKey.random()
+    sdk_public = sdk_key.public_key()
+    sdk_signature = sdk_key.sign(MESSAGE)
+    bench("SDK keygen", secp256k1_ecdsa.PrivateKey.random, args.iterations)
+    bench("SDK sign", lambda: sdk_key.sign(MESSAGE), args.iterations)
+    bench("SDK verify", lambda: sdk_public.verify(MESSAGE, sdk_signature), args.iterations)
+
+    for name in available_backends():
+        backend = get_backend(name)
+        private = backend.load_private(backend.generate())
+        public = backend.load_public(backend.public_key(private))
+        signature = backend.sign(private, MESSAGE)
+        # The pure-Python backend is orders of magnitude slower; keep its run short
+        iterations = args.iterations if name != "ecdsa" else max(args.iterations // 20, 1)
+        bench(f"{name} keygen", backend.generate, iterations)
+        bench(f"{name} sign", lambda: backend.sign(private, MESSAGE), iterations)
+        bench(f"{name} verify", lambda: backend.verify(public, MESSAGE, signature), iterations)
+
+
+if __name__ == "__main__":
+    main()
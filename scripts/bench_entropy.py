@@ -0,0 +1,59 @@
+"""
+Benchmark: entropy layer derivation, SHA3-256 hash chain vs. one SHAKE-256 call.
+
+The chain is the previous utils.helpers.generate_entropy_layers: one
+SHA3-256 per layer, hex digest re-encoded as the next input.
+utils.entropy.generate_entropy_layers reads every layer from a single XOF
+output. Layer counts match challenge difficulties 1, 4 and 10 (rounds =
+difficulty * 1.5).
+
+Usage:
+    python scripts/bench_entropy.py [--iterations 100000]
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.entropy import generate_entropy_layers  # noqa: E402
+from utils.helpers import generate_nonce  # noqa: E402
+
+
+def hash_chain(seed, layers):
+    arr = []
+    cur = seed
+    for _ in range(layers):
+        h = hashlib.sha3_256(cur.encode('utf-8')).hexdigest()
+        arr.append(int(h[:8], 16))
+        cur = h
+    return arr
+
+
+def bench(label, fn, nonces, layers):
+    start = time.perf_counter()
+    for nonce in nonces:
+        fn(nonce, layers)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<12} {layers:3} layers  {elapsed / len(nonces) * 1e6:7.2f} us/call  "
+          f"{len(nonces) / elapsed:12,.0f} calls/s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=100000)
+    args = parser.parse_args()
+
+    nonces = [generate_nonce() for _ in range(args.iterations)]
+    for layers in (1, 6, 15):
+        before = bench("sha3 chain", hash_chain, nonces, layers)
+        after = bench("shake256", generate_entropy_layers, nonces, layers)
+        print(f"speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
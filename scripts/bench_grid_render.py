@@ -0,0 +1,84 @@
+"""
+Benchmark: challenge grid markup size and render time.
+
+Compares the previous renderer (an inline-styled <span> per character, built
+with += concatenation) against utils.auth_utils.render_grid (class-based
+markup, one join). The alphabet has the same size and mix as the app's
+DOMAINS: ASCII, symbols, emoji and CJK/Cyrillic letters. Bytes are UTF-8
+encoded HTML per round, i.e. what goes over the websocket.
+
+Usage:
+    python scripts/bench_grid_render.py [--iterations 2000]
+"""
+
+import argparse
+import os
+import string
+import sys
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.auth_utils import render_grid  # noqa: E402
+from utils.challenge_alphabet import ChallengeAlphabet  # noqa: E402
+
+COLORS = ["red", "green", "blue", "yellow"]
+DOMAINS = {
+    'ascii': string.ascii_letters + string.digits,
+    'symbols': '!@#$%^&*()_+-=[]{}|;:,.<>?',
+    'emojis': "".join(chr(c) for c in range(0x1F300, 0x1F3C0)),
+    'japanese': "".join(chr(c) for c in range(0x3042, 0x3094, 2)),
+    'cyrillic': "абвгдеёжзийклмнопрстуфхцчшщъыьэюя",
+    'chinese': "的一是不了人我在有他这为之大来以个中上们",
+}
+
+
+def legacy_render(alphabet, offset, colors, title):
+    rotated = alphabet.rotated(offset)
+    color_map = {rotated[i]: colors[i % len(colors)] for i in range(len(rotated))}
+    chars_by_color = defaultdict(list)
+    for ch, color in color_map.items():
+        chars_by_color[color].append(ch)
+
+    grid_html = f"""
+        <div style="border: 2px solid #333; padding: 15px; margin: 10px; background: #f8f9fa; border-radius: 8px;">
+        <h4>{title}</h4>
+        <p><strong>Find your secret character and note its color!</strong></p>
+        """
+    color_hex_map = {"red": "#FF0000", "green": "#00AA00", "blue": "#0066FF", "yellow": "#FFD700"}
+    for color in colors:
+        chars = chars_by_color[color]
+        if chars:
+            grid_html += f'<div style="margin: 8px 0;"><strong style="color: {color_hex_map[color]};">{color.upper()}:</strong> '
+            for char in chars:
+                grid_html += f'<span style="color: {color_hex_map[color]}; font-size: 18px; margin: 2px; padding: 4px; background: white; border-radius: 4px;">{char}</span> '
+            grid_html += '</div>'
+    grid_html += '</div>'
+    return grid_html
+
+
+def bench(label, fn, alphabet, iterations):
+    size = len(fn(alphabet, 7, COLORS, "🎯 Round 1").encode())
+    start = time.perf_counter()
+    for i in range(iterations):
+        fn(alphabet, i, COLORS, "🎯 Round 1")
+    elapsed = time.perf_counter() - start
+    print(f"{label:<22} {size:9,} bytes/round  {elapsed / iterations * 1e6:8.1f} us/round")
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    alphabet = ChallengeAlphabet(DOMAINS)
+    print(f"alphabet: {len(alphabet)} characters")
+    before = bench("inline styles, +=", legacy_render, alphabet, args.iterations)
+    after = bench("render_grid", render_grid, alphabet, args.iterations)
+    print(f"payload reduction: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
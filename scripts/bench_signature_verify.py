@@ -0,0 +1,65 @@
+"""
+Benchmark: bulk signature verification throughput by worker count.
+
+Generates a JSON Lines batch of signed messages from a handful of signers
+(half ed25519, half secp256k1) and times utils.signature_verifier.verify_lines
+with 1, 2, 4, ... worker processes up to the CPU count. Pool start-up is
+excluded by a warm-up pass.
+
+Usage:
+    python scripts/bench_signature_verify.py [--rows 20000] [--signers 8]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aptos_sdk.account import Account  # noqa: E402
+
+from utils.crypto_backend import generate_account  # noqa: E402
+from utils.signature_verifier import public_key_hex, verify_lines  # noqa: E402
+
+
+def make_lines(rows, signers):
+    accounts = [Account.generate() if i % 2 else generate_account() for i in range(signers)]
+    lines = []
+    for i in range(rows):
+        account = accounts[i % signers]
+        message = f"audit message {i}"
+        lines.append(json.dumps({
+            'public_key': public_key_hex(account),
+            'message': message,
+            'signature': str(account.sign(message.encode())),
+            'address': str(account.address()),
+        }))
+    return lines
+
+
+def bench(workers, lines):
+    list(verify_lines(lines[:4096], workers=workers))  # warm the pool
+    start = time.perf_counter()
+    valid = sum(result.valid for result in verify_lines(lines, workers=workers))
+    elapsed = time.perf_counter() - start
+    assert valid == len(lines)
+    print(f"{workers:>2} worker(s)  {elapsed:7.2f} s  {len(lines) / elapsed:10,.0f} rows/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--signers", type=int, default=8)
+    args = parser.parse_args()
+
+    lines = make_lines(args.rows, args.signers)
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        bench(workers, lines)
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
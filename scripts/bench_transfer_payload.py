@@ -0,0 +1,88 @@
+"""
+Benchmark: building transfer transactions with SDK objects vs. the template.
+
+Compares the per-transaction cost of the SDK path (EntryFunction.natural,
+RawTransaction, SignedTransaction serialization and hash) with
+utils.transfer_payload.apt_transfer, both for serialization alone and for
+the full sign + serialize + hash pipeline used by batch payouts.
+
+Usage:
+    python scripts/bench_transfer_payload.py [--iterations 20000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aptos_sdk.account import Account  # noqa: E402
+from aptos_sdk.account_address import AccountAddress  # noqa: E402
+from aptos_sdk.bcs import Serializer  # noqa: E402
+from aptos_sdk.transactions import (  # noqa: E402
+    EntryFunction, RawTransaction, SignedTransaction, TransactionArgument, TransactionPayload
+)
+from aptos_sdk.type_tag import StructTag, TypeTag  # noqa: E402
+
+from utils.balance import APT_COIN_TYPE  # noqa: E402
+from utils.transfer_payload import apt_transfer  # noqa: E402
+
+RECIPIENT = "0x" + "cd" * 32
+
+
+def sdk_raw(sender, seq):
+    payload = TransactionPayload(EntryFunction.natural(
+        "0x1::coin",
+        "transfer",
+        [TypeTag(StructTag.from_str(APT_COIN_TYPE))],
+        [TransactionArgument(AccountAddress.from_str_relaxed(RECIPIENT), Serializer.struct),
+         TransactionArgument(1000 + seq, Serializer.u64)],
+    ))
+    return RawTransaction(sender.address(), seq, payload, 2000, 100, 1_700_000_600, 2)
+
+
+def sdk_serialize(sender, seq):
+    serializer = Serializer()
+    sdk_raw(sender, seq).serialize(serializer)
+    return serializer.output()
+
+
+def sdk_sign(sender, seq):
+    raw = sdk_raw(sender, seq)
+    signed = SignedTransaction(raw, sender.sign_transaction(raw))
+    return signed.bytes(), signed.hash()
+
+
+def template_serialize(sender, seq):
+    return apt_transfer.raw_transaction_bytes(sender.address(), seq, RECIPIENT, 1000 + seq, 2000, 100,
+                                              1_700_000_600, 2)
+
+
+def template_sign(sender, seq):
+    return apt_transfer.sign(sender, template_serialize(sender, seq))
+
+
+def bench(label, fn, sender, iterations):
+    start = time.perf_counter()
+    for seq in range(iterations):
+        fn(sender, seq)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34} {elapsed / iterations * 1e6:8.1f} us/txn  {iterations / elapsed:10,.0f} txn/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    sender = Account.generate()
+    bench("SDK RawTransaction serialize", sdk_serialize, sender, args.iterations)
+    bench("template raw_transaction_bytes", template_serialize, sender, args.iterations)
+    signing = max(args.iterations // 10, 1)
+    bench("SDK sign + bytes + hash", sdk_sign, sender, signing)
+    bench("template sign + hash", template_sign, sender, signing)
+
+
+if __name__ == "__main__":
+    main()
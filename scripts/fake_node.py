@@ -0,0 +1,272 @@
+"""
+Minimal local fake Aptos fullnode for benchmarks and tests.
+
+Serves canned responses for the handful of REST endpoints this app uses and
+can inject latency and HTTP errors, so node-facing code can be exercised
+without network access. Tests replace individual endpoints with ``override``
+(or ``respond``) and park out-of-order sequence numbers with ``park``.
+
+    node = FakeNode(resource_count=500).start()
+    client = get_client(node.url)
+    node.respond("POST", "/v1/view", 400, {"error_code": "invalid_input"})
+    ...
+    node.stop()
+"""
+
+import json
+import random
+import re
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Pattern, Tuple
+
+from aptos_sdk.account_address import AccountAddress
+from aptos_sdk.bcs import Deserializer
+from aptos_sdk.transactions import SignedTransaction
+
+APT_COIN_STORE = "0x1::coin::CoinStore<0x1::aptos_coin::AptosCoin>"
+
+
+def make_resources(count: int, balance: int) -> List[Dict]:
+    """A resource list shaped like a busy account's /resources response."""
+    resources = [
+        {"type": "0x1::account::Account",
+         "data": {"authentication_key": "0x" + "11" * 32, "sequence_number": "42",
+                  "coin_register_events": {"counter": "1", "guid": {"id": {"addr": "0x1", "creation_num": "0"}}},
+                  "key_rotation_capability_offer": {"for": {"vec": []}},
+                  "signer_capability_offer": {"for": {"vec": []}}}},
+    ]
+    for i in range(max(count - 2, 0)):
+        resources.append({
+            "type": f"0x{i:064x}::collection::Token{i}",
+            "data": {"name": f"token-{i}", "uri": f"https://example.invalid/{i}.json",
+                     "description": "x" * 64, "supply": {"vec": [str(i)]},
+                     "events": {"counter": str(i), "guid": {"id": {"addr": f"0x{i:x}", "creation_num": str(i)}}}},
+        })
+    resources.append({
+        "type": APT_COIN_STORE,
+        "data": {"coin": {"value": str(balance)}, "frozen": False,
+                 "deposit_events": {"counter": "3", "guid": {"id": {"addr": "0x1", "creation_num": "2"}}},
+                 "withdraw_events": {"counter": "2", "guid": {"id": {"addr": "0x1", "creation_num": "3"}}}},
+    })
+    return resources
+
+
+def make_transaction(seq: int, sender: str, recipient: str, amount: int = 1000,
+                     change_count: int = 12, event_count: int = 4) -> Dict:
+    """A user transaction shaped like the node's JSON, including bulky write-set changes."""
+    return {
+        "version": str(5_000_000 + seq),
+        "hash": f"0x{seq:064x}",
+        "state_change_hash": "0x" + "ab" * 32,
+        "event_root_hash": "0x" + "cd" * 32,
+        "state_checkpoint_hash": None,
+        "gas_used": "9",
+        "success": True,
+        "vm_status": "Executed successfully",
+        "accumulator_root_hash": "0x" + "ef" * 32,
+        "changes": [
+            {"address": f"0x{i:064x}", "state_key_hash": "0x" + f"{i:02x}" * 32, "type": "write_resource",
+             "data": {"type": f"0x1::coin::CoinStore<0x1::aptos_coin::AptosCoin>",
+                      "data": {"coin": {"value": str(i * 1000)}, "frozen": False,
+                               "deposit_events": {"counter": str(i), "guid": {"id": {"addr": f"0x{i:x}", "creation_num": "2"}}},
+                               "withdraw_events": {"counter": str(i), "guid": {"id": {"addr": f"0x{i:x}", "creation_num": "3"}}}}}}
+            for i in range(change_count)
+        ],
+        "sender": sender,
+        "sequence_number": str(seq),
+        "max_gas_amount": "2000",
+        "gas_unit_price": "100",
+        "expiration_timestamp_secs": str(1_700_000_600 + seq),
+        "payload": {"function": "0x1::coin::transfer", "type_arguments": ["0x1::aptos_coin::AptosCoin"],
+                    "arguments": [recipient, str(amount)], "type": "entry_function_payload"},
+        "signature": {"public_key": "0x" + "12" * 32, "signature": "0x" + "34" * 64, "type": "ed25519_signature"},
+        "events": [
+            {"guid": {"creation_number": "0", "account_address": "0x0"}, "sequence_number": "0",
+             "type": "0x1::fungible_asset::Withdraw", "data": {"amount": str(amount), "store": "0x" + "56" * 32}}
+            for _ in range(event_count)
+        ],
+        "timestamp": str(1_700_000_000_000_000 + seq * 1_000_000),
+        "type": "user_transaction",
+    }
+
+
+class FakeNode:
+    """A threaded HTTP server speaking a small subset of the Aptos REST API."""
+
+    def __init__(self, resource_count: int = 100, balance: int = 123456789,
+                 latency: float = 0.0, error_rate: float = 0.0, chain_id: int = 2):
+        self.resources = make_resources(resource_count, balance)
+        self.balance = balance
+        self.latency = latency
+        self.error_rate = error_rate
+        self.chain_id = chain_id
+        self.transactions: Dict[str, List[Dict]] = {}
+        # Submitted transactions by hash; they "commit" as soon as they arrive
+        self.submitted: Dict[str, Dict] = {}
+        # Per sender: on-chain sequence number and out-of-order (parked) ones
+        self.sequence_numbers: Dict[str, int] = {}
+        self._parked: Dict[str, set] = {}
+        self._submit_lock = threading.Lock()
+        self.requests = 0
+        self.bytes_sent = 0
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._rng = random.Random(0)
+        # (method, path pattern, handler); the newest match wins
+        self._overrides: List[Tuple[str, Pattern, Callable]] = []
+
+    def override(self, method: str, pattern: str,
+                 handler: Callable[[Callable[[], Tuple[int, Any]]], Tuple[int, Any]]) -> "FakeNode":
+        """
+        Answer ``method`` requests whose path fully matches ``pattern`` with ``handler``.
+
+        The query string is not part of the match. ``handler(forward)`` returns
+        ``(status, payload)``; ``forward()`` runs the built-in endpoint, e.g. to
+        accept a transaction and then report an error anyway.
+        """
+        self._overrides.insert(0, (method, re.compile(pattern), handler))
+        return self
+
+    def respond(self, method: str, pattern: str, status: int, payload: Any) -> "FakeNode":
+        """Answer matching requests with a fixed ``status`` and JSON ``payload``."""
+        return self.override(method, pattern, lambda forward: (status, payload))
+
+    def clear_overrides(self) -> None:
+        self._overrides.clear()
+
+    def park(self, sender: str, *sequence_numbers: int) -> None:
+        """Mark ``sequence_numbers`` as already in the mempool for ``sender``."""
+        with self._submit_lock:
+            self._parked.setdefault(str(AccountAddress.from_str_relaxed(sender)), set()).update(sequence_numbers)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "FakeNode":
+        node = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                # Headers and body are written separately; avoid Nagle stalls
+                self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                node._handle(self, "GET")
+
+            def do_POST(self):
+                node._handle(self, "POST")
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def _dispatch(self, method: str, path: str, body: bytes):
+        bare_path = path.partition("?")[0]
+        for override_method, pattern, override in list(self._overrides):
+            if override_method == method and pattern.fullmatch(bare_path):
+                return override(lambda: self._route(method, path, body))
+        return self._route(method, path, body)
+
+    def _route(self, method: str, path: str, body: bytes):
+        path, _, query = path.partition("?")
+        params = dict(p.split("=", 1) for p in query.split("&") if "=" in p)
+        if method == "GET" and path == "/v1":
+            return 200, {"chain_id": self.chain_id, "ledger_version": "1000"}
+        if method == "GET" and re.fullmatch(r"/v1/accounts/[^/]+/resources", path):
+            return 200, self.resources
+        match = re.fullmatch(r"/v1/accounts/[^/]+/resource/(.+)", path)
+        if method == "GET" and match:
+            wanted = match.group(1).replace("%3C", "<").replace("%3E", ">").replace("%3A", ":")
+            for resource in self.resources:
+                if resource["type"] == wanted:
+                    return 200, resource
+            return 404, {"error_code": "resource_not_found"}
+        match = re.fullmatch(r"/v1/accounts/([^/]+)/transactions", path)
+        if method == "GET" and match:
+            txns = self.transactions.get(match.group(1), [])
+            start = int(params.get("start", max(len(txns) - int(params.get("limit", 25)), 0)))
+            limit = int(params.get("limit", 25))
+            return 200, txns[start:start + limit]
+        match = re.fullmatch(r"/v1/accounts/([^/]+)", path)
+        if method == "GET" and match:
+            address = str(AccountAddress.from_str_relaxed(match.group(1)))
+            return 200, {"sequence_number": str(self.sequence_numbers.get(address, 0)),
+                         "authentication_key": "0x" + "11" * 32}
+        if method == "POST" and path == "/v1/transactions":
+            return self._submit(SignedTransaction.deserialize(Deserializer(body)))
+        if method == "POST" and path == "/v1/transactions/batch":
+            failures = []
+            for index, signed in enumerate(Deserializer(body).sequence(SignedTransaction.deserialize)):
+                status, payload = self._submit(signed)
+                if status != 202:
+                    failures.append({"error": payload, "transaction_index": index})
+            return (206 if failures else 202), {"transaction_failures": failures}
+        match = re.fullmatch(r"/v1/transactions/by_hash/([^/]+)", path)
+        if method == "GET" and match:
+            txn = self.submitted.get(match.group(1))
+            return (200, txn) if txn else (404, {"error_code": "transaction_not_found"})
+        if method == "GET" and path == "/v1/estimate_gas_price":
+            return 200, {"deprioritized_gas_estimate": 100, "gas_estimate": 100,
+                         "prioritized_gas_estimate": 150}
+        if method == "POST" and path == "/v1/view":
+            return 200, [str(self.balance)]
+        return 404, {"error_code": "not_found", "message": path}
+
+    def _submit(self, signed: SignedTransaction):
+        raw = signed.transaction
+        sender = str(raw.sender)
+        with self._submit_lock:
+            committed = self.sequence_numbers.get(sender, 0)
+            parked = self._parked.setdefault(sender, set())
+            if raw.sequence_number < committed or raw.sequence_number in parked:
+                return 400, {"error_code": "vm_error",
+                             "message": "Invalid transaction: Type: Validation Code: SEQUENCE_NUMBER_TOO_OLD"}
+            # Like a mempool: park until every earlier number has arrived
+            parked.add(raw.sequence_number)
+            while committed in parked:
+                parked.discard(committed)
+                committed += 1
+            self.sequence_numbers[sender] = committed
+            txn_hash = signed.hash()
+            self.submitted[txn_hash] = {
+                "type": "user_transaction", "hash": txn_hash, "sender": sender,
+                "sequence_number": str(raw.sequence_number), "version": str(1000 + len(self.submitted)),
+                "gas_unit_price": str(raw.gas_unit_price), "max_gas_amount": str(raw.max_gas_amount),
+                "success": True, "vm_status": "Executed successfully",
+            }
+        return 202, {"hash": txn_hash}
+
+    def _handle(self, handler: BaseHTTPRequestHandler, method: str) -> None:
+        length = int(handler.headers.get("Content-Length") or 0)
+        body = handler.rfile.read(length) if length else b""
+        self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if self.error_rate and self._rng.random() < self.error_rate:
+            status, payload = 503, {"error_code": "injected_error"}
+        else:
+            status, payload = self._dispatch(method, handler.path, body)
+        data = json.dumps(payload).encode()
+        self.bytes_sent += len(data)
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(data)))
+        handler.end_headers()
+        handler.wfile.write(data)
@@ -0,0 +1,38 @@
+import pytest
+
+from scripts.fake_node import FakeNode
+
+
+class FakeClock:
+    """A settable clock for the ``clock=`` parameter of caches and limiters."""
+
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def make_node():
+    """Start FakeNodes with the given options; all are stopped after the test."""
+    nodes = []
+
+    def start(**kwargs) -> FakeNode:
+        node = FakeNode(**kwargs).start()
+        nodes.append(node)
+        return node
+
+    yield start
+    for node in nodes:
+        node.stop()
+
+
+@pytest.fixture
+def node(make_node):
+    return make_node()
@@ -0,0 +1,35 @@
+from utils.abuse_limiter import AbuseLimiter, SessionState
+
+
+def test_failures_raise_difficulty_then_block_and_slide_out(clock):
+    clock.now = 1000.0
+    limiter = AbuseLimiter(window=100, failures_per_level=2, max_difficulty=4, block_after=8, clock=clock)
+    assert limiter.state("0xa") == SessionState()
+
+    states = [limiter.record_failure("0xa") for _ in range(8)]
+    assert [s.d for s in states] == [1, 2, 2, 3, 3, 4, 4, 4]
+    assert [s.high_abuse for s in states] == [False] * 7 + [True]
+    assert states[-1].first_failure_ts == 1000.0 and states[-1].failure_count == 8
+    assert limiter.state("0xb") == SessionState()
+
+    # Half a window later half of the burst still counts; two windows later none of it
+    clock.now = 1150
+    assert limiter.state("0xa").failure_count == 4
+    clock.now = 1300
+    assert limiter.state("0xa") == SessionState()
+    assert len(limiter) == 0
+
+    limiter.record_failure("0xa")
+    limiter.record_success("0xa")
+    assert limiter.state("0xa") == SessionState()
+
+
+def test_least_recently_seen_wallets_are_evicted(clock):
+    limiter = AbuseLimiter(window=100, max_keys=3, clock=clock)
+    for key in ("0x1", "0x2", "0x3"):
+        limiter.record_failure(key)
+    limiter.state("0x1")  # touched: now most recent
+    limiter.record_failure("0x4")
+    assert len(limiter) == 3
+    assert limiter.state("0x2") == SessionState()
+    assert limiter.state("0x1").failure_count == 1
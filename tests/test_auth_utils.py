@@ -0,0 +1,72 @@
+import re
+
+from utils.abuse_limiter import AbuseLimiter
+from utils.auth_utils import OnePVerifier, color_index, render_grid
+from utils.challenge_alphabet import ChallengeAlphabet
+
+COLORS = ["red", "green", "blue", "yellow"]
+DIRECTION_MAP = {"Up": "U", "Down": "D", "Left": "L", "Right": "R", "Skip": "S"}
+MAPPING = {"red": "Up", "green": "Down", "blue": "Left", "yellow": "Right"}
+DOMAINS = {'ascii': "abcdefghij", 'emojis': "😀😂🎉🔥💯😎🤔"}
+
+
+def color_map(alphabet, offset):
+    # The dictionary the verifiers used to build for every round
+    rotated = alphabet.chars[offset:] + alphabet.chars[:offset]
+    return {rotated[i]: COLORS[i % len(COLORS)] for i in range(len(rotated))}
+
+
+def test_color_index_matches_rotated_color_map():
+    alphabet = ChallengeAlphabet(DOMAINS)
+    for offset in range(len(alphabet)):
+        expected = color_map(alphabet, offset)
+        for char in alphabet:
+            assert COLORS[color_index(alphabet, char, offset, len(COLORS))] == expected[char]
+    assert color_index(alphabet, "Z", 3, len(COLORS)) is None
+
+
+def test_render_grid_groups_characters_by_color():
+    alphabet = ChallengeAlphabet(DOMAINS)
+    html = render_grid(alphabet, 5, COLORS, "Round 1")
+    expected = color_map(alphabet, 5)
+    for color in COLORS:
+        row = re.search(rf'<div class="op-{color}"><b>{color.upper()}:</b> (.*?)</div>', html).group(1)
+        shown = re.findall(r"<i>([^<]+)</i>", row)
+        assert shown == [char for char, c in expected.items() if c == color]
+    # Markup-significant characters are escaped
+    escaped = render_grid(ChallengeAlphabet({'symbols': "<&>"}), 0, COLORS, "R")
+    assert "<i>&lt;</i>" in escaped and "<i>&amp;</i>" in escaped and "<i>&gt;</i>" in escaped
+
+
+def test_one_p_verifier_keeps_only_offsets_and_checks_answers():
+    verifier = OnePVerifier("c", "00", MAPPING, COLORS, DIRECTION_MAP, DOMAINS, difficulty=4)
+    nonce, total_rounds = verifier.start_session()
+    assert total_rounds == 6 and len(verifier.skip_rounds) == 2
+    assert all(isinstance(offset, int) for offset in verifier.offsets)
+    assert not hasattr(verifier, "color_maps") and not hasattr(verifier, "rotateds")
+
+    expected = []
+    for idx, offset in enumerate(verifier.offsets):
+        color = color_map(verifier.alphabet, offset)["c"]
+        expected.append("S" if idx in verifier.skip_rounds else DIRECTION_MAP[MAPPING[color]])
+    assert verifier.expected_solutions == expected
+    assert verifier.verify_solution(expected)
+
+    wrong = list(expected)
+    round_ = next(i for i, e in enumerate(expected) if e != "S")
+    wrong[round_] = "D" if expected[round_] != "D" else "U"
+    assert not verifier.verify_solution(wrong)
+
+
+
+def test_verify_attempt_counts_the_outcome(clock):
+    verifier = OnePVerifier("c", "00", MAPPING, COLORS, DIRECTION_MAP, DOMAINS, difficulty=2)
+    verifier.start_session()
+    limiter = AbuseLimiter(window=100, clock=clock)
+    wrong = ["S" if e != "S" else "U" for e in verifier.expected_solutions]
+
+    assert not verifier.verify_attempt(wrong, limiter, "0xa")
+    assert not verifier.verify_attempt(wrong, limiter, "0xa")
+    assert limiter.state("0xa").failure_count == 2
+    assert verifier.verify_attempt(verifier.expected_solutions, limiter, "0xa")
+    assert limiter.state("0xa").failure_count == 0
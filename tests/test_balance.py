@@ -0,0 +1,53 @@
+import pytest
+
+from utils.balance import apt_to_octas, fetch_apt_balance_octas
+from utils.client_pool import get_client
+from utils.nest_runner import async_to_sync
+
+ADDR = "0x" + "ab" * 32
+
+
+def test_balance_via_view_function(make_node):
+    node = make_node(resource_count=50, balance=250000000)
+    assert async_to_sync(fetch_apt_balance_octas(get_client(node.url), ADDR)) == 250000000
+    assert node.requests == 1
+
+
+def test_balance_falls_back_to_single_resource(make_node):
+    node = make_node(resource_count=50, balance=7)
+    node.respond("POST", "/v1/view", 400, {"error_code": "invalid_input"})
+    assert async_to_sync(fetch_apt_balance_octas(get_client(node.url), ADDR)) == 7
+
+
+def test_bulk_balances_bounded_and_partial(monkeypatch):
+    import asyncio
+    from utils import balance
+
+    in_flight = []
+    peak = []
+
+    async def fake_fetch(client, address):
+        in_flight.append(address)
+        peak.append(len(in_flight))
+        await asyncio.sleep(0.01)
+        in_flight.remove(address)
+        if address.endswith("bad"):
+            raise ValueError("boom")
+        return 1.0
+
+    monkeypatch.setattr(balance, "fetch_apt_balance", fake_fetch)
+    addresses = [f"0x{i:x}" for i in range(50)] + ["0xbad", "0x1"]
+    result = async_to_sync(balance.fetch_apt_balances(None, addresses, concurrency=8))
+
+    assert len(result.balances) == 50
+    assert result.errors == {"0xbad": "boom"}
+    assert max(peak) <= 8
+
+
+def test_apt_to_octas_rounds_and_rejects_out_of_range_amounts():
+    assert apt_to_octas(0.29) == 29000000
+    assert apt_to_octas(0.000000015) == 2
+    assert apt_to_octas(0) == 0
+    for bad in (-1.0, 2e11, float("nan"), float("inf")):
+        with pytest.raises(ValueError):
+            apt_to_octas(bad)
@@ -0,0 +1,93 @@
+import asyncio
+import threading
+
+from utils.balance_cache import BalanceCache, normalize_address
+
+ADDR = "0x" + "ab" * 32
+
+
+def make_loader(calls, value=1.5, delay=0.0):
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return value
+    return lambda: load()
+
+
+def test_ttl_hit_skips_node(clock):
+    calls = []
+    cache = BalanceCache(ttl=5, stale_ttl=0, clock=clock)
+    assert cache.get(ADDR, make_loader(calls)) == 1.5
+    assert cache.get(ADDR, make_loader(calls)) == 1.5
+    assert len(calls) == 1
+
+
+def test_concurrent_requests_coalesce(clock):
+    calls = []
+    cache = BalanceCache(ttl=5, stale_ttl=0, clock=clock)
+    results = []
+
+    def worker():
+        results.append(cache.get(ADDR, make_loader(calls, delay=0.1)))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == [1.5] * 8
+    assert len(calls) == 1
+
+
+def test_stale_entry_served_while_revalidating(clock):
+    calls = []
+    cache = BalanceCache(ttl=5, stale_ttl=30, clock=clock)
+    cache.get(ADDR, make_loader(calls, value=1.0))
+    clock.now = 10
+    assert cache.get(ADDR, make_loader(calls, value=2.0)) == 1.0
+    refresh = cache._inflight.get(normalize_address(ADDR))
+    if refresh is not None:
+        refresh.result(5)
+    assert cache.peek(ADDR) == 2.0
+
+
+def test_invalidate_forces_refetch(clock):
+    calls = []
+    cache = BalanceCache(ttl=5, stale_ttl=0, clock=clock)
+    cache.get(ADDR, make_loader(calls))
+    cache.invalidate(ADDR.upper().replace("0X", "0x"))
+    assert cache.peek(ADDR) is None
+    cache.get(ADDR, make_loader(calls))
+    assert len(calls) == 2
+
+
+def test_prefetch_then_get_shares_request(clock):
+    calls = []
+    cache = BalanceCache(ttl=5, stale_ttl=0, clock=clock)
+    future = cache.prefetch(ADDR, make_loader(calls, delay=0.05))
+    assert cache.get(ADDR, make_loader(calls)) == 1.5
+    assert future.done()
+    assert cache.prefetch(ADDR, make_loader(calls)) is None
+    assert len(calls) == 1
+
+
+def test_least_recently_used_entries_are_evicted(clock):
+    cache = BalanceCache(ttl=5, stale_ttl=0, max_entries=3, clock=clock)
+    addresses = [f"0x{i:064x}" for i in range(4)]
+    for address in addresses[:3]:
+        cache.put(address, 1.0)
+    cache.get(addresses[0], make_loader([]))  # touched: now most recent
+    cache.put(addresses[3], 1.0)
+    assert len(cache) == 3
+    assert cache.peek(addresses[1]) is None
+    assert cache.peek(addresses[0]) == 1.0
+
+
+def test_fetch_invalidated_in_flight_is_not_cached(clock):
+    calls = []
+    cache = BalanceCache(ttl=5, stale_ttl=0, clock=clock)
+    future = cache.prefetch(ADDR, make_loader(calls, value=1.0, delay=0.05))
+    cache.invalidate(ADDR)
+    assert future.result(5) == 1.0
+    assert cache.peek(ADDR) is None and not cache._inflight
@@ -0,0 +1,41 @@
+from utils.auth_utils import OneRoundVerifier
+from utils.challenge_alphabet import ChallengeAlphabet, format_codepoints, get_alphabet, split_graphemes
+
+HEART = "\u2764\ufe0f"
+GOLFER = "\U0001F3CC\ufe0f\u200d\u2642\ufe0f"
+KEYCAP_ONE = "1\ufe0f\u20e3"
+FLAG = "\U0001F1EF\U0001F1F5"
+DOMAINS = {
+    'ascii': "ab1",
+    'emojis': f"{HEART}😀{GOLFER}",
+    'numbers': f"{KEYCAP_ONE}🔟",
+    'mixed': f"a{HEART}{FLAG}\U0001F44D\U0001F3FD",
+}
+
+
+def test_split_graphemes_keeps_multi_codepoint_characters_whole():
+    assert split_graphemes(f"{HEART}{GOLFER}{KEYCAP_ONE}{FLAG}\U0001F44D\U0001F3FDé") == [
+        HEART, GOLFER, KEYCAP_ONE, FLAG, "\U0001F44D\U0001F3FD", "é"]
+    assert format_codepoints(HEART) == "U+2764 U+FE0F"
+
+
+def test_alphabet_is_deduplicated_in_first_seen_order():
+    alphabet = ChallengeAlphabet(DOMAINS)
+    assert alphabet.chars == ("a", "b", "1", HEART, "😀", GOLFER, KEYCAP_ONE, "🔟", FLAG, "\U0001F44D\U0001F3FD")
+    assert "\ufe0f" not in alphabet and "\u200d" not in alphabet
+    assert all(alphabet.index[char] == i for i, char in enumerate(alphabet))
+    for offset in (0, 3, 17):
+        rotated = alphabet.rotated(offset)
+        assert all(rotated[alphabet.position(char, offset)] == char for char in alphabet)
+    assert alphabet.position("z", 3) is None
+    assert get_alphabet(dict(DOMAINS)) is get_alphabet(DOMAINS)
+
+
+def test_one_round_verifier_finds_multi_codepoint_secret():
+    colors = ["red", "green", "blue", "yellow"]
+    direction_map = {"Up": "U", "Down": "D", "Left": "L", "Right": "R", "Skip": "S"}
+    mapping = {"red": "Up", "green": "Down", "blue": "Left", "yellow": "Right"}
+    verifier = OneRoundVerifier(GOLFER, mapping, colors, direction_map, DOMAINS)
+    grid_html, expected = verifier.generate_challenge()
+    assert GOLFER in grid_html
+    assert expected == direction_map[mapping[verifier.secret_color()]]
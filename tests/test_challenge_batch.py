@@ -0,0 +1,73 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from utils.auth_utils import OnePVerifier  # noqa: E402
+from utils.challenge_alphabet import ChallengeAlphabet  # noqa: E402
+from utils.challenge_batch import (  # noqa: E402
+    DIRECTION_CODES, check_answers, encode_mapping, generate_challenges
+)
+from utils.helpers import generate_nonce  # noqa: E402
+
+COLORS = ["red", "green", "blue", "yellow"]
+DIRECTION_MAP = {"Up": "U", "Down": "D", "Left": "L", "Right": "R", "Skip": "S"}
+DOMAINS = {'ascii': "abcdefghijklmnopqrstuvwxyz0123456789", 'emojis': "😀😂🎉🔥💯😎🤔"}
+ALPHABET = ChallengeAlphabet(DOMAINS)
+
+
+def random_users(rng, n):
+    directions = list(DIRECTION_MAP)
+    users = []
+    for _ in range(n):
+        mapping = {color: rng.choice(directions) for color in COLORS}
+        secret = rng.choice(ALPHABET.chars) if rng.random() > 0.1 else "Ω"  # sometimes not shown
+        users.append((generate_nonce(), secret, mapping))
+    return users
+
+
+def scalar_verifier(nonce, secret, mapping, difficulty):
+    verifier = OnePVerifier(secret, "00", mapping, COLORS, DIRECTION_MAP, DOMAINS, difficulty=difficulty)
+    verifier.start_session(nonce)
+    return verifier
+
+
+def test_batch_matches_scalar_verifier():
+    rng = random.Random(7)
+    for difficulty in (1, 2, 5):
+        users = random_users(rng, 200)
+        batch = generate_challenges(
+            [nonce for nonce, _, _ in users],
+            [ALPHABET.index.get(secret, -1) for _, secret, _ in users],
+            [encode_mapping(mapping, COLORS, DIRECTION_MAP) for _, _, mapping in users],
+            len(ALPHABET), difficulty,
+        )
+        for row, (nonce, secret, mapping) in enumerate(users):
+            verifier = scalar_verifier(nonce, secret, mapping, difficulty)
+            assert batch.offsets[row].tolist() == verifier.offsets
+            assert np.flatnonzero(batch.skip_mask[row]).tolist() == verifier.skip_rounds
+            assert "".join(DIRECTION_CODES[c] for c in batch.expected[row]) == "".join(verifier.expected_solutions)
+
+
+def test_check_answers_matches_verify_solution():
+    rng = random.Random(11)
+    users = random_users(rng, 300)
+    difficulty = 4
+    batch = generate_challenges(
+        [nonce for nonce, _, _ in users],
+        [ALPHABET.index.get(secret, -1) for _, secret, _ in users],
+        [encode_mapping(mapping, COLORS, DIRECTION_MAP) for _, _, mapping in users],
+        len(ALPHABET), difficulty,
+    )
+    # Mostly correct answers with some mistakes and extra skips mixed in
+    answers = batch.expected.copy()
+    noise = np.random.default_rng(3).integers(0, len(DIRECTION_CODES), size=answers.shape, dtype=np.uint8)
+    flip = np.random.default_rng(4).random(answers.shape) < 0.15
+    answers[flip] = noise[flip]
+
+    results = check_answers(batch, answers)
+    assert results.any() and not results.all()
+    for row, (nonce, secret, mapping) in enumerate(users):
+        verifier = scalar_verifier(nonce, secret, mapping, difficulty)
+        assert results[row] == verifier.verify_solution([DIRECTION_CODES[c] for c in answers[row]])
@@ -0,0 +1,56 @@
+import threading
+import time
+
+import pytest
+
+from utils.auth_utils import OnePVerifier, make_seed
+from utils.challenge_pool import ChallengePool
+
+COLORS = ["red", "green", "blue", "yellow"]
+DIRECTION_MAP = {"Up": "U", "Down": "D", "Left": "L", "Right": "R", "Skip": "S"}
+DOMAINS = {'ascii': "abcdefghijklmnopqrstuvwxyz0123456789"}
+MAPPING = {"red": "Up", "green": "Down", "blue": "Left", "yellow": "Right"}
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_seed_starts_the_same_challenge_as_its_nonce():
+    seed = ChallengePool(size=4, low_water=1, difficulties=[3]).take(3)
+    pooled = OnePVerifier("a", "00", MAPPING, COLORS, DIRECTION_MAP, DOMAINS, difficulty=3)
+    assert pooled.start_from(seed) == (seed.nonce, 4)
+    direct = OnePVerifier("a", "00", MAPPING, COLORS, DIRECTION_MAP, DOMAINS, difficulty=3)
+    direct.start_session(seed.nonce)
+    assert (pooled.nonce, pooled.offsets, pooled.skip_rounds) == (direct.nonce, direct.offsets, direct.skip_rounds)
+    assert make_seed(3, seed.nonce) == seed
+    with pytest.raises(ValueError):
+        OnePVerifier("a", "00", MAPPING, COLORS, DIRECTION_MAP, DOMAINS, difficulty=2).start_from(seed)
+
+
+def test_pool_refills_below_low_water_and_never_repeats_a_seed():
+    pool = ChallengePool(size=20, low_water=5, difficulties=[1, 2])
+    pool.start()
+    assert wait_for(lambda: pool.available(1) == 20 and pool.available(2) == 20)
+
+    taken = []
+    def worker():
+        for _ in range(50):
+            taken.append(pool.take(2).nonce)
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(taken)) == len(taken) == 200
+    # Refilled whenever it hit the watermark, so it settles above it
+    assert wait_for(lambda: pool.available(2) > 5)
+
+    # A difficulty nobody configured gets its own pool
+    assert pool.take(5).difficulty == 5
+    assert wait_for(lambda: pool.available(5) == 20)
+    with pytest.raises(ValueError):
+        pool.take(0)
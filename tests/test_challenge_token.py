@@ -0,0 +1,43 @@
+import pytest
+
+from utils.auth_utils import OnePVerifier, make_seed
+from utils.challenge_token import ChallengeTokenError, issue_token, read_token
+
+KEY = b"k" * 32
+ALICE = "0x" + "a1" * 32
+BOB = "0x" + "b2" * 32
+COLORS = ["red", "green", "blue", "yellow"]
+DIRECTION_MAP = {"Up": "U", "Down": "D", "Left": "L", "Right": "R", "Skip": "S"}
+DOMAINS = {'ascii': "abcdefghijklmnopqrstuvwxyz0123456789"}
+MAPPING = {"red": "Up", "green": "Down", "blue": "Left", "yellow": "Right"}
+
+
+def verifier(seed):
+    v = OnePVerifier("q", "00", MAPPING, COLORS, DIRECTION_MAP, DOMAINS, difficulty=seed.difficulty)
+    v.start_from(seed)
+    return v
+
+
+def test_token_round_trips_to_the_same_challenge():
+    for difficulty in (1, 4, 11):
+        seed = make_seed(difficulty)
+        token = issue_token(seed, ALICE, ttl=60, key=KEY, now=1000)
+        assert len(token) < 100 and "=" not in token
+        assert read_token(token, ALICE, key=KEY, now=1059) == seed
+        # Another replica with only the token and the user's registration agrees on the answers
+        assert verifier(read_token(token, ALICE, key=KEY, now=1000)).expected_solutions == \
+            verifier(seed).expected_solutions
+
+
+def test_token_is_rejected_when_expired_forged_or_for_another_wallet():
+    token = issue_token(make_seed(2), ALICE, ttl=60, key=KEY, now=1000)
+    with pytest.raises(ChallengeTokenError, match="expired"):
+        read_token(token, ALICE, key=KEY, now=1060)
+    with pytest.raises(ChallengeTokenError):
+        read_token(token, BOB, key=KEY, now=1000)
+    with pytest.raises(ChallengeTokenError):
+        read_token(token, ALICE, key=b"other", now=1000)
+    tampered = token[:10] + ("A" if token[10] != "A" else "B") + token[11:]
+    for bad in (tampered, token[:-4], "", "not a token!"):
+        with pytest.raises(ChallengeTokenError):
+            read_token(bad, ALICE, key=KEY, now=1000)
@@ -0,0 +1,21 @@
+import asyncio
+
+from utils.client_pool import get_client
+
+
+def test_get_client_shared_per_url():
+    a = get_client("http://node-a.test/v1")
+    b = get_client("http://node-a.test/v1/")
+    c = get_client("http://node-b.test/v1")
+    assert a is b
+    assert a is not c
+
+
+def test_http_pool_reused_within_loop():
+    client = get_client("http://node-c.test/v1")
+
+    async def grab():
+        return client.client, client.client
+
+    first, second = asyncio.run(grab())
+    assert first is second
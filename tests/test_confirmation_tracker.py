@@ -0,0 +1,58 @@
+import concurrent.futures
+from types import SimpleNamespace
+
+import pytest
+
+from utils.client_pool import get_client
+from utils.confirmation_tracker import ConfirmationTracker, track_transaction
+
+
+def test_pending_hashes_share_one_polling_loop(node):
+    tracker = ConfirmationTracker(min_interval=0.02, max_interval=0.1)
+    client = get_client(node.url)
+    futures = [tracker.track(client, f"0x{i:064x}") for i in range(5)]
+    # Land the transactions after the tracker has started polling
+    for i in range(5):
+        node.submitted[f"0x{i:064x}"] = {"type": "user_transaction", "success": i != 3}
+    assert [f.result(5) for f in futures] == ["completed"] * 3 + ["failed", "completed"]
+    assert tracker.pending_count() == 0
+
+
+def test_unconfirmed_transaction_is_unknown_after_max_age(node):
+    tracker = ConfirmationTracker(min_interval=0.01, max_interval=0.02, max_age=0.1)
+    # It may still commit, so it is not reported as failed
+    assert tracker.track(get_client(node.url), "0x" + "00" * 32).result(5) == "unknown"
+
+
+def test_track_transaction_updates_status_in_place(node, monkeypatch):
+    tracker = ConfirmationTracker(min_interval=0.01)
+    monkeypatch.setattr("utils.confirmation_tracker.confirmation_tracker", tracker)
+    txn = SimpleNamespace(txn_hash="0x" + "ee" * 32, sender="0x1", recipient="0x2", status="pending")
+    node.submitted[txn.txn_hash] = {"type": "user_transaction", "success": True}
+    track_transaction(get_client(node.url), txn).result(5)
+    assert txn.status == "completed"
+
+
+def test_cancelled_waiter_does_not_stop_the_others(node):
+    tracker = ConfirmationTracker(min_interval=0.02, max_interval=0.05)
+    client = get_client(node.url)
+    txn_hash = "0x" + "ab" * 32
+    cancelled, waiting = tracker.track(client, txn_hash), tracker.track(client, txn_hash)
+    other = tracker.track(client, "0x" + "cd" * 32)
+    assert cancelled.cancel()
+
+    node.submitted[txn_hash] = {"type": "user_transaction", "success": True}
+    node.submitted["0x" + "cd" * 32] = {"type": "user_transaction", "success": False}
+    assert (waiting.result(5), other.result(5)) == ("completed", "failed")
+
+
+def test_track_transaction_reports_cancellation(monkeypatch):
+    inner = concurrent.futures.Future()
+    tracker = SimpleNamespace(track=lambda client, txn_hash: inner)
+    monkeypatch.setattr("utils.confirmation_tracker.confirmation_tracker", tracker)
+    txn = SimpleNamespace(txn_hash="0x" + "ee" * 32, sender="0x1", recipient="0x2", status="pending")
+    updated = track_transaction(None, txn)
+    inner.cancel()
+    with pytest.raises(concurrent.futures.CancelledError):
+        updated.result(1)
+    assert txn.status == "pending"
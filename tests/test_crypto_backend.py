@@ -0,0 +1,56 @@
+import pytest
+from aptos_sdk import secp256k1_ecdsa
+from aptos_sdk.account import Account
+from aptos_sdk.account_address import AccountAddress
+from aptos_sdk.asymmetric_crypto_wrapper import PublicKey as AnyPublicKey
+
+from utils.crypto_backend import (
+    SECP256K1_ORDER, BackendPrivateKey, available_backends, generate_account, get_backend, use_backend, verify
+)
+
+MESSAGE = b"1p wallet message"
+
+
+@pytest.mark.parametrize("name", available_backends())
+def test_backends_are_interchangeable(name):
+    backend = get_backend(name)
+    secret = backend.generate()
+    private = backend.load_private(secret)
+    public_key = backend.public_key(private)
+    sdk_key = secp256k1_ecdsa.PrivateKey.from_hex(secret)
+    assert public_key == sdk_key.public_key().to_crypto_bytes()
+
+    signature = backend.sign(private, MESSAGE)
+    assert int.from_bytes(signature[32:], "big") <= SECP256K1_ORDER // 2
+    # The SDK and every other backend accept it
+    assert sdk_key.public_key().verify(MESSAGE, secp256k1_ecdsa.Signature(signature))
+    for other in available_backends():
+        assert verify(public_key, MESSAGE, signature, other)
+        assert not verify(public_key, MESSAGE + b"!", signature, other)
+
+    # The high-S twin of a valid signature is rejected, as on chain
+    high_s = (SECP256K1_ORDER - int.from_bytes(signature[32:], "big")).to_bytes(32, "big")
+    assert not verify(public_key, MESSAGE, signature[:32] + high_s, name)
+    assert not verify(b"\x04" + b"\x00" * 64, MESSAGE, signature, name)
+
+
+def test_generated_account_matches_sdk_derivation():
+    account = generate_account()
+    sdk_key = secp256k1_ecdsa.PrivateKey.from_hex(account.private_key.hex())
+    assert account.address() == AccountAddress.from_key(AnyPublicKey(sdk_key.public_key()))
+    assert account.public_key() == sdk_key.public_key()
+    assert sdk_key.public_key().verify(MESSAGE, account.sign(MESSAGE))
+
+
+def test_use_backend_upgrades_secp256k1_accounts_only():
+    account = Account.generate_secp256k1_ecdsa()
+    address = account.address()
+    assert use_backend(account) is account
+    assert isinstance(account.private_key, BackendPrivateKey)
+    assert account.address() == address
+    key = account.private_key
+    assert use_backend(account).private_key is key  # loaded once
+
+    ed25519 = Account.generate()
+    before = ed25519.private_key
+    assert use_backend(ed25519).private_key is before
@@ -0,0 +1,17 @@
+import hashlib
+
+from utils.entropy import generate_entropy_layers
+
+
+def test_layers_are_consecutive_words_of_one_shake256_output():
+    digest = hashlib.shake_256(b"nonce").digest(12)
+    assert generate_entropy_layers("nonce", 3) == [int.from_bytes(digest[i:i + 4], "big") for i in (0, 4, 8)]
+    # A prefix of more layers: extending a challenge never changes earlier rounds
+    assert generate_entropy_layers("nonce", 5)[:3] == generate_entropy_layers("nonce", 3)
+    assert generate_entropy_layers("nonce", 0) == []
+
+
+def test_non_deterministic_mode_is_not_reproducible():
+    assert generate_entropy_layers("nonce", 4, deterministic=False) != generate_entropy_layers("nonce", 4)
+    assert generate_entropy_layers("nonce", 4, deterministic=False) != \
+        generate_entropy_layers("nonce", 4, deterministic=False)
@@ -0,0 +1,15 @@
+from utils.env import env_float, env_int, env_ints
+
+
+def test_malformed_values_fall_back_to_the_default(monkeypatch):
+    monkeypatch.setenv("TEST_SETTING", "ten")
+    assert env_int("TEST_SETTING", 10) == 10
+    assert env_float("TEST_SETTING", 2.5) == 2.5
+    assert env_ints("TEST_SETTING", (1, 2)) == (1, 2)
+
+    monkeypatch.setenv("TEST_SETTING", "3, 4")
+    assert env_ints("TEST_SETTING", (1, 2)) == (3, 4)
+    monkeypatch.setenv("TEST_SETTING", "7")
+    assert (env_int("TEST_SETTING", 10), env_float("TEST_SETTING", 2.5)) == (7, 7.0)
+    monkeypatch.delenv("TEST_SETTING")
+    assert env_int("TEST_SETTING", 10) == 10
@@ -0,0 +1,38 @@
+import time
+
+import pytest
+
+from utils.client_pool import get_client
+from utils.gas import GasEstimate, GasPriceEstimator
+
+
+def test_estimate_is_cached_and_refreshed_in_background(node, clock):
+    estimator = GasPriceEstimator(ttl=10, stale_ttl=60, clock=clock)
+    client = get_client(node.url)
+    gas = estimator.get(client)
+    assert (gas.deprioritized, gas.normal, gas.prioritized) == (100, 100, 150)
+    estimator.get(client)
+    assert node.requests == 1
+
+    # Stale: served immediately while one refresh runs in the background
+    clock.now = 20
+    node.respond("GET", "/v1/estimate_gas_price", 200, {"gas_estimate": 200})
+    assert estimator.get(client).normal == 100
+    deadline = time.time() + 5
+    while estimator.get(client).normal != 200 and time.time() < deadline:
+        time.sleep(0.01)
+    assert estimator.get(client).prioritized == 200
+    assert node.requests == 2
+
+
+def test_unreachable_node_falls_back_to_client_default(node):
+    node.respond("GET", "/v1/estimate_gas_price", 400, {"error_code": "invalid_input"})
+    client = get_client(node.url)
+    assert GasPriceEstimator().get(client).normal == client.client_config.gas_unit_price
+
+
+def test_fee_and_speed_validation():
+    gas = GasEstimate(deprioritized=100, normal=100, prioritized=150)
+    assert gas.fee_apt("prioritized", gas_units=10) == pytest.approx(0.000015)
+    with pytest.raises(ValueError):
+        gas.price("instant")
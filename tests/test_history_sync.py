@@ -0,0 +1,62 @@
+import asyncio
+from dataclasses import dataclass
+
+from utils.history_sync import fetch_new_transactions, merge_transactions
+
+
+@dataclass
+class Txn:
+    txn_hash: str
+    timestamp: float
+
+
+def make_chain(count):
+    return [{"hash": f"0x{i:x}", "sequence_number": str(i), "timestamp": str(i * 1000000)}
+            for i in range(count)]
+
+
+class FakeFetcher:
+    def __init__(self, chain):
+        self.chain = chain
+        self.calls = []
+
+    async def __call__(self, address, limit, start):
+        self.calls.append(start)
+        if start is None:
+            return self.chain[-limit:]
+        return self.chain[start:start + limit]
+
+
+def test_first_sync_fetches_latest_page_only():
+    fetcher = FakeFetcher(make_chain(1000))
+    raw, watermark = asyncio.run(fetch_new_transactions(fetcher, "0x1", None, page_size=25))
+    assert len(raw) == 25
+    assert watermark == 1000
+    assert fetcher.calls == [None]
+
+
+def test_refresh_fetches_only_newer_pages():
+    chain = make_chain(1000)
+    fetcher = FakeFetcher(chain)
+    _, watermark = asyncio.run(fetch_new_transactions(fetcher, "0x1", None, page_size=25))
+    chain.extend(make_chain(1030)[1000:])
+    fetcher.calls.clear()
+    raw, watermark = asyncio.run(fetch_new_transactions(fetcher, "0x1", watermark, page_size=25))
+    assert [r["sequence_number"] for r in raw] == [str(i) for i in range(1000, 1030)]
+    assert watermark == 1030
+    assert fetcher.calls == [1000, 1025]
+
+
+def test_refresh_with_nothing_new_is_one_request():
+    fetcher = FakeFetcher(make_chain(10))
+    raw, watermark = asyncio.run(fetch_new_transactions(fetcher, "0x1", 10, page_size=25))
+    assert raw == [] and watermark == 10
+    assert fetcher.calls == [10]
+
+
+def test_merge_keeps_newest_first_and_dedupes():
+    txns, hashes = [], set()
+    merge_transactions(txns, hashes, [Txn("a", 1), Txn("c", 3)])
+    added = merge_transactions(txns, hashes, [Txn("b", 2), Txn("c", 3), Txn("d", 4)])
+    assert added == 2
+    assert [t.txn_hash for t in txns] == ["d", "c", "b", "a"]
@@ -0,0 +1,36 @@
+import asyncio
+import threading
+
+import pytest
+
+from utils.nest_runner import async_to_sync, get_loop, submit
+
+
+async def _current_loop():
+    return asyncio.get_running_loop()
+
+
+def test_all_threads_share_one_loop():
+    seen = []
+
+    def worker():
+        seen.append(async_to_sync(_current_loop()))
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len({id(loop) for loop in seen}) == 1
+    assert seen[0] is get_loop()
+
+
+def test_submit_returns_future():
+    future = submit(asyncio.sleep(0, result=42))
+    assert future.result(timeout=5) == 42
+
+
+def test_submit_timeout_cancels():
+    with pytest.raises(TimeoutError):
+        submit(asyncio.sleep(5), timeout=0.05).result(timeout=5)
@@ -0,0 +1,141 @@
+import asyncio
+
+import pytest
+from aptos_sdk.async_client import ApiError
+
+from utils.nest_runner import async_to_sync
+from utils.sequence_manager import SequenceNumberManager, get_sequence_manager, is_rejection, is_sequence_error
+
+
+class FakeClient:
+    base_url = "http://fake-node/v1"
+
+    def __init__(self, on_chain=7):
+        self.on_chain = on_chain
+        self.calls = 0
+
+    async def account_sequence_number(self, address):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return self.on_chain
+
+
+def test_concurrent_allocations_are_unique_and_use_one_node_call():
+    client = FakeClient()
+    manager = SequenceNumberManager(client, "0x1")
+
+    async def allocate(n):
+        return await asyncio.gather(*(manager.next_sequence_number() for _ in range(n)))
+
+    numbers = async_to_sync(allocate(20))
+    assert sorted(numbers) == list(range(7, 27))
+    assert client.calls == 1
+
+
+def test_released_numbers_are_reused_without_node_calls():
+    client = FakeClient(on_chain=3)
+    manager = SequenceNumberManager(client, "0x1")
+
+    first, second, third = (async_to_sync(manager.next_sequence_number()) for _ in range(3))
+    async_to_sync(manager.release(third))
+    assert async_to_sync(manager.next_sequence_number()) == third
+
+    # Releasing an earlier number leaves a gap, which the next allocation fills
+    async_to_sync(manager.release(first))
+    assert async_to_sync(manager.next_sequence_number()) == first
+    assert async_to_sync(manager.next_sequence_number()) == 6
+    assert client.calls == 1
+
+
+def test_sequence_error_triggers_resync():
+    client = FakeClient(on_chain=0)
+    manager = SequenceNumberManager(client, "0x1")
+    seq = async_to_sync(manager.next_sequence_number())
+
+    error = ApiError('{"error_code":"vm_error","message":"SEQUENCE_NUMBER_TOO_OLD"}', 400)
+    assert is_sequence_error(error)
+    client.on_chain = 9
+    async_to_sync(manager.release(seq, error))
+    assert async_to_sync(manager.next_sequence_number()) == 9
+
+    # The chain never moves the counter backwards while numbers are in flight
+    for _ in range(5):
+        async_to_sync(manager.next_sequence_number())
+    async_to_sync(manager.release(9, error))
+    assert async_to_sync(manager.next_sequence_number()) == 15
+
+
+def test_too_new_rewinds_no_further_than_numbers_in_flight():
+    client = FakeClient(on_chain=0)
+    manager = SequenceNumberManager(client, "0x1")
+    for _ in range(5):
+        async_to_sync(manager.next_sequence_number())
+    too_new = ApiError('{"error_code":"vm_error","message":"SEQUENCE_NUMBER_TOO_NEW"}', 400)
+
+    # 3 and 4 are still in flight: only the released number is handed out again
+    async_to_sync(manager.release(2, too_new))
+    assert async_to_sync(manager.next_sequence_number()) == 2
+    assert async_to_sync(manager.next_sequence_number()) == 5
+
+    # Nothing in flight above 3 once 4 and 5 are released: rewind to 3
+    async_to_sync(manager.release(3))
+    async_to_sync(manager.release(4))
+    async_to_sync(manager.release(5, too_new))
+    assert [async_to_sync(manager.next_sequence_number()) for _ in range(2)] == [3, 4]
+
+
+def test_abandoned_numbers_are_reused_only_after_they_expire(clock):
+    client = FakeClient(on_chain=0)
+    manager = SequenceNumberManager(client, "0x1", clock=clock)
+    first, second = (async_to_sync(manager.next_sequence_number()) for _ in range(2))
+
+    # A timeout after sending: the node may hold ``second``, so it is not handed out again
+    async_to_sync(manager.abandon(second, expires_at=100))
+    assert async_to_sync(manager.next_sequence_number()) == 2
+    assert not is_rejection(ApiError("Service Unavailable", 503)) and not is_rejection(TimeoutError())
+    assert is_rejection(ApiError("bad request", 400))
+
+    # Expired with the chain still below it: it never landed, so rewind to the chain
+    client.on_chain = 1
+    clock.now = 200
+    assert async_to_sync(manager.next_sequence_number()) == 1
+
+
+def test_expired_abandoned_number_that_landed_is_forgotten(clock):
+    client = FakeClient(on_chain=0)
+    manager = SequenceNumberManager(client, "0x1", clock=clock)
+    seq = async_to_sync(manager.next_sequence_number())
+    async_to_sync(manager.abandon(seq, expires_at=100))
+    client.on_chain = 1
+    clock.now = 200
+    assert async_to_sync(manager.next_sequence_number()) == 1
+    assert async_to_sync(manager.next_sequence_number()) == 2
+
+
+def test_waiting_for_room_in_flight_times_out_without_holding_the_lock():
+    client = FakeClient(on_chain=0)
+    manager = SequenceNumberManager(client, "0x1", max_in_flight=2, in_flight_timeout=0.1)
+
+    async def scenario():
+        await manager.next_sequence_number()
+        await manager.next_sequence_number()
+        waiter = asyncio.ensure_future(manager.next_sequence_number())
+        await asyncio.sleep(0.05)
+        # Others can still use the manager while the allocation waits
+        await asyncio.wait_for(manager.release(1), 0.05)
+        return await waiter
+
+    assert async_to_sync(scenario()) == 1
+
+    async def full():
+        await manager.next_sequence_number()
+        return await manager.next_sequence_number()
+
+    with pytest.raises(TimeoutError):
+        async_to_sync(full())
+
+
+def test_managers_are_shared_per_account():
+    client = FakeClient()
+    assert get_sequence_manager(client, "0x1") is get_sequence_manager(client, "0x01")
+    assert get_sequence_manager(client, "0x1") is not get_sequence_manager(client, "0x2")
@@ -0,0 +1,60 @@
+import json
+
+from aptos_sdk.account import Account
+
+from utils.crypto_backend import generate_account
+from utils.signature_verifier import public_key_hex, verify_lines
+
+SIGNERS = [Account.generate(), generate_account()]
+
+
+def signed_row(account, text, **overrides):
+    row = {
+        'public_key': public_key_hex(account),
+        'message': text,
+        'signature': str(account.sign(text.encode())),
+        'address': str(account.address()),
+    }
+    row.update(overrides)
+    return json.dumps(row, ensure_ascii=False)
+
+
+def test_verifies_ed25519_and_secp256k1_rows():
+    lines = [signed_row(account, "héllo 👋") for account in SIGNERS]
+    results = list(verify_lines(lines))
+    assert [r.valid for r in results] == [True, True]
+    assert [r.address for r in results] == [str(a.address()) for a in SIGNERS]
+    assert all(r.error is None for r in results)
+
+
+def test_reports_invalid_rows_per_line():
+    ed, secp = SIGNERS
+    lines = [
+        signed_row(ed, "original", message="tampered"),
+        "",
+        signed_row(secp, "hi", address=str(ed.address())),
+        "{not json",
+        json.dumps({'public_key': public_key_hex(ed), 'message': "x"}),
+        signed_row(secp, "hi", public_key="0x1234"),
+        signed_row(ed, "hi", address="0x" + "1" * 65),
+    ]
+    results = list(verify_lines(lines))
+    assert [r.line for r in results] == [1, 3, 4, 5, 6, 7]  # blank line skipped but counted
+    assert not any(r.valid for r in results)
+    assert results[0].error == "signature does not verify"
+    assert results[0].address == str(ed.address())
+    assert results[1].error == "address does not match public key"
+    assert results[3].error == "missing signature"
+    assert "unsupported public key length" in results[4].error
+    assert "too long" in results[5].error
+
+
+def test_process_pool_preserves_input_order():
+    lines = []
+    for i in range(60):
+        account = SIGNERS[i % 2]
+        lines.append(signed_row(account, f"msg {i}", message="bad") if i % 7 == 0 else signed_row(account, f"msg {i}"))
+    inline = list(verify_lines(lines, workers=1))
+    pooled = list(verify_lines(iter(lines), workers=2, chunk_size=8))
+    assert pooled == inline
+    assert [r.valid for r in pooled] == [i % 7 != 0 for i in range(60)]
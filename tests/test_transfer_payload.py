@@ -0,0 +1,65 @@
+from aptos_sdk.account import Account
+from aptos_sdk.account_address import AccountAddress
+from aptos_sdk.bcs import Deserializer, Serializer
+from aptos_sdk.transactions import (
+    EntryFunction, RawTransaction, SignedTransaction, TransactionArgument, TransactionPayload
+)
+from aptos_sdk.type_tag import StructTag, TypeTag
+
+from utils.balance import APT_COIN_TYPE
+from utils.transfer_payload import apt_transfer
+
+RECIPIENT = "0x" + "cd" * 32
+FIELDS = dict(sequence_number=42, amount_octas=123456789, max_gas_amount=2000,
+              gas_unit_price=150, expiration_timestamp_secs=1_700_000_600, chain_id=2)
+
+
+def sdk_raw_transaction(sender: Account) -> RawTransaction:
+    payload = TransactionPayload(EntryFunction.natural(
+        "0x1::coin",
+        "transfer",
+        [TypeTag(StructTag.from_str(APT_COIN_TYPE))],
+        [TransactionArgument(AccountAddress.from_str_relaxed(RECIPIENT), Serializer.struct),
+         TransactionArgument(FIELDS["amount_octas"], Serializer.u64)],
+    ))
+    return RawTransaction(sender.address(), FIELDS["sequence_number"], payload, FIELDS["max_gas_amount"],
+                          FIELDS["gas_unit_price"], FIELDS["expiration_timestamp_secs"], FIELDS["chain_id"])
+
+
+def template_raw_transaction(sender: Account) -> bytes:
+    return apt_transfer.raw_transaction_bytes(sender.address(), recipient=RECIPIENT, **FIELDS)
+
+
+def test_raw_transaction_matches_sdk_serialization():
+    sender = Account.generate()
+    sdk_raw = sdk_raw_transaction(sender)
+    serializer = Serializer()
+    sdk_raw.serialize(serializer)
+    assert template_raw_transaction(sender) == serializer.output()
+
+    payload = Serializer()
+    sdk_raw.payload.serialize(payload)
+    assert apt_transfer.payload_bytes(RECIPIENT, FIELDS["amount_octas"]) == payload.output()
+
+
+def test_signed_ed25519_transfer_matches_sdk():
+    # Ed25519 signatures are deterministic, so the whole signed transaction must match
+    sender = Account.generate()
+    sdk_raw = sdk_raw_transaction(sender)
+    sdk_signed = SignedTransaction(sdk_raw, sender.sign_transaction(sdk_raw))
+
+    signed = apt_transfer.sign(sender, template_raw_transaction(sender))
+    assert signed.data == sdk_signed.bytes()
+    assert signed.hash == sdk_signed.hash()
+    assert signed.expiration_timestamp_secs == FIELDS["expiration_timestamp_secs"]
+
+
+def test_signed_secp256k1_transfer_verifies():
+    # ECDSA signatures are randomized: check the structure and the signature instead
+    sender = Account.generate_secp256k1_ecdsa()
+    signed = apt_transfer.sign(sender, template_raw_transaction(sender))
+    decoded = SignedTransaction.deserialize(Deserializer(signed.data))
+    assert decoded.transaction == sdk_raw_transaction(sender)
+    assert decoded.hash() == signed.hash
+    single_key = decoded.authenticator.authenticator.sender.authenticator
+    assert single_key.public_key.verify(decoded.transaction.keyed(), single_key.signature)
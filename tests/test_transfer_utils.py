@@ -0,0 +1,151 @@
+import httpx
+from aptos_sdk.account import Account
+
+from utils.nest_runner import async_to_sync, submit
+from utils import transfer_utils
+from utils.transfer_utils import is_unconfirmed, transfer_apt_async, transfer_apt_batch_sync, transfer_apt_sync
+
+RECIPIENT = "0x" + "cd" * 32
+UNAVAILABLE = {"error_code": "service_unavailable"}
+
+
+def test_concurrent_transfers_pipeline_sequence_numbers(node):
+    sender = Account.generate()
+    account_lookups = []
+
+    def count_lookup(forward):
+        account_lookups.append(1)
+        return forward()
+
+    node.override("GET", r"/v1/accounts/[^/]+", count_lookup)
+    futures = [submit(transfer_apt_async(sender, RECIPIENT, 0.01, node.url)) for _ in range(10)]
+    results = [f.result(10) for f in futures]
+    assert all(success for success, _, _ in results), results
+    assert sorted(int(t["sequence_number"]) for t in node.submitted.values()) == list(range(10))
+    # One sequence-number fetch for the whole burst
+    assert len(account_lookups) == 1
+
+
+def test_transfer_resyncs_after_sequence_number_too_old(node):
+    sender = Account.generate()
+    assert async_to_sync(transfer_apt_async(sender, RECIPIENT, 0.01, node.url))[0]
+    # Another process sends from the same account behind our back
+    node.sequence_numbers[str(sender.address())] += 3
+    success, txn_hash, error = async_to_sync(transfer_apt_async(sender, RECIPIENT, 0.01, node.url))
+    assert success, error
+    assert node.submitted[txn_hash]["sequence_number"] == "4"
+
+
+def test_batch_transfer_reports_per_transaction_acceptance(node):
+    sender = Account.generate()
+    transfers = [(RECIPIENT, 0.01)] * 12 + [("not-an-address", 0.01)]
+    # A number the node has already seen: that one transfer is rejected
+    node.sequence_numbers[str(sender.address())] = 0
+    node.park(str(sender.address()), 5)
+    results = transfer_apt_batch_sync(sender, transfers, node.url, batch_size=5, speed="prioritized")
+
+    assert [r.accepted for r in results] == [True] * 5 + [False] + [True] * 6 + [False]
+    assert "SEQUENCE_NUMBER_TOO_OLD" in results[5].error
+    assert results[-1].txn_hash is None and results[-1].error
+    assert all(r.txn_hash in node.submitted for r in results if r.accepted)
+    assert {t["gas_unit_price"] for t in node.submitted.values()} == {"150"}
+    # 3 batch requests, chain id, gas price, sequence number and one resync after the rejection
+    assert node.requests == 7
+
+
+def test_server_error_after_submission_never_reuses_the_sequence_number(node):
+    sender = Account.generate()
+    outcomes = iter(["accept", "drop"])
+
+    def failing_submit(forward):
+        if next(outcomes, None) == "accept":
+            forward()  # accepted, but the response is lost
+        return 503, UNAVAILABLE
+
+    node.override("POST", "/v1/transactions", failing_submit)
+    # The node holds the first one: found by hash and reported as sent
+    success, txn_hash, error = async_to_sync(transfer_apt_async(sender, RECIPIENT, 0.01, node.url))
+    assert success, error
+    assert node.submitted[txn_hash]["sequence_number"] == "0"
+
+    # The second one is not found: reported with its hash, and its number is not reused
+    success, txn_hash, error = async_to_sync(transfer_apt_async(sender, RECIPIENT, 0.01, node.url))
+    assert not success and txn_hash not in node.submitted and "may still land" in error
+    node.clear_overrides()
+    success, txn_hash, _ = async_to_sync(transfer_apt_async(sender, RECIPIENT, 0.01, node.url))
+    assert node.submitted[txn_hash]["sequence_number"] == "2"
+
+
+def test_waiting_for_confirmation_gives_up_after_timeout(node):
+    sender = Account.generate()
+    # Accepted, but never committed
+    node.respond("GET", "/v1/transactions/by_hash/.+", 404, {"error_code": "transaction_not_found"})
+    success, txn_hash, error = transfer_apt_sync(sender, RECIPIENT, 0.01, node.url, wait=True, timeout=0.2)
+    assert not success and txn_hash in node.submitted
+    assert is_unconfirmed(error) and not is_unconfirmed("Transaction failed")
+
+
+def test_connection_failure_releases_the_sequence_number(node, monkeypatch):
+    sender = Account.generate()
+    submit_signed = transfer_utils._submit_signed
+
+    async def unreachable(client, signed):
+        monkeypatch.setattr(transfer_utils, "_submit_signed", submit_signed)
+        raise httpx.ConnectError("connection refused")
+
+    monkeypatch.setattr(transfer_utils, "_submit_signed", unreachable)
+    success, _, error = async_to_sync(transfer_apt_async(sender, RECIPIENT, 0.01, node.url))
+    assert not success and "connection refused" in error and "may still land" not in error
+
+    # Nothing was sent, so the next transfer reuses the number
+    success, txn_hash, error = async_to_sync(transfer_apt_async(sender, RECIPIENT, 0.01, node.url))
+    assert success, error
+    assert node.submitted[txn_hash]["sequence_number"] == "0"
+
+
+def test_batch_server_error_keeps_whatever_the_node_accepted(node):
+    sender = Account.generate()
+
+    def failing_batch(forward):
+        forward()
+        return 503, UNAVAILABLE
+
+    node.override("POST", "/v1/transactions/batch", failing_batch)
+    results = transfer_apt_batch_sync(sender, [(RECIPIENT, 0.01)] * 3, node.url)
+    assert all(r.accepted and not r.uncertain for r in results)
+    assert sorted(int(t["sequence_number"]) for t in node.submitted.values()) == [0, 1, 2]
+
+    # Nothing arrived: the outcome is unknown and the numbers are not reused
+    node.respond("POST", "/v1/transactions/batch", 503, UNAVAILABLE)
+    results = transfer_apt_batch_sync(sender, [(RECIPIENT, 0.01)] * 3, node.url)
+    assert all(r.uncertain and not r.accepted for r in results)
+    node.clear_overrides()
+    success, txn_hash, _ = async_to_sync(transfer_apt_async(sender, RECIPIENT, 0.01, node.url))
+    assert node.submitted[txn_hash]["sequence_number"] == "6"
+
+
+def test_batch_skips_invalid_amounts_and_signing_failures_without_leaving_gaps(node, monkeypatch):
+    sender = Account.generate()
+    sign = transfer_utils.sign_transfer
+    calls = []
+
+    async def flaky_sign(client, account, recipient, amount_octas, sequence_number, speed="normal"):
+        calls.append(sequence_number)
+        if len(calls) == 2:
+            raise RuntimeError("chain id unavailable")
+        return await sign(client, account, recipient, amount_octas, sequence_number, speed)
+
+    monkeypatch.setattr(transfer_utils, "sign_transfer", flaky_sign)
+    transfers = [(RECIPIENT, 0.01), (RECIPIENT, 0.01), (RECIPIENT, -1.0), (RECIPIENT, 2e11), (RECIPIENT, 0.29)]
+    results = transfer_apt_batch_sync(sender, transfers, node.url)
+    assert [r.accepted for r in results] == [True, False, False, False, True]
+    assert "chain id unavailable" in results[1].error and results[1].sequence_number is None
+    assert "out of range" in results[2].error and "out of range" in results[3].error
+    # The failed signature's number went to the next transfer: no gap
+    assert calls == [0, 1, 1]
+    assert sorted(int(t["sequence_number"]) for t in node.submitted.values()) == [0, 1]
+
+    success, txn_hash, error = transfer_apt_sync(sender, RECIPIENT, 0.01, node.url)
+    assert success, error
+    assert node.submitted[txn_hash]["sequence_number"] == "2"
+    assert node.sequence_numbers[str(sender.address())] == 3
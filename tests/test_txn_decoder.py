@@ -0,0 +1,46 @@
+import json
+
+import pytest
+
+from scripts.fake_node import make_transaction
+from utils import txn_decoder
+from utils.client_pool import get_client
+from utils.nest_runner import async_to_sync
+from utils.txn_decoder import decode_transactions, fetch_transaction_records, record_from_dict
+
+SENDER = "0x" + "aa" * 32
+RECIPIENT = "0x" + "bb" * 32
+
+
+def make_page(count):
+    page = [make_transaction(i, SENDER, RECIPIENT, amount=i + 1) for i in range(count)]
+    # A nested argument and a non-user transaction
+    page[0]["payload"]["arguments"] = [RECIPIENT, ["1", "2"], {"inner": "x"}, True]
+    page.append({"type": "block_metadata_transaction", "hash": "0xbeef", "version": "9", "timestamp": "5"})
+    return page
+
+
+def chunked(data, size):
+    return (data[i:i + size] for i in range(0, len(data), size))
+
+
+@pytest.mark.parametrize("chunk_size", [7, 4096, 1 << 20])
+def test_streamed_records_match_dict_extraction(chunk_size):
+    page = make_page(20)
+    records = decode_transactions(chunked(json.dumps(page).encode(), chunk_size))
+    assert records == [record_from_dict(raw) for raw in page]
+    assert records[0].arguments == (RECIPIENT, None, None, True)
+    assert records[5].sequence_number == 5 and records[5].function == "0x1::coin::transfer"
+    assert records[-1].sender is None and records[-1].version == 9
+
+
+def test_fallback_without_ijson(monkeypatch):
+    page = make_page(3)
+    monkeypatch.setattr(txn_decoder, "ijson", None)
+    assert decode_transactions(chunked(json.dumps(page).encode(), 10)) == [record_from_dict(r) for r in page]
+
+
+def test_fetch_transaction_records_from_node(node):
+    node.transactions[SENDER] = make_page(30)[:30]
+    records = async_to_sync(fetch_transaction_records(get_client(node.url), SENDER, limit=10, start=5))
+    assert [r.sequence_number for r in records] == list(range(5, 15))
@@ -0,0 +1,137 @@
+"""
+Failed-authentication limiter keyed by wallet address.
+
+Each failure counts into a sliding window approximated from two fixed
+buckets: the previous window's count, weighted by how much of it still
+overlaps, plus the current window's count. Recording or reading a key is
+O(1), with no timestamp history to scan. Keys live in an LRU-ordered dict
+capped at ``max_keys``; the least recently touched wallet is evicted first,
+so memory stays bounded under address spraying.
+
+The windowed failure count drives the challenge: difficulty rises by one
+level per ``failures_per_level`` failures, up to ``max_difficulty``. At
+``block_after`` failures the wallet is flagged ``high_abuse`` and may not
+start a challenge until the window slides past the burst.
+
+Counts are kept in memory and only in this process: a restart forgets them,
+and each replica behind a load balancer keeps its own, so a client spread
+across N replicas gets up to N times the failures before being blocked. The
+authentication flow records attempts through ``OnePVerifier.verify_attempt``.
+
+Configuration:
+
+    ABUSE_WINDOW              seconds in the sliding window (default 300)
+    ABUSE_MAX_KEYS            wallets tracked at most (default 100000)
+    ABUSE_FAILURES_PER_LEVEL  failures per extra difficulty level (default 2)
+    ABUSE_MAX_DIFFICULTY      difficulty cap (default 5)
+    ABUSE_BLOCK_AFTER         failures in the window that block (default 10)
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from utils.env import env_float, env_int
+
+ABUSE_WINDOW = env_float('ABUSE_WINDOW', 300)
+ABUSE_MAX_KEYS = env_int('ABUSE_MAX_KEYS', 100000)
+ABUSE_FAILURES_PER_LEVEL = env_int('ABUSE_FAILURES_PER_LEVEL', 2)
+ABUSE_MAX_DIFFICULTY = env_int('ABUSE_MAX_DIFFICULTY', 5)
+ABUSE_BLOCK_AFTER = env_int('ABUSE_BLOCK_AFTER', 10)
+
+
+@dataclass
+class SessionState:
+    failure_count: int = 0
+    first_failure_ts: Optional[float] = None
+    last_failure_ts: Optional[float] = None
+    d: int = 1
+    high_abuse: bool = False
+
+
+class AbuseLimiter:
+    """Sliding-window failure counts per key, with LRU eviction."""
+
+    def __init__(self, window: Optional[float] = None, max_keys: Optional[int] = None,
+                 failures_per_level: Optional[int] = None, max_difficulty: Optional[int] = None,
+                 block_after: Optional[int] = None, clock: Callable[[], float] = time.time):
+        self.window = window if window is not None else ABUSE_WINDOW
+        self.max_keys = max_keys if max_keys is not None else ABUSE_MAX_KEYS
+        self.failures_per_level = failures_per_level if failures_per_level is not None else ABUSE_FAILURES_PER_LEVEL
+        self.max_difficulty = max_difficulty if max_difficulty is not None else ABUSE_MAX_DIFFICULTY
+        self.block_after = block_after if block_after is not None else ABUSE_BLOCK_AFTER
+        self._clock = clock
+        # key -> [bucket, count, previous_count, first_failure_ts, last_failure_ts]
+        self._entries: "OrderedDict[str, List]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def state(self, key: str) -> SessionState:
+        """The current SessionState for ``key`` (defaults if it has no recent failures)."""
+        with self._lock:
+            return self._state_locked(key, self._clock())
+
+    def record_failure(self, key: str) -> SessionState:
+        """Count a failed authentication for ``key``; returns its updated state."""
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = [self._bucket(now), 0, 0, now, now]
+                self._entries[key] = entry
+                if len(self._entries) > self.max_keys:
+                    self._entries.popitem(last=False)
+            elif self._slide(entry, now) == 0:
+                entry[3] = now  # a new burst
+            entry[1] += 1
+            entry[4] = now
+            return self._state_locked(key, now)
+
+    def record_success(self, key: str) -> None:
+        """Forget ``key``'s failures: the user has proved they know the secret."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _bucket(self, now: float) -> int:
+        return int(now // self.window)
+
+    def _slide(self, entry: List, now: float) -> float:
+        """Roll ``entry``'s buckets forward to ``now``; returns the windowed count before this event."""
+        bucket = self._bucket(now)
+        if bucket == entry[0] + 1:
+            entry[2], entry[1] = entry[1], 0
+        elif bucket != entry[0]:
+            entry[2] = entry[1] = 0
+        entry[0] = bucket
+        overlap = 1 - (now - bucket * self.window) / self.window
+        return entry[2] * overlap + entry[1]
+
+    def _state_locked(self, key: str, now: float) -> SessionState:
+        entry = self._entries.get(key)
+        if entry is None:
+            return SessionState()
+        self._entries.move_to_end(key)
+        failures = math.ceil(self._slide(entry, now))
+        if failures == 0:
+            del self._entries[key]  # fully expired
+            return SessionState()
+        return SessionState(
+            failure_count=failures,
+            first_failure_ts=entry[3],
+            last_failure_ts=entry[4],
+            d=min(1 + failures // self.failures_per_level, self.max_difficulty),
+            high_abuse=failures >= self.block_after,
+        )
+
+
+# Shared instance used by the authentication page
+abuse_limiter = AbuseLimiter()
@@ -1,7 +1,204 @@
-from collections import defaultdict
-from typing import List, Dict, Tuple
+import hashlib
+import html
+from functools import lru_cache
+from typing import List, Dict, NamedTuple, Optional, Tuple
+
+from utils.abuse_limiter import AbuseLimiter
+from utils.challenge_alphabet import ChallengeAlphabet, get_alphabet
+from utils.entropy import generate_entropy_layers
+from utils.helpers import generate_nonce
+
+# Domain separation for the skip-round keys derived from a nonce
+SKIP_DOMAIN = b"1p-skip:"
+
+# Served by Streamlit static serving (enableStaticServing in .streamlit/config.toml)
+GRID_STYLESHEET = '<link rel="stylesheet" href="./app/static/grid.css">'
+
+
+@lru_cache(maxsize=8)
+def _grid_cells(alphabet: ChallengeAlphabet) -> Tuple[str, ...]:
+    # Escaped once per alphabet: the symbols domain contains <, > and &
+    return tuple(f"<i>{html.escape(char)}</i>" for char in alphabet.chars)
+
+
+def skip_rounds_for(nonce: str, total_rounds: int, skips: int) -> List[int]:
+    """
+    The rounds the user must skip, drawn from the nonce.
+
+    Each round gets a 16-bit key from SHAKE-256 of the nonce; the ``skips``
+    rounds with the lowest keys (ties by round index) are skipped.
+    """
+    keys = hashlib.shake_256(SKIP_DOMAIN + nonce.encode()).digest(2 * total_rounds)
+    order = sorted(range(total_rounds), key=lambda i: (keys[2 * i] << 8 | keys[2 * i + 1], i))
+    return sorted(order[:skips])
+
+
+class ChallengeSeed(NamedTuple):
+    """Everything random about a challenge, independent of the user's alphabet and mapping."""
+    nonce: str
+    difficulty: int
+    entropy_layers: Tuple[int, ...]  # one per round; offset = layer % len(alphabet)
+    skip_rounds: Tuple[int, ...]
+
+
+def make_seed(difficulty: int, nonce: Optional[str] = None) -> ChallengeSeed:
+    """
+    Draw the seed for a challenge of ``difficulty`` non-skip rounds.
+
+    Everything is derived from the nonce, so the same nonce always gives the
+    same seed. Pass none to draw a fresh one.
+    """
+    if difficulty < 1:
+        raise ValueError(f"difficulty must be at least 1, got {difficulty}")
+    nonce = nonce or generate_nonce()
+    total_rounds = difficulty + difficulty // 2
+    return ChallengeSeed(nonce, difficulty, tuple(generate_entropy_layers(nonce, total_rounds)),
+                         tuple(skip_rounds_for(nonce, total_rounds, total_rounds - difficulty)))
+
+
+def color_index(alphabet: ChallengeAlphabet, char: str, offset: int, num_colors: int) -> Optional[int]:
+    """
+    Index into the colors list of ``char`` in the grid rotated by ``offset``.
+
+    Position ``p`` of the rotated alphabet is colored ``colors[p % num_colors]``,
+    so no rotated alphabet or color map is needed.
+
+    Returns:
+        Color index, or None if ``char`` is not in the alphabet
+    """
+    position = alphabet.position(char, offset)
+    return None if position is None else position % num_colors
+
+
+def expected_direction(secret_color: Optional[str], direction_mapping: Dict[str, str],
+                       direction_map: Dict[str, str]) -> str:
+    """Direction code for a round whose secret is shown in ``secret_color`` (None: not shown)."""
+    if secret_color is None:
+        return "S"  # Skip if secret character not in grid
+    return direction_map[direction_mapping.get(secret_color, "Skip")]
+
+
+def render_grid(alphabet: ChallengeAlphabet, offset: int, colors: List[str], title: str) -> str:
+    """
+    HTML for the alphabet rotated by ``offset``, grouped by color.
+
+    Markup is class-based (styles live in static/grid.css, see GRID_STYLESHEET),
+    so each character costs a few bytes instead of a full inline style.
+    """
+    cells = _grid_cells(alphabet)
+    offset %= len(cells)
+    rotated = cells[offset:] + cells[:offset]
+    num_colors = len(colors)
+
+    parts = [f'<div class="op-grid"><h4>{html.escape(title)}</h4>'
+             '<p><strong>Find your secret character and note its color!</strong></p>']
+    for c, color in enumerate(colors):
+        # Rotated position p is colored colors[p % n]
+        group = rotated[c::num_colors]
+        if group:
+            parts.append(f'<div class="op-{color}"><b>{color.upper()}:</b> ')
+            parts.extend(group)
+            parts.append('</div>')
+    parts.append('</div>')
+    return "".join(parts)
+
+
+class OnePVerifier:
+    """
+    Multi-round 1P challenge: a grid per round, some rounds to be skipped.
+
+    A round is fully described by its rotation offset, so the verifier keeps
+    only the nonce, the offsets and the skip rounds, and computes expected
+    answers and grids from them. Between reruns only a signed token is stored
+    (utils.challenge_token); ``start_from(read_token(...))`` rebuilds the
+    verifier, and each round's grid is rendered when it is displayed.
+    """
+    def __init__(self, secret: str, public_key_hex: str, direction_mapping: Dict[str, str],
+                 colors: List[str], direction_map: Dict[str, str], domains: Dict[str, str],
+                 difficulty: int = 1):
+        self.secret = secret
+        self.public_key = public_key_hex
+        self.direction_mapping = direction_mapping
+        self.colors = colors
+        self.direction_map = direction_map
+        self.alphabet = get_alphabet(domains)
+        self.difficulty = difficulty
+        self.nonce = None
+        self.offsets: List[int] = []
+        self.skip_rounds: List[int] = []
+
+    def start_session(self, nonce: Optional[str] = None) -> Tuple[str, int]:
+        """
+        Draw a new challenge, or the one for ``nonce``; returns (nonce, total_rounds).
+
+        Offsets and skip rounds are derived from the nonce alone.
+        """
+        return self.start_from(make_seed(self.difficulty, nonce))
+
+    def start_from(self, seed: ChallengeSeed) -> Tuple[str, int]:
+        """Start the challenge for a pregenerated ``seed`` (see utils.challenge_pool)."""
+        if seed.difficulty != self.difficulty:
+            raise ValueError(f"Seed is for difficulty {seed.difficulty}, verifier for {self.difficulty}")
+        self.nonce = seed.nonce
+        self.skip_rounds = list(seed.skip_rounds)
+        self.offsets = [entropy % len(self.alphabet) for entropy in seed.entropy_layers]
+        return self.nonce, len(self.offsets)
+
+    @property
+    def total_rounds(self) -> int:
+        return len(self.offsets)
+
+    def expected_solution(self, idx: int) -> str:
+        if idx in self.skip_rounds:
+            return "S"
+        index = color_index(self.alphabet, self.secret, self.offsets[idx], len(self.colors))
+        return expected_direction(None if index is None else self.colors[index],
+                                  self.direction_mapping, self.direction_map)
+
+    @property
+    def expected_solutions(self) -> List[str]:
+        return [self.expected_solution(idx) for idx in range(self.total_rounds)]
+
+    def display_grid(self, idx: int) -> str:
+        return render_grid(self.alphabet, self.offsets[idx], self.colors, f"🎯 Round {idx + 1}")
+
+    def verify_solution(self, candidates: List[str]) -> bool:
+        allowed_skips = len(self.skip_rounds)
+        input_skips = candidates.count('S')
+
+        if input_skips > allowed_skips:
+            return False
+
+        for idx, expected in enumerate(self.expected_solutions):
+            if expected == "S":
+                if candidates[idx] != "S":
+                    return False
+            else:
+                if candidates[idx] == "S":
+                    continue
+                if candidates[idx].upper() != expected:
+                    return False
+
+        return True
+
+    def verify_attempt(self, candidates: List[str], limiter: AbuseLimiter, key: str) -> bool:
+        """
+        Check a submitted attempt and count its outcome against ``key``.
+
+        Call this once per attempt, when the last answer is submitted: a
+        failure is recorded in ``limiter`` and a success clears ``key``'s
+        failures.
+
+        Returns:
+            True if the answers are correct
+        """
+        verified = self.verify_solution(candidates)
+        if verified:
+            limiter.record_success(key)
+        else:
+            limiter.record_failure(key)
+        return verified
 
-from utils.helpers import generate_nonce, generate_entropy_layers
 
 class OneRoundVerifier:
     """
@@ -16,7 +213,7 @@ class OneRoundVerifier:
         self.direction_map = direction_map
         self.domains = domains
         self.nonce = None
-        self.color_map = {}
+        self.offset = None
 
     def generate_challenge(self) -> Tuple[str, str]:
         """
@@ -28,56 +225,21 @@ class OneRoundVerifier:
         self.nonce = generate_nonce()
         entropy = generate_entropy_layers(self.nonce, 1)[0]
 
-        # Build combined alphabet from all domains
-        alphabet = ""
-        for domain_chars in self.domains.values():
-            alphabet += domain_chars
-        alphabet = ''.join(set(alphabet))  # Remove duplicates
+        # Shared grapheme alphabet of all domains (built once per process)
+        alphabet = get_alphabet(self.domains)
+        self.offset = entropy % len(alphabet)
 
-        # Create rotated alphabet based on entropy
-        offset = entropy % len(alphabet)
-        rotated = alphabet[offset:] + alphabet[:offset]
+        # The secret's color follows from its index and the offset
+        expected = expected_direction(self.secret_color(), self.direction_mapping, self.direction_map)
 
-        # Create color mapping
-        self.color_map = {rotated[i]: self.colors[i % len(self.colors)] for i in range(len(rotated))}
-
-        # Determine expected solution
-        assigned_color = self.color_map.get(self.secret, None)
-        if assigned_color is None:
-            expected = "S"  # Skip if secret character not in grid
-        else:
-            direction = self.direction_mapping.get(assigned_color, "Skip")
-            expected = self.direction_map[direction]
-
-        # Generate the grid HTML
-        grid_html = self._generate_grid_html()
+        grid_html = render_grid(alphabet, self.offset, self.colors, "🎯 One-Round Authentication")
 
         return grid_html, expected
 
-    def _generate_grid_html(self) -> str:
-        """Generate HTML for the challenge grid."""
-        chars_by_color = defaultdict(list)
-        for ch, color in self.color_map.items():
-            chars_by_color[color].append(ch)
-
-        grid_html = """
-        <div style="border: 2px solid #333; padding: 15px; margin: 10px; background: #f8f9fa; border-radius: 8px;">
-        <h4>🎯 One-Round Authentication</h4>
-        <p><strong>Find your secret character and note its color!</strong></p>
-        """
-
-        color_hex_map = {"red": "#FF0000", "green": "#00AA00", "blue": "#0066FF", "yellow": "#FFD700"}
-
-        for color in self.colors:
-            chars = chars_by_color[color]
-            if chars:
-                grid_html += f'<div style="margin: 8px 0;"><strong style="color: {color_hex_map[color]};">{color.upper()}:</strong> '
-                for char in chars:
-                    grid_html += f'<span style="color: {color_hex_map[color]}; font-size: 18px; margin: 2px; padding: 4px; background: white; border-radius: 4px;">{char}</span> '
-                grid_html += '</div>'
-
-        grid_html += '</div>'
-        return grid_html
+    def secret_color(self) -> Optional[str]:
+        """Color of the secret in the current grid, or None if it is not shown."""
+        index = color_index(get_alphabet(self.domains), self.secret, self.offset, len(self.colors))
+        return None if index is None else self.colors[index]
 
     def verify_solution(self, user_input: str, expected: str) -> bool:
         """
@@ -109,4 +271,4 @@ def run_one_round_authentication(secret: str, direction_mapping: Dict[str, str],
         Tuple containing (grid_html, expected_direction_code)
     """
     verifier = OneRoundVerifier(secret, direction_mapping, colors, direction_map, domains)
-    return verifier.generate_challenge()
\ No newline at end of file
+    return verifier.generate_challenge()
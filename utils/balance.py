@@ -0,0 +1,132 @@
+"""
+Targeted APT balance lookups.
+
+Instead of downloading every resource on an account and scanning for the
+CoinStore, ask the node for the one number we need:
+
+1. ``0x1::coin::balance<AptosCoin>`` view function. On current frameworks this
+   already includes the paired fungible-asset balance for migrated accounts.
+2. The single ``CoinStore<AptosCoin>`` resource, for nodes without view support.
+3. ``0x1::primary_fungible_store::balance`` on the APT metadata object (0xa),
+   for accounts whose CoinStore was migrated away to a fungible store.
+"""
+
+import asyncio
+import json
+import logging
+from dataclasses import dataclass, field
+from decimal import ROUND_HALF_EVEN, Decimal
+from typing import Dict, Iterable, Optional
+
+from aptos_sdk.async_client import ApiError, ResourceNotFound, RestClient
+
+from utils.env import env_int
+
+APT_COIN_TYPE = "0x1::aptos_coin::AptosCoin"
+APT_COIN_STORE = f"0x1::coin::CoinStore<{APT_COIN_TYPE}>"
+APT_FA_METADATA = "0xa"
+OCTAS_PER_APT = 100000000
+U64_MAX = 2 ** 64 - 1
+
+# Max concurrent balance requests in a bulk lookup; keep below the pool size
+BALANCE_FANOUT_CONCURRENCY = env_int('BALANCE_FANOUT_CONCURRENCY', 32)
+
+
+def apt_to_octas(amount_apt: float) -> int:
+    """
+    Convert an APT amount to octas, rounded to the nearest octa.
+
+    Goes through Decimal, so e.g. 0.29 APT is 29000000 octas rather than
+    int(0.29 * 1e8) == 28999999.
+
+    Raises:
+        ValueError: If the amount is not a finite number in the u64 octa range
+    """
+    try:
+        octas = int((Decimal(str(amount_apt)) * OCTAS_PER_APT).to_integral_value(ROUND_HALF_EVEN))
+    except (ArithmeticError, ValueError) as e:
+        raise ValueError(f"Invalid APT amount: {amount_apt!r}") from e
+    if not 0 <= octas <= U64_MAX:
+        raise ValueError(f"APT amount out of range: {amount_apt!r}")
+    return octas
+
+
+async def _view_u64(client: RestClient, function: str, type_arguments, arguments) -> int:
+    raw = await client.view(function, type_arguments, arguments)
+    return int(json.loads(raw)[0])
+
+
+async def fetch_apt_balance_octas(client: RestClient, address) -> int:
+    """
+    Fetch the APT balance of ``address`` in octas with a single small request.
+
+    Args:
+        client: Aptos REST client
+        address: Account address (string or AccountAddress)
+
+    Returns:
+        The balance in octas (0 if the account holds no APT)
+    """
+    address = str(address)
+    try:
+        return await _view_u64(client, "0x1::coin::balance", [APT_COIN_TYPE], [address])
+    except (ApiError, ValueError, IndexError) as e:
+        logging.debug(f"coin::balance view unavailable for {address}, falling back: {e}")
+
+    try:
+        resource = await client.account_resource(address, APT_COIN_STORE)
+        return int(resource['data']['coin']['value'])
+    except ResourceNotFound:
+        pass
+
+    try:
+        return await _view_u64(
+            client,
+            "0x1::primary_fungible_store::balance",
+            ["0x1::fungible_asset::Metadata"],
+            [address, APT_FA_METADATA],
+        )
+    except ApiError as e:
+        if e.status_code == 404:
+            return 0
+        raise
+
+
+async def fetch_apt_balance(client: RestClient, address) -> float:
+    """Fetch the APT balance of ``address`` in APT."""
+    return await fetch_apt_balance_octas(client, address) / OCTAS_PER_APT
+
+
+@dataclass
+class BulkBalanceResult:
+    """Outcome of a bulk lookup: balances (APT) and errors, both keyed by address."""
+    balances: Dict[str, float] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+
+
+async def fetch_apt_balances(client: RestClient, addresses: Iterable, concurrency: Optional[int] = None,
+                             timeout: Optional[float] = None) -> BulkBalanceResult:
+    """
+    Fetch APT balances for many addresses concurrently.
+
+    Args:
+        client: Aptos REST client (its connection pool is shared by all requests)
+        addresses: Addresses to look up; duplicates are fetched once
+        concurrency: Max requests in flight (default BALANCE_FANOUT_CONCURRENCY)
+        timeout: Optional per-address limit in seconds
+
+    Returns:
+        BulkBalanceResult with partial results; failed addresses appear in ``errors``
+    """
+    semaphore = asyncio.Semaphore(concurrency or BALANCE_FANOUT_CONCURRENCY)
+    result = BulkBalanceResult()
+
+    async def fetch_one(address: str) -> None:
+        async with semaphore:
+            try:
+                result.balances[address] = await asyncio.wait_for(fetch_apt_balance(client, address), timeout)
+            except Exception as e:
+                result.errors[address] = str(e) or type(e).__name__
+
+    await asyncio.gather(*(fetch_one(address) for address in dict.fromkeys(str(a) for a in addresses)))
+    return result
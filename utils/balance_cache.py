@@ -0,0 +1,162 @@
+"""
+Process-wide APT balance cache shared by every Streamlit session.
+
+Balances are cached per address with a TTL. Once an entry is older than the
+TTL but still inside the stale window it is returned immediately while a
+refresh runs in the background (stale-while-revalidate). Concurrent lookups
+for the same address share one in-flight node call, and transfers submitted
+by this app invalidate both sides of the transfer. Entries are kept in LRU
+order and the least recently used are evicted beyond ``max_entries``, so a
+long-lived server does not keep every address it ever looked up.
+
+Configuration:
+
+    BALANCE_CACHE_TTL          seconds an entry is fresh (default 5)
+    BALANCE_CACHE_STALE_TTL    extra seconds a stale entry may be served (default 30)
+    BALANCE_CACHE_MAX_ENTRIES  addresses cached at most (default 10000)
+"""
+
+import concurrent.futures
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional
+
+from aptos_sdk.account_address import AccountAddress
+
+from utils.env import env_float, env_int
+from utils.nest_runner import submit
+
+
+def normalize_address(address) -> str:
+    """Canonical cache key for an address string or AccountAddress."""
+    try:
+        return str(AccountAddress.from_str_relaxed(str(address)))
+    except Exception:
+        return str(address).lower()
+
+
+@dataclass
+class _Entry:
+    value: float
+    fetched_at: float
+
+
+class BalanceCache:
+    """Bounded LRU TTL cache with stale-while-revalidate and in-flight coalescing."""
+
+    def __init__(self, ttl: Optional[float] = None, stale_ttl: Optional[float] = None,
+                 max_entries: Optional[int] = None, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl if ttl is not None else env_float('BALANCE_CACHE_TTL', 5)
+        self.stale_ttl = stale_ttl if stale_ttl is not None else env_float('BALANCE_CACHE_STALE_TTL', 30)
+        self.max_entries = max_entries if max_entries is not None else env_int('BALANCE_CACHE_MAX_ENTRIES', 10000)
+        self._clock = clock
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        # Invalidation drops the in-flight future, so a fetch that started
+        # before a transfer cannot write its (now outdated) result back.
+        self._inflight: Dict[str, concurrent.futures.Future] = {}
+        self._lock = threading.RLock()
+
+    def get(self, address, loader: Callable[[], Awaitable[float]],
+            fresh: bool = False, timeout: Optional[float] = None) -> float:
+        """
+        Return the balance for ``address``, calling ``loader`` only when needed.
+
+        Args:
+            address: Account address (string or AccountAddress)
+            loader: Zero-argument callable returning a coroutine that fetches the balance
+            fresh: Ignore any cached value and wait for a node response
+            timeout: Optional limit in seconds when waiting for the node
+
+        Returns:
+            The balance in APT
+        """
+        key = normalize_address(address)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not fresh:
+                self._entries.move_to_end(key)
+                age = self._clock() - entry.fetched_at
+                if age < self.ttl:
+                    return entry.value
+                if age < self.ttl + self.stale_ttl:
+                    self._refresh_locked(key, loader)
+                    return entry.value
+            future = self._refresh_locked(key, loader)
+        return future.result(timeout)
+
+    def prefetch(self, address, loader: Callable[[], Awaitable[float]]) -> Optional[concurrent.futures.Future]:
+        """Start a background fetch unless a fresh value is cached.
+
+        Lets a page overlap the balance lookup with other node calls; a later
+        ``get`` joins the in-flight request.
+        """
+        key = normalize_address(address)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._clock() - entry.fetched_at < self.ttl:
+                return None
+            return self._refresh_locked(key, loader)
+
+    def peek(self, address) -> Optional[float]:
+        """Return the cached balance without triggering a fetch."""
+        entry = self._entries.get(normalize_address(address))
+        return entry.value if entry else None
+
+    def put(self, address, value: float) -> None:
+        """Store a balance fetched elsewhere."""
+        key = normalize_address(address)
+        with self._lock:
+            self._store_locked(key, value)
+
+    def invalidate(self, *addresses) -> None:
+        """Drop cached balances, e.g. after a transfer touching these addresses."""
+        with self._lock:
+            for address in addresses:
+                if address is None:
+                    continue
+                key = normalize_address(address)
+                self._entries.pop(key, None)
+                self._inflight.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._inflight.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _refresh_locked(self, key: str, loader: Callable[[], Awaitable[float]]) -> concurrent.futures.Future:
+        future = self._inflight.get(key)
+        if future is not None:
+            return future
+        future = submit(loader())
+        self._inflight[key] = future
+        future.add_done_callback(lambda f: self._on_done(key, f))
+        return future
+
+    def _store_locked(self, key: str, value: float) -> None:
+        self._entries[key] = _Entry(value, self._clock())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _on_done(self, key: str, future: concurrent.futures.Future) -> None:
+        with self._lock:
+            if self._inflight.get(key) is not future:
+                return  # invalidated while in flight: the result may predate a transfer
+            del self._inflight[key]
+            if future.cancelled():
+                return
+            error = future.exception()
+            if error is not None:
+                logging.warning(f"Balance refresh failed for {key}: {error}")
+                return
+            self._store_locked(key, future.result())
+
+
+# Shared instance used by App and the transfer helpers
+balance_cache = BalanceCache()
@@ -0,0 +1,105 @@
+"""
+The character alphabet shown in 1P challenge grids.
+
+Challenge grids draw from the union of all character DOMAINS. Many emoji in
+them span several code points: ``❤️`` is U+2764 U+FE0F, and ``🏌️‍♂️`` joins
+five code points with a zero-width joiner. Splitting such strings per code
+point yields stray variation selectors and ZWJ fragments as "characters".
+ChallengeAlphabet splits into user-perceived characters (grapheme clusters)
+instead. It keeps them in first-seen order, so the alphabet, and therefore
+every challenge derived from a nonce, is identical in every process. The
+alphabet is immutable and built once per process per domain set
+(``get_alphabet``).
+"""
+
+import unicodedata
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Iterator, List, Mapping, Optional, Tuple
+
+_ZWJ = '\u200d'
+_MARK_CATEGORIES = frozenset(('Mn', 'Mc', 'Me'))
+
+
+def _is_regional_indicator(char: str) -> bool:
+    return '\U0001F1E6' <= char <= '\U0001F1FF'
+
+
+def _extends(char: str) -> bool:
+    """Code points that attach to the preceding character."""
+    return ('\ufe00' <= char <= '\ufe0f'                  # variation selectors
+            or '\U0001F3FB' <= char <= '\U0001F3FF'       # skin tone modifiers
+            or '\U000E0020' <= char <= '\U000E007F'       # tag sequences (subdivision flags)
+            or unicodedata.category(char) in _MARK_CATEGORIES)  # combining marks, keycap U+20E3
+
+
+def split_graphemes(text: str) -> List[str]:
+    """
+    Split ``text`` into grapheme clusters.
+
+    Covers what the challenge domains contain: combining marks, variation
+    selectors, keycaps, skin tones, ZWJ sequences, flags and tag sequences.
+    It is not a full UAX #29 implementation (e.g. Hangul syllable composition
+    from conjoining jamo is not handled).
+    """
+    clusters = []
+    i, n = 0, len(text)
+    while i < n:
+        j = i + 1
+        if _is_regional_indicator(text[i]) and j < n and _is_regional_indicator(text[j]):
+            j += 1  # flag: a pair of regional indicators
+        while j < n:
+            if text[j] == _ZWJ:
+                j = min(j + 2, n)  # the joiner glues the next character on
+            elif _extends(text[j]):
+                j += 1
+            else:
+                break
+        clusters.append(text[i:j])
+        i = j
+    return clusters
+
+
+def format_codepoints(char: str) -> str:
+    """``U+XXXX`` notation for every code point of a (possibly multi-code-point) character."""
+    return " ".join(f"U+{ord(c):04X}" for c in char)
+
+
+class ChallengeAlphabet:
+    """Immutable, deterministically ordered grapheme alphabet with a char -> index map."""
+
+    __slots__ = ('chars', 'index')
+
+    def __init__(self, domains: Mapping[str, str]):
+        self.chars: Tuple[str, ...] = tuple(dict.fromkeys(
+            cluster for text in domains.values() for cluster in split_graphemes(text)))
+        self.index: Mapping[str, int] = MappingProxyType({char: i for i, char in enumerate(self.chars)})
+
+    def __len__(self) -> int:
+        return len(self.chars)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.chars)
+
+    def __contains__(self, char: str) -> bool:
+        return char in self.index
+
+    def rotated(self, offset: int) -> Tuple[str, ...]:
+        """The alphabet rotated left by ``offset`` (taken modulo its length)."""
+        offset %= len(self.chars)
+        return self.chars[offset:] + self.chars[:offset]
+
+    def position(self, char: str, offset: int) -> Optional[int]:
+        """Index of ``char`` in ``rotated(offset)``, without building it; None if absent."""
+        i = self.index.get(char)
+        return None if i is None else (i - offset) % len(self.chars)
+
+
+@lru_cache(maxsize=8)
+def _build(items: Tuple[Tuple[str, str], ...]) -> ChallengeAlphabet:
+    return ChallengeAlphabet(dict(items))
+
+
+def get_alphabet(domains: Mapping[str, str]) -> ChallengeAlphabet:
+    """The shared ChallengeAlphabet for ``domains``, built on first use per process."""
+    return _build(tuple(domains.items()))
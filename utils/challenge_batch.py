@@ -0,0 +1,114 @@
+"""
+Vectorized generation and checking of 1P challenges in bulk.
+
+For load tests, offline analysis and pregeneration. Given arrays of nonces,
+secret indices and direction mappings, ``generate_challenges`` returns every
+challenge's round offsets, skip mask and expected answers as NumPy arrays.
+The results are bit-for-bit what OnePVerifier computes one challenge at a
+time. Only the per-nonce hashing runs in Python. Offsets, skip selection and
+answer resolution are array arithmetic over the whole batch.
+
+Direction codes are small integers indexing DIRECTION_CODES ("UDLRS"), so
+a batch of answers is a compact uint8 matrix.
+
+NumPy is an optional dependency (``pip install 1p-wallet[batch]``); the
+interactive app does not need this module.
+"""
+
+import hashlib
+from typing import Dict, List, NamedTuple, Sequence
+
+try:
+    import numpy as np
+except ImportError as e:  # optional dependency
+    raise ImportError("utils.challenge_batch needs NumPy: pip install 1p-wallet[batch]") from e
+
+from utils.auth_utils import SKIP_DOMAIN
+from utils.entropy import entropy_bytes
+
+DIRECTION_CODES = "UDLRS"
+SKIP = DIRECTION_CODES.index("S")
+
+
+class ChallengeBatch(NamedTuple):
+    offsets: np.ndarray    # (n, rounds) int64 rotation offset per round
+    skip_mask: np.ndarray  # (n, rounds) bool, True for rounds that must be skipped
+    expected: np.ndarray   # (n, rounds) uint8 index into DIRECTION_CODES
+
+
+def total_rounds(difficulty: int) -> int:
+    return difficulty + difficulty // 2
+
+
+def encode_mapping(direction_mapping: Dict[str, str], colors: Sequence[str],
+                   direction_map: Dict[str, str]) -> List[int]:
+    """A user's {color: direction name} mapping as direction codes in ``colors`` order."""
+    return [DIRECTION_CODES.index(direction_map[direction_mapping.get(color, "Skip")]) for color in colors]
+
+
+def entropy_matrix(nonces: Sequence[str], rounds: int) -> np.ndarray:
+    """``generate_entropy_layers(nonce, rounds)`` for every nonce, as an (n, rounds) uint32 array."""
+    # One XOF call per nonce (utils.entropy), decoded for the whole batch at once
+    out = b"".join(entropy_bytes(nonce, rounds) for nonce in nonces)
+    return np.frombuffer(out, dtype='>u4').reshape(len(nonces), rounds).astype(np.uint32)
+
+
+def skip_matrix(nonces: Sequence[str], rounds: int, skips: int) -> np.ndarray:
+    """``skip_rounds_for`` for every nonce, as an (n, rounds) boolean mask."""
+    keys = b"".join(hashlib.shake_256(SKIP_DOMAIN + nonce.encode()).digest(2 * rounds) for nonce in nonces)
+    keys = np.frombuffer(keys, dtype='>u2').reshape(len(nonces), rounds)
+    # Stable sort breaks ties by round index, like the scalar version
+    chosen = np.argsort(keys, axis=1, kind='stable')[:, :skips]
+    mask = np.zeros((len(nonces), rounds), dtype=bool)
+    np.put_along_axis(mask, chosen, True, axis=1)
+    return mask
+
+
+def generate_challenges(nonces: Sequence[str], secret_indices, direction_mappings,
+                        alphabet_size: int, difficulty: int = 1) -> ChallengeBatch:
+    """
+    Challenges and their expected answers for a batch of users.
+
+    Args:
+        nonces: One nonce per challenge
+        secret_indices: (n,) alphabet index of each user's secret; -1 if not in the alphabet
+        direction_mappings: (n, num_colors) direction code per color (see encode_mapping)
+        alphabet_size: Length of the ChallengeAlphabet
+        difficulty: Non-skip rounds per challenge; all challenges share it
+
+    Returns:
+        ChallengeBatch of (n, rounds) arrays
+    """
+    rounds = total_rounds(difficulty)
+    secret_indices = np.asarray(secret_indices, dtype=np.int64)
+    direction_mappings = np.asarray(direction_mappings, dtype=np.uint8)
+    num_colors = direction_mappings.shape[1]
+
+    offsets = entropy_matrix(nonces, rounds).astype(np.int64) % alphabet_size
+    skip_mask = skip_matrix(nonces, rounds, rounds - difficulty)
+
+    # Secret at rotated position (index - offset) % size, colored position % num_colors
+    colors = (secret_indices[:, None] - offsets) % alphabet_size % num_colors
+    expected = np.take_along_axis(direction_mappings, colors, axis=1)
+    expected[skip_mask | (secret_indices[:, None] < 0)] = SKIP
+    return ChallengeBatch(offsets, skip_mask, expected.astype(np.uint8))
+
+
+def check_answers(batch: ChallengeBatch, answers) -> np.ndarray:
+    """
+    ``OnePVerifier.verify_solution`` for a batch: (n,) bool.
+
+    A round expecting S must be answered S. Any other round may be answered
+    correctly or skipped, as long as no more rounds are skipped than the
+    challenge has skip rounds.
+
+    Args:
+        batch: Challenges from generate_challenges
+        answers: (n, rounds) direction codes
+    """
+    answers = np.asarray(answers, dtype=np.uint8)
+    answered_skip = answers == SKIP
+    expected_skip = batch.expected == SKIP
+    within_skips = answered_skip.sum(axis=1) <= batch.skip_mask.sum(axis=1)
+    rounds_ok = np.where(expected_skip, answered_skip, answered_skip | (answers == batch.expected))
+    return within_skips & rounds_ok.all(axis=1)
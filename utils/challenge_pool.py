@@ -0,0 +1,108 @@
+"""
+Pregenerated 1P challenge seeds.
+
+Starting authentication used to draw a nonce and run the entropy chain and
+skip-round selection inside the click handler. This module keeps a
+per-process pool of ready seeds (nonce, entropy layers and skip rounds) for
+each difficulty, so starting a session is a ``take``. A daemon thread tops a
+difficulty's pool up to its size whenever it drops to the low-water mark.
+Seeds are independent of the user: the verifier applies its own alphabet and
+mapping (``OnePVerifier.start_from``).
+
+Each seed is popped from a deque exactly once, so no seed is handed out
+twice. When a pool is empty, ``take`` generates a fresh seed inline rather
+than wait. A difficulty nobody configured gets its pool on first use.
+
+Configuration:
+
+    CHALLENGE_POOL_SIZE          seeds kept per difficulty (default 64)
+    CHALLENGE_POOL_LOW_WATER     refill when a pool drops to this many (default 16)
+    CHALLENGE_POOL_DIFFICULTIES  difficulties pregenerated from the start (default "1,2,3")
+"""
+
+import logging
+import threading
+from collections import deque
+from typing import Deque, Dict, Iterable, Optional
+
+from utils.auth_utils import ChallengeSeed, make_seed
+from utils.env import env_int, env_ints
+
+CHALLENGE_POOL_SIZE = env_int('CHALLENGE_POOL_SIZE', 64)
+CHALLENGE_POOL_LOW_WATER = env_int('CHALLENGE_POOL_LOW_WATER', 16)
+CHALLENGE_POOL_DIFFICULTIES = env_ints('CHALLENGE_POOL_DIFFICULTIES', (1, 2, 3))
+
+
+class ChallengePool:
+    """Per-difficulty pools of challenge seeds, refilled by a background thread."""
+
+    def __init__(self, size: Optional[int] = None, low_water: Optional[int] = None,
+                 difficulties: Optional[Iterable[int]] = None):
+        self.size = size if size is not None else CHALLENGE_POOL_SIZE
+        self.low_water = low_water if low_water is not None else CHALLENGE_POOL_LOW_WATER
+        if not 0 <= self.low_water < self.size:
+            raise ValueError(f"Need 0 <= low_water < size, got low_water={self.low_water}, size={self.size}")
+        difficulties = difficulties if difficulties is not None else CHALLENGE_POOL_DIFFICULTIES
+        self._seeds: Dict[int, Deque[ChallengeSeed]] = {d: deque() for d in difficulties}
+        self._wanted = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def take(self, difficulty: int) -> ChallengeSeed:
+        """
+        A seed for a challenge of ``difficulty``, never handed out before.
+
+        Returns at once: from the pool if it has one, otherwise freshly
+        generated. Starts the refill thread on first use.
+        """
+        self.start()
+        seeds = self._seeds.get(difficulty)
+        if seeds is None:
+            make_seed(difficulty)  # reject invalid difficulties before creating a pool
+            with self._lock:
+                seeds = self._seeds.setdefault(difficulty, deque())
+        try:
+            seed = seeds.popleft()  # atomic: concurrent takers never get the same seed
+        except IndexError:
+            seed = None
+        if len(seeds) <= self.low_water:
+            self._wanted.set()
+        return seed if seed is not None else make_seed(difficulty)
+
+    def available(self, difficulty: int) -> int:
+        seeds = self._seeds.get(difficulty)
+        return len(seeds) if seeds is not None else 0
+
+    def fill(self) -> int:
+        """Top every difficulty up to ``size``; returns the number of seeds generated."""
+        with self._lock:
+            pools = list(self._seeds.items())
+        generated = 0
+        for difficulty, seeds in pools:
+            while len(seeds) < self.size:
+                seeds.append(make_seed(difficulty))
+                generated += 1
+        return generated
+
+    def start(self) -> None:
+        """Start the refill thread (idempotent); the first pass fills every pool."""
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(name="challenge-pool", target=self._run, daemon=True)
+                self._wanted.set()
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wanted.wait()
+            self._wanted.clear()
+            try:
+                self.fill()
+            except Exception:
+                logging.exception("Challenge pool refill failed")
+
+
+# Shared instance used by the authentication page
+challenge_pool = ChallengePool()
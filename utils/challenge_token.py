@@ -0,0 +1,141 @@
+"""
+Stateless, server-signed 1P challenge tokens.
+
+A token carries everything needed to check a user's answers except their
+secret and mapping: the nonce, the difficulty, the skip rounds and an expiry.
+The page stores only the token between reruns and rebuilds the challenge from
+it and the user's registration, and a tampered or stale token is rejected.
+The token and the rest of the session still live in the server process's
+``st.session_state``, so several replicas need sticky sessions.
+
+Layout before base64url encoding (big-endian):
+
+    version:u8  difficulty:u8  expires_at:u32  nonce_len:u8  nonce  skip_mask  tag:16
+
+``skip_mask`` has one bit per round (bit i of byte i // 8 set if round i is
+skipped). ``tag`` is HMAC-SHA256 truncated to 128 bits over the wallet
+address followed by everything before it. Binding the address means a token
+issued to one wallet is useless for another. Tokens are not single-use:
+keep the TTL short.
+
+Configuration:
+
+    CHALLENGE_TOKEN_KEY  HMAC key (hex, or any string). If unset, a random
+                         per-process key is used, and tokens only verify in
+                         the process that issued them.
+    CHALLENGE_TOKEN_TTL  seconds a token stays valid (default 600)
+"""
+
+import base64
+import hashlib
+import hmac
+import logging
+import os
+import secrets
+import struct
+import time
+from typing import Optional
+
+from utils.auth_utils import ChallengeSeed
+from utils.entropy import generate_entropy_layers
+from utils.env import env_int
+from utils.transfer_payload import address_bytes
+
+TOKEN_VERSION = 1
+TAG_SIZE = 16
+CHALLENGE_TOKEN_TTL = env_int('CHALLENGE_TOKEN_TTL', 600)
+
+_HEADER = struct.Struct(">BBIB")
+
+
+class ChallengeTokenError(ValueError):
+    """The token is malformed, forged, issued for another wallet or expired."""
+
+
+def _load_key() -> bytes:
+    key = os.getenv('CHALLENGE_TOKEN_KEY')
+    if not key:
+        logging.warning("CHALLENGE_TOKEN_KEY not set; challenge tokens only verify in this process")
+        return secrets.token_bytes(32)
+    try:
+        return bytes.fromhex(key)
+    except ValueError:
+        return key.encode()
+
+
+CHALLENGE_TOKEN_KEY = _load_key()
+
+
+def _rounds(difficulty: int) -> int:
+    return difficulty + difficulty // 2
+
+
+def _tag(key: bytes, address: str, body: bytes) -> bytes:
+    return hmac.new(key, address_bytes(address) + body, hashlib.sha256).digest()[:TAG_SIZE]
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(token: str) -> bytes:
+    return base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+
+
+def issue_token(seed: ChallengeSeed, address: str, ttl: Optional[int] = None,
+                key: Optional[bytes] = None, now: Optional[float] = None) -> str:
+    """
+    Sign ``seed`` for the wallet at ``address``.
+
+    Args:
+        seed: The challenge, e.g. from utils.challenge_pool
+        address: Wallet address the challenge is for
+        ttl: Seconds until expiry (default CHALLENGE_TOKEN_TTL)
+        key: HMAC key (default CHALLENGE_TOKEN_KEY)
+        now: Current unix time (default time.time())
+
+    Returns:
+        URL-safe token string
+    """
+    if not 1 <= seed.difficulty <= 255:
+        raise ValueError(f"difficulty {seed.difficulty} does not fit in a token")
+    nonce = bytes.fromhex(seed.nonce)
+    expires_at = int(now if now is not None else time.time()) + (ttl if ttl is not None else CHALLENGE_TOKEN_TTL)
+    mask = bytearray((_rounds(seed.difficulty) + 7) // 8)
+    for idx in seed.skip_rounds:
+        mask[idx // 8] |= 1 << (idx % 8)
+    body = _HEADER.pack(TOKEN_VERSION, seed.difficulty, expires_at, len(nonce)) + nonce + bytes(mask)
+    return _b64encode(body + _tag(key or CHALLENGE_TOKEN_KEY, address, body))
+
+
+def read_token(token: str, address: str, key: Optional[bytes] = None,
+               now: Optional[float] = None) -> ChallengeSeed:
+    """
+    Verify a token issued to ``address`` and rebuild its challenge seed.
+
+    Entropy layers are recomputed from the nonce; skip rounds come from the
+    token.
+
+    Raises:
+        ChallengeTokenError: If the token is malformed, forged, for another
+            address or expired
+    """
+    try:
+        data = _b64decode(token)
+    except ValueError as e:
+        raise ChallengeTokenError("Malformed challenge token") from e
+    body, tag = data[:-TAG_SIZE], data[-TAG_SIZE:]
+    if len(body) < _HEADER.size or not hmac.compare_digest(tag, _tag(key or CHALLENGE_TOKEN_KEY, address, body)):
+        raise ChallengeTokenError("Invalid challenge token")
+
+    version, difficulty, expires_at, nonce_len = _HEADER.unpack_from(body)
+    rounds = _rounds(difficulty)
+    mask = body[_HEADER.size + nonce_len:]
+    if version != TOKEN_VERSION or difficulty < 1 or len(mask) != (rounds + 7) // 8:
+        raise ChallengeTokenError("Unsupported challenge token")
+    if (now if now is not None else time.time()) >= expires_at:
+        raise ChallengeTokenError("Challenge expired")
+
+    nonce = body[_HEADER.size:_HEADER.size + nonce_len].hex()
+    skip_rounds = tuple(idx for idx in range(rounds) if mask[idx // 8] >> (idx % 8) & 1)
+    return ChallengeSeed(nonce, difficulty, tuple(generate_entropy_layers(nonce, rounds)), skip_rounds)
@@ -0,0 +1,196 @@
+"""
+Process-wide registry of pooled Aptos REST clients.
+
+Every page, transfer helper and Streamlit session used to construct its own
+``RestClient`` (and therefore its own httpx connection pool). This module keeps
+one client per node URL for the whole process so all sessions share a bounded
+set of warm keep-alive connections.
+
+Pool limits are read from the environment:
+
+    APTOS_NODE_URL                default node (testnet)
+    APTOS_NODE_URLS               comma-separated fullnodes; when several are
+                                  given the default client routes across them
+                                  (see utils.node_router)
+    APTOS_POOL_MAX_CONNECTIONS    max open connections per node (default 100)
+    APTOS_POOL_MAX_KEEPALIVE      max idle keep-alive connections per node (default 20)
+    APTOS_POOL_KEEPALIVE_EXPIRY   seconds an idle connection is kept (default 30)
+    APTOS_HTTP_TIMEOUT            request timeout in seconds (default 30)
+"""
+
+import asyncio
+import atexit
+import logging
+import os
+import threading
+import weakref
+from typing import Dict, Optional
+
+import httpx
+from aptos_sdk.async_client import ClientConfig, RestClient
+from aptos_sdk.metadata import Metadata
+
+# Imported for its atexit hook: registering the runtime shutdown first means it
+# runs after ``shutdown`` below, so pools are closed while their loop is alive.
+from utils import nest_runner  # noqa: F401
+from utils.env import env_float, env_int
+
+NODE_URLS = [url.strip().rstrip('/') for url in os.getenv('APTOS_NODE_URLS', '').split(',') if url.strip()]
+DEFAULT_NODE_URL = os.getenv('APTOS_NODE_URL') or (NODE_URLS[0] if NODE_URLS else "https://testnet.aptoslabs.com/v1")
+
+
+def default_limits() -> httpx.Limits:
+    """Connection pool limits shared by every pooled client."""
+    return httpx.Limits(
+        max_connections=env_int('APTOS_POOL_MAX_CONNECTIONS', 100),
+        max_keepalive_connections=env_int('APTOS_POOL_MAX_KEEPALIVE', 20),
+        keepalive_expiry=env_float('APTOS_POOL_KEEPALIVE_EXPIRY', 30.0),
+    )
+
+
+def default_timeout() -> httpx.Timeout:
+    """Request timeout shared by every pooled client."""
+    return httpx.Timeout(env_float('APTOS_HTTP_TIMEOUT', 30.0))
+
+
+class PooledRestClient(RestClient):
+    """A ``RestClient`` whose httpx pool is shared and configurable.
+
+    httpx connections are bound to the event loop that opened them, so the
+    underlying ``httpx.AsyncClient`` is created lazily per running loop. With a
+    single process-wide loop this is exactly one pool per node URL.
+    """
+
+    def __init__(self, base_url: str,
+                 limits: Optional[httpx.Limits] = None,
+                 timeout: Optional[httpx.Timeout] = None,
+                 client_config: ClientConfig = ClientConfig()):
+        # RestClient.__init__ eagerly builds its own AsyncClient, so the
+        # attributes it sets are initialised here instead.
+        self.base_url = base_url.rstrip('/')
+        self.client_config = client_config
+        self._chain_id = None
+        self._limits = limits or default_limits()
+        self._timeout = timeout or default_timeout()
+        self._headers = {Metadata.APTOS_HEADER: Metadata.get_aptos_header_val()}
+        if client_config.api_key:
+            self._headers["Authorization"] = f"Bearer {client_config.api_key}"
+        self._http_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The httpx client bound to the currently running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            http_client = self._http_clients.get(loop)
+            if http_client is None or http_client.is_closed:
+                http_client = self._make_http_client()
+                self._http_clients[loop] = http_client
+        return http_client
+
+    def _make_http_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            http2=self.client_config.http2,
+            limits=self._limits,
+            timeout=self._timeout,
+            headers=self._headers,
+        )
+
+    async def close(self) -> None:
+        """Close the pool bound to the running loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            http_client = self._http_clients.pop(loop, None)
+        if http_client is not None:
+            await http_client.aclose()
+
+    def close_sync(self) -> None:
+        """Close every pool whose loop can still be driven from this thread."""
+        with self._lock:
+            items = list(self._http_clients.items())
+            self._http_clients.clear()
+        for loop, http_client in items:
+            if http_client.is_closed or loop.is_closed():
+                continue
+            try:
+                if loop.is_running():
+                    future = asyncio.run_coroutine_threadsafe(http_client.aclose(), loop)
+                    future.result(timeout=5)
+                else:
+                    loop.run_until_complete(http_client.aclose())
+            except Exception as e:
+                logging.debug(f"Error closing pooled client for {self.base_url}: {e}")
+
+
+_clients: Dict[str, PooledRestClient] = {}
+_clients_lock = threading.Lock()
+
+# Generic pooled clients (faucet and other non-node HTTP), one per event loop
+_http_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_client(node_url: str = DEFAULT_NODE_URL) -> PooledRestClient:
+    """Return the shared client for ``node_url``, creating it on first use.
+
+    Args:
+        node_url: The Aptos node URL
+
+    Returns:
+        The process-wide PooledRestClient for that node; for the default node
+        when APTOS_NODE_URLS lists several fullnodes, a RoutedRestClient
+    """
+    key = node_url.rstrip('/')
+    client = _clients.get(key)
+    if client is not None:
+        return client
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            if key == DEFAULT_NODE_URL.rstrip('/') and len(NODE_URLS) > 1:
+                from utils.node_router import RoutedRestClient, get_router
+                client = RoutedRestClient(key, get_router())
+            else:
+                client = PooledRestClient(key)
+            _clients[key] = client
+            logging.info(f"Created pooled Aptos client for {key}")
+        return client
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared keep-alive httpx client for non-node requests.
+
+    Must be called from a coroutine; the client is bound to the running loop.
+    """
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        http_client = _http_clients.get(loop)
+        if http_client is None or http_client.is_closed:
+            http_client = httpx.AsyncClient(limits=default_limits(), timeout=default_timeout())
+            _http_clients[loop] = http_client
+        return http_client
+
+
+def shutdown() -> None:
+    """Close all pooled connections. Registered to run at interpreter exit."""
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+        http_clients = list(_http_clients.items())
+        _http_clients.clear()
+    for client in clients:
+        client.close_sync()
+    for loop, http_client in http_clients:
+        if http_client.is_closed or loop.is_closed() or not loop.is_running():
+            continue
+        try:
+            asyncio.run_coroutine_threadsafe(http_client.aclose(), loop).result(timeout=5)
+        except Exception as e:
+            logging.debug(f"Error closing shared HTTP client: {e}")
+
+
+atexit.register(shutdown)
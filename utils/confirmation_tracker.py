@@ -0,0 +1,179 @@
+"""
+Background confirmation tracking for submitted transactions.
+
+Instead of each send blocking in ``wait_for_transaction``, submitted hashes are
+handed to one process-wide ConfirmationTracker. A single polling task on the
+shared runtime loop (utils.nest_runner) checks every pending hash per round,
+polling quickly while transactions are landing and backing off while nothing
+changes. Every ``track`` call gets its own future, resolved with "completed"
+or "failed" once the hash commits, so one caller cancelling its future does
+not affect the others. A hash nobody is waiting for any more is dropped. A hash still not committed after ``max_age`` resolves with
+"unknown": it may yet commit, so it is not reported as a failure.
+
+Configuration (seconds):
+
+    CONFIRMATION_POLL_MIN   interval after a new hash or a confirmation (default 0.5)
+    CONFIRMATION_POLL_MAX   interval ceiling while nothing changes (default 8)
+    CONFIRMATION_MAX_AGE    stop polling and report "unknown" after this long (default 600)
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from aptos_sdk.async_client import ApiError, RestClient
+
+from utils.balance_cache import balance_cache
+from utils.env import env_float
+from utils.nest_runner import get_loop
+
+BACKOFF_FACTOR = 1.6
+
+
+@dataclass
+class _Pending:
+    client: RestClient
+    futures: List[concurrent.futures.Future]
+    added_at: float
+
+
+async def fetch_transaction_status(client: RestClient, txn_hash: str) -> Optional[str]:
+    """Return "completed" or "failed" once ``txn_hash`` is committed, else None."""
+    response = await client._get(endpoint=f"transactions/by_hash/{txn_hash}")
+    if response.status_code == 404:
+        return None
+    if response.status_code >= 400:
+        raise ApiError(response.text, response.status_code)
+    data = response.json()
+    if data.get("type") == "pending_transaction":
+        return None
+    return "completed" if data.get("success") else "failed"
+
+
+class ConfirmationTracker:
+    """Polls all pending transaction hashes from one task with adaptive backoff."""
+
+    def __init__(self, min_interval: Optional[float] = None, max_interval: Optional[float] = None,
+                 max_age: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        self.min_interval = min_interval if min_interval is not None else env_float('CONFIRMATION_POLL_MIN', 0.5)
+        self.max_interval = max_interval if max_interval is not None else env_float('CONFIRMATION_POLL_MAX', 8)
+        self.max_age = max_age if max_age is not None else env_float('CONFIRMATION_MAX_AGE', 600)
+        self._clock = clock
+        self._pending: Dict[str, _Pending] = {}
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+
+    def track(self, client: RestClient, txn_hash: str) -> concurrent.futures.Future:
+        """
+        Start tracking ``txn_hash``; safe to call from any thread.
+
+        Returns:
+            Future resolving to "completed", "failed" or "unknown" (not committed within max_age)
+        """
+        future = concurrent.futures.Future()
+        with self._lock:
+            pending = self._pending.get(txn_hash)
+            if pending is None:
+                self._pending[txn_hash] = _Pending(client, [future], self._clock())
+            else:
+                pending.futures.append(future)
+        get_loop().call_soon_threadsafe(self._ensure_running)
+        return future
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def _ensure_running(self) -> None:
+        if self._task is None or self._task.done():
+            self._wake = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        else:
+            self._wake.set()
+
+    async def _run(self) -> None:
+        interval = self.min_interval
+        while True:
+            with self._lock:
+                for txn_hash in [h for h, p in self._pending.items() if all(f.done() for f in p.futures)]:
+                    del self._pending[txn_hash]  # every waiter has cancelled
+                batch = list(self._pending.items())
+            if not batch:
+                return
+
+            statuses = await asyncio.gather(
+                *(fetch_transaction_status(p.client, txn_hash) for txn_hash, p in batch),
+                return_exceptions=True,
+            )
+            resolved = False
+            for (txn_hash, pending), status in zip(batch, statuses):
+                try:
+                    resolved |= self._resolve(txn_hash, pending, status)
+                except Exception as e:
+                    # Keep polling the other hashes
+                    logging.error(f"Confirmation tracking failed for {txn_hash}: {e}")
+
+            interval = self.min_interval if resolved else min(interval * BACKOFF_FACTOR, self.max_interval)
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), interval)
+                # A new hash arrived; check it soon
+                interval = self.min_interval
+            except asyncio.TimeoutError:
+                pass
+
+    def _resolve(self, txn_hash: str, pending: _Pending, status) -> bool:
+        """Settle ``txn_hash``'s futures if ``status`` is final; returns whether it was."""
+        if isinstance(status, Exception):
+            logging.debug(f"Status check failed for {txn_hash}: {status}")
+            status = None
+        if status is None and self._clock() - pending.added_at > self.max_age:
+            logging.warning(f"Gave up waiting for {txn_hash}; it may still commit")
+            status = "unknown"
+        if status is None:
+            return False
+        with self._lock:
+            self._pending.pop(txn_hash, None)
+            futures = list(pending.futures)
+        for future in futures:
+            if future.set_running_or_notify_cancel():  # False if that caller cancelled
+                future.set_result(status)
+        return True
+
+
+def track_transaction(client: RestClient, txn) -> concurrent.futures.Future:
+    """
+    Track a recorded Transaction and update its ``status`` in place when it lands.
+
+    Balances of both parties are invalidated again on confirmation, since the
+    balance only changes once the transaction commits.
+
+    Returns:
+        Future resolving to the final status after ``txn`` has been updated
+    """
+    updated = concurrent.futures.Future()
+
+    def _update(future: concurrent.futures.Future) -> None:
+        if future.cancelled():
+            # exception() would raise CancelledError here
+            updated.set_exception(concurrent.futures.CancelledError())
+            return
+        if future.exception() is not None:
+            updated.set_exception(future.exception())
+            return
+        txn.status = future.result()
+        balance_cache.invalidate(txn.sender, txn.recipient)
+        logging.info(f"Transaction {txn.txn_hash} {txn.status}")
+        updated.set_result(txn.status)
+
+    confirmation_tracker.track(client, txn.txn_hash).add_done_callback(_update)
+    return updated
+
+
+# Shared instance for the whole process
+confirmation_tracker = ConfirmationTracker()
@@ -0,0 +1,286 @@
+"""
+Pluggable secp256k1 backends for wallet keys.
+
+Aptos secp256k1 signatures are ECDSA over SHA3-256 of the message, encoded
+as 64 bytes ``r || s`` with a low ``s``. Every backend here produces and
+checks exactly that, so they are interchangeable:
+
+* ``coincurve``    - libsecp256k1 bindings (``pip install 1p-wallet[fast-crypto]``)
+* ``cryptography`` - OpenSSL, already required by the Aptos SDK
+* ``ecdsa``        - pure Python; verifying keys are ``precompute()``d once per key
+
+The fastest installed backend is used unless CRYPTO_BACKEND names one.
+
+Wallet code keeps working with SDK ``Account`` objects. ``use_backend``
+swaps a secp256k1 account's private key for a BackendPrivateKey, which is
+still an SDK secp256k1 PrivateKey but signs through the backend with the
+key loaded once. Transaction signing, ``Account.sign`` and serialization all
+go through it unchanged.
+
+Configuration:
+
+    CRYPTO_BACKEND   force a backend: coincurve, cryptography or ecdsa (default: fastest available)
+"""
+
+import hashlib
+import logging
+import os
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
+
+from aptos_sdk import secp256k1_ecdsa
+from aptos_sdk.account import Account
+from aptos_sdk.account_address import AccountAddress
+from aptos_sdk.asymmetric_crypto_wrapper import PublicKey as AnyPublicKey
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.asymmetric.utils import decode_dss_signature, encode_dss_signature
+
+try:
+    import coincurve
+    from coincurve.ecdsa import cdata_to_der, deserialize_compact
+except ImportError:  # optional dependency
+    coincurve = None
+
+try:
+    import ecdsa
+    import ecdsa.ellipticcurve
+    from ecdsa.util import sigdecode_string, sigencode_string_canonize
+except ImportError:
+    ecdsa = None
+
+SECP256K1_ORDER = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+_HALF_ORDER = SECP256K1_ORDER // 2
+
+# Fastest first
+BACKEND_PREFERENCE = ("coincurve", "cryptography", "ecdsa")
+
+
+def _sha3(data: bytes) -> bytes:
+    return hashlib.sha3_256(data).digest()
+
+
+def _split_signature(signature: bytes):
+    """``(r, s)`` of a 64-byte signature, or None if it is not a canonical one."""
+    if len(signature) != 64:
+        return None
+    r = int.from_bytes(signature[:32], "big")
+    s = int.from_bytes(signature[32:], "big")
+    if not (0 < r < SECP256K1_ORDER and 0 < s <= _HALF_ORDER):
+        return None
+    return r, s
+
+
+class CryptoBackend:
+    """
+    Interface of a secp256k1 backend.
+
+    ``load_private``/``load_public`` turn raw key bytes into the backend's own
+    key object, doing any per-key setup once; ``sign``/``verify`` take those
+    objects. Public keys are 65-byte uncompressed points (``0x04 || x || y``).
+    """
+    name = ""
+
+    def generate(self) -> bytes:
+        """A new random 32-byte private key."""
+        raise NotImplementedError
+
+    def load_private(self, secret: bytes) -> Any:
+        raise NotImplementedError
+
+    def public_key(self, private: Any) -> bytes:
+        raise NotImplementedError
+
+    def sign(self, private: Any, message: bytes) -> bytes:
+        """64-byte low-S ``r || s`` signature over SHA3-256(message)."""
+        raise NotImplementedError
+
+    def load_public(self, public_key: bytes) -> Any:
+        raise NotImplementedError
+
+    def verify(self, public: Any, message: bytes, signature: bytes) -> bool:
+        raise NotImplementedError
+
+
+class CoincurveBackend(CryptoBackend):
+    name = "coincurve"
+
+    def generate(self) -> bytes:
+        return coincurve.PrivateKey().secret
+
+    def load_private(self, secret: bytes) -> Any:
+        return coincurve.PrivateKey(secret)
+
+    def public_key(self, private: Any) -> bytes:
+        return private.public_key.format(compressed=False)
+
+    def sign(self, private: Any, message: bytes) -> bytes:
+        # libsecp256k1 always returns low-S; drop the recovery id
+        return private.sign_recoverable(message, hasher=_sha3)[:64]
+
+    def load_public(self, public_key: bytes) -> Any:
+        return coincurve.PublicKey(public_key)
+
+    def verify(self, public: Any, message: bytes, signature: bytes) -> bool:
+        if _split_signature(signature) is None:
+            return False
+        der = cdata_to_der(deserialize_compact(signature))
+        try:
+            return public.verify(der, message, hasher=_sha3)
+        except ValueError:
+            return False
+
+
+class CryptographyBackend(CryptoBackend):
+    name = "cryptography"
+
+    _ALGORITHM = ec.ECDSA(hashes.SHA3_256())
+
+    def generate(self) -> bytes:
+        return ec.generate_private_key(ec.SECP256K1()).private_numbers().private_value.to_bytes(32, "big")
+
+    def load_private(self, secret: bytes) -> Any:
+        return ec.derive_private_key(int.from_bytes(secret, "big"), ec.SECP256K1())
+
+    def public_key(self, private: Any) -> bytes:
+        numbers = private.public_key().public_numbers()
+        return b"\x04" + numbers.x.to_bytes(32, "big") + numbers.y.to_bytes(32, "big")
+
+    def sign(self, private: Any, message: bytes) -> bytes:
+        r, s = decode_dss_signature(private.sign(message, self._ALGORITHM))
+        if s > _HALF_ORDER:
+            s = SECP256K1_ORDER - s
+        return r.to_bytes(32, "big") + s.to_bytes(32, "big")
+
+    def load_public(self, public_key: bytes) -> Any:
+        return ec.EllipticCurvePublicKey.from_encoded_point(ec.SECP256K1(), public_key)
+
+    def verify(self, public: Any, message: bytes, signature: bytes) -> bool:
+        parts = _split_signature(signature)
+        if parts is None:
+            return False
+        try:
+            public.verify(encode_dss_signature(*parts), message, self._ALGORITHM)
+        except Exception:
+            return False
+        return True
+
+
+class EcdsaBackend(CryptoBackend):
+    name = "ecdsa"
+
+    def generate(self) -> bytes:
+        return ecdsa.SigningKey.generate(curve=ecdsa.SECP256k1).to_string()
+
+    def load_private(self, secret: bytes) -> Any:
+        return ecdsa.SigningKey.from_string(secret, curve=ecdsa.SECP256k1, hashfunc=hashlib.sha3_256)
+
+    def public_key(self, private: Any) -> bytes:
+        return private.verifying_key.to_string("uncompressed")
+
+    def sign(self, private: Any, message: bytes) -> bytes:
+        return private.sign_deterministic(message, hashfunc=hashlib.sha3_256,
+                                          sigencode=sigencode_string_canonize)
+
+    def load_public(self, public_key: bytes) -> Any:
+        decoded = ecdsa.VerifyingKey.from_string(public_key, curve=ecdsa.SECP256k1).pubkey.point
+        # precompute() needs the point to carry the curve order, which from_string drops
+        point = ecdsa.ellipticcurve.Point(ecdsa.SECP256k1.curve, decoded.x(), decoded.y(), ecdsa.SECP256k1.order)
+        key = ecdsa.VerifyingKey.from_public_point(point, curve=ecdsa.SECP256k1, hashfunc=hashlib.sha3_256)
+        # Point multiplication tables for this key; the main cost of pure-Python verification
+        key.precompute()
+        return key
+
+    def verify(self, public: Any, message: bytes, signature: bytes) -> bool:
+        if _split_signature(signature) is None:
+            return False
+        try:
+            return public.verify(signature, message, sigdecode=sigdecode_string)
+        except ecdsa.BadSignatureError:
+            return False
+
+
+_BACKENDS: Dict[str, Callable[[], CryptoBackend]] = {
+    "coincurve": CoincurveBackend,
+    "cryptography": CryptographyBackend,
+    "ecdsa": EcdsaBackend,
+}
+_MODULES = {"coincurve": coincurve, "cryptography": ec, "ecdsa": ecdsa}
+
+
+def available_backends() -> List[str]:
+    """Installed backends, fastest first."""
+    return [name for name in BACKEND_PREFERENCE if _MODULES[name] is not None]
+
+
+@lru_cache(maxsize=None)
+def get_backend(name: Optional[str] = None) -> CryptoBackend:
+    """
+    The named backend, else CRYPTO_BACKEND, else the fastest installed one.
+
+    Raises:
+        ValueError: if the requested backend is unknown or not installed
+    """
+    name = name or os.getenv('CRYPTO_BACKEND') or available_backends()[0]
+    if name not in _BACKENDS:
+        raise ValueError(f"Unknown crypto backend {name!r}; expected one of {BACKEND_PREFERENCE}")
+    if _MODULES[name] is None:
+        raise ValueError(f"Crypto backend {name!r} is not installed")
+    logging.info(f"Using {name} secp256k1 backend")
+    return _BACKENDS[name]()
+
+
+@lru_cache(maxsize=1024)
+def load_public_key(public_key: bytes, backend: Optional[str] = None) -> Any:
+    """Backend public key object for 65-byte ``public_key``, built once per key."""
+    return get_backend(backend).load_public(public_key)
+
+
+def verify(public_key: bytes, message: bytes, signature: bytes, backend: Optional[str] = None) -> bool:
+    """Check an Aptos secp256k1 signature; malformed keys or signatures are simply invalid."""
+    try:
+        public = load_public_key(bytes(public_key), backend)
+    except Exception:
+        return False
+    return get_backend(backend).verify(public, message, signature)
+
+
+class BackendPrivateKey(secp256k1_ecdsa.PrivateKey):
+    """SDK secp256k1 private key that signs through a CryptoBackend."""
+
+    def __init__(self, secret: bytes, backend: Optional[CryptoBackend] = None):
+        # The SDK base keeps a cryptography key for hex()/serialize(); signing never uses it
+        super().__init__(ec.derive_private_key(int.from_bytes(secret, "big"), ec.SECP256K1()))
+        self.backend = backend or get_backend()
+        self._private = self.backend.load_private(secret)
+        self._public_key = secp256k1_ecdsa.PublicKey(
+            CryptographyBackend().load_public(self.backend.public_key(self._private)))
+
+    @classmethod
+    def from_sdk(cls, key: secp256k1_ecdsa.PrivateKey, backend: Optional[CryptoBackend] = None) -> "BackendPrivateKey":
+        return cls(key.key.private_numbers().private_value.to_bytes(32, "big"), backend)
+
+    def public_key(self) -> secp256k1_ecdsa.PublicKey:
+        return self._public_key
+
+    def sign(self, data: bytes) -> secp256k1_ecdsa.Signature:
+        return secp256k1_ecdsa.Signature(self.backend.sign(self._private, data))
+
+
+def use_backend(account: Account) -> Account:
+    """
+    Make a secp256k1 ``account`` sign through the backend (in place) and return it.
+
+    Other key types are returned unchanged.
+    """
+    key = account.private_key
+    if isinstance(key, secp256k1_ecdsa.PrivateKey) and not isinstance(key, BackendPrivateKey):
+        account.private_key = BackendPrivateKey.from_sdk(key)
+    return account
+
+
+def generate_account() -> Account:
+    """A new secp256k1 Account whose key was generated and is used by the backend."""
+    key = BackendPrivateKey(get_backend().generate())
+    address = AccountAddress.from_key(AnyPublicKey(key.public_key()))
+    return Account(address, key)
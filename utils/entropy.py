@@ -0,0 +1,54 @@
+"""
+Entropy layers for 1P challenges.
+
+A challenge needs one integer per round. They used to come from a SHA3-256
+chain, one hash per layer with a hex-string round trip each (and, in one
+copy, random bytes mixed in). Now every layer comes from a single SHAKE-256
+XOF call over the nonce: layer ``i`` is bytes ``4i..4i+4`` of the output,
+read as a big-endian unsigned 32-bit integer.
+
+Derivation is deterministic by default: the same nonce always gives the
+same layers. Challenge code depends on that, because signed tokens, the seed
+pool and the batch engine all rebuild a challenge from its nonce. Pass
+``deterministic=False`` to mix fresh random bytes into the XOF input when
+the layers must not be reproducible from the seed.
+"""
+
+import hashlib
+import secrets
+import struct
+from functools import lru_cache
+from typing import List
+
+LAYER_SIZE = 4  # bytes per layer
+
+
+@lru_cache(maxsize=64)
+def _layer_format(layers: int) -> struct.Struct:
+    return struct.Struct(f">{layers}I")
+
+
+def entropy_bytes(seed: str, layers: int, deterministic: bool = True) -> bytes:
+    """The XOF output behind ``generate_entropy_layers``: ``LAYER_SIZE`` big-endian bytes per layer."""
+    data = seed.encode()
+    if not deterministic:
+        data += secrets.token_bytes(16)
+    return hashlib.shake_256(data).digest(LAYER_SIZE * layers)
+
+
+def generate_entropy_layers(seed: str, layers: int, deterministic: bool = True) -> List[int]:
+    """
+    ``layers`` 32-bit integers derived from ``seed`` in one SHAKE-256 call.
+
+    Args:
+        seed: The challenge nonce
+        layers: Number of integers to derive
+        deterministic: If False, random bytes are mixed in and the result
+            cannot be recomputed from ``seed``
+
+    Returns:
+        List of integers in [0, 2**32)
+    """
+    if layers <= 0:
+        return []
+    return list(_layer_format(layers).unpack(entropy_bytes(seed, layers, deterministic)))
@@ -0,0 +1,38 @@
+"""
+Numeric settings from environment variables.
+
+Settings are read at import time, so a malformed value must not crash the
+app: it is logged and the default is used instead.
+"""
+
+import logging
+import os
+from typing import Tuple
+
+
+def env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        logging.warning(f"Invalid value for {name}, using default {default}")
+        return default
+
+
+def env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        logging.warning(f"Invalid value for {name}, using default {default}")
+        return default
+
+
+def env_ints(name: str, default: Tuple[int, ...]) -> Tuple[int, ...]:
+    """A comma-separated list of integers, e.g. ``1,2,3``."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    try:
+        return tuple(int(item) for item in value.split(',') if item.strip())
+    except ValueError:
+        logging.warning(f"Invalid value for {name}, using default {','.join(map(str, default))}")
+        return default
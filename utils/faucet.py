@@ -0,0 +1,45 @@
+import logging
+import os
+from typing import Optional, Tuple
+
+import httpx
+
+from utils.client_pool import get_http_client
+
+DEFAULT_FAUCET_URL = os.getenv('APTOS_FAUCET_URL') or "https://faucet.testnet.aptoslabs.com/v1/fund"
+
+
+async def request_faucet_funds(
+    address: str,
+    amount_octas: int = 100000000,
+    faucet_url: str = DEFAULT_FAUCET_URL,
+    timeout: float = 30.0
+) -> Tuple[bool, Optional[str], Optional[str]]:
+    """
+    Request testnet APT from the faucet without blocking the event loop.
+
+    Args:
+        address: The address to fund
+        amount_octas: Amount to request in octas (default 1 APT)
+        faucet_url: The faucet fund endpoint
+        timeout: Request timeout in seconds
+
+    Returns:
+        Tuple of (success_bool, transaction_hash, error_message)
+    """
+    try:
+        response = await get_http_client().post(
+            faucet_url,
+            json={"address": str(address), "amount": amount_octas},
+            timeout=timeout,
+        )
+        if response.status_code != 200:
+            return False, None, response.text
+
+        result = response.json()
+        txn_hash = result.get('txn_hash') or next(iter(result.get('txn_hashes') or []), 'Unknown')
+        return True, txn_hash, None
+
+    except httpx.HTTPError as e:
+        logging.error(f"Faucet request failed: {str(e)}")
+        return False, None, str(e)
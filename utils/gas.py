@@ -0,0 +1,151 @@
+"""
+Cached gas-price estimation.
+
+The node's ``/estimate_gas_price`` endpoint reports three prices (octas per
+gas unit) for different inclusion-latency targets. The estimate changes
+slowly, so it is cached per node with a TTL. A stale value is returned at once
+while a refresh runs in the background, and concurrent lookups share one
+in-flight request. Both the fee preview and the transfer builders read it.
+
+Configuration:
+
+    GAS_PRICE_TTL            seconds an estimate is fresh (default 15)
+    GAS_PRICE_STALE_TTL      extra seconds a stale estimate may be served (default 120)
+    TRANSFER_GAS_UNITS       expected gas used by a coin transfer, for fee previews (default 10)
+    TRANSFER_MAX_GAS_AMOUNT  max gas units a transfer may consume (default 2000)
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+from aptos_sdk.async_client import ApiError, RestClient
+
+from utils.balance import OCTAS_PER_APT
+from utils.env import env_float, env_int
+from utils.nest_runner import submit
+
+# Inclusion-latency targets, cheapest first
+GAS_SPEEDS = ("deprioritized", "normal", "prioritized")
+
+TRANSFER_GAS_UNITS = env_int('TRANSFER_GAS_UNITS', 10)
+TRANSFER_MAX_GAS_AMOUNT = env_int('TRANSFER_MAX_GAS_AMOUNT', 2000)
+
+
+@dataclass(frozen=True)
+class GasEstimate:
+    """Gas unit prices in octas for each speed."""
+    deprioritized: int
+    normal: int
+    prioritized: int
+
+    def price(self, speed: str = "normal") -> int:
+        if speed not in GAS_SPEEDS:
+            raise ValueError(f"Unknown gas speed {speed!r}; expected one of {GAS_SPEEDS}")
+        return getattr(self, speed)
+
+    def fee_apt(self, speed: str = "normal", gas_units: int = TRANSFER_GAS_UNITS) -> float:
+        """Expected fee in APT for ``gas_units`` at ``speed``."""
+        return gas_units * self.price(speed) / OCTAS_PER_APT
+
+    @classmethod
+    def from_response(cls, data: Dict) -> "GasEstimate":
+        normal = int(data['gas_estimate'])
+        return cls(
+            deprioritized=int(data.get('deprioritized_gas_estimate') or normal),
+            normal=normal,
+            prioritized=int(data.get('prioritized_gas_estimate') or normal),
+        )
+
+
+class GasPriceEstimator:
+    """Per-node gas price cache with stale-while-revalidate and request coalescing."""
+
+    def __init__(self, ttl: Optional[float] = None, stale_ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl if ttl is not None else env_float('GAS_PRICE_TTL', 15)
+        self.stale_ttl = stale_ttl if stale_ttl is not None else env_float('GAS_PRICE_STALE_TTL', 120)
+        self._clock = clock
+        self._entries: Dict[str, Tuple[GasEstimate, float]] = {}
+        self._inflight: Dict[str, concurrent.futures.Future] = {}
+        self._lock = threading.Lock()
+
+    def get(self, client: RestClient, timeout: Optional[float] = None) -> GasEstimate:
+        """
+        Return the estimate for ``client``'s node without blocking unless nothing is cached.
+
+        Falls back to the client's configured gas price if the node can't be reached.
+        """
+        cached, future = self._lookup(client)
+        if cached is not None:
+            return cached
+        try:
+            return future.result(timeout)
+        except Exception as e:
+            logging.warning(f"Gas price estimate unavailable, using default: {e}")
+            return self.default(client)
+
+    async def estimate(self, client: RestClient) -> GasEstimate:
+        """Async variant of ``get`` for code already running on the event loop."""
+        cached, future = self._lookup(client)
+        if cached is not None:
+            return cached
+        try:
+            return await asyncio.wrap_future(future)
+        except Exception as e:
+            logging.warning(f"Gas price estimate unavailable, using default: {e}")
+            return self.default(client)
+
+    @staticmethod
+    def default(client: RestClient) -> GasEstimate:
+        price = client.client_config.gas_unit_price
+        return GasEstimate(price, price, price)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._inflight.clear()
+
+    def _lookup(self, client: RestClient) -> Tuple[Optional[GasEstimate], Optional[concurrent.futures.Future]]:
+        key = client.base_url
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                estimate, fetched_at = entry
+                age = self._clock() - fetched_at
+                if age < self.ttl:
+                    return estimate, None
+                if age < self.ttl + self.stale_ttl:
+                    self._refresh_locked(key, client)
+                    return estimate, None
+            return None, self._refresh_locked(key, client)
+
+    def _refresh_locked(self, key: str, client: RestClient) -> concurrent.futures.Future:
+        future = self._inflight.get(key)
+        if future is None:
+            future = submit(self._fetch(client))
+            self._inflight[key] = future
+            future.add_done_callback(lambda f: self._on_done(key, f))
+        return future
+
+    def _on_done(self, key: str, future: concurrent.futures.Future) -> None:
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+            if not future.cancelled() and future.exception() is None:
+                self._entries[key] = (future.result(), self._clock())
+
+    @staticmethod
+    async def _fetch(client: RestClient) -> GasEstimate:
+        response = await client._get(endpoint="estimate_gas_price")
+        if response.status_code >= 400:
+            raise ApiError(response.text, response.status_code)
+        return GasEstimate.from_response(response.json())
+
+
+# Shared instance used by the transfer builders and fee previews
+gas_estimator = GasPriceEstimator()
@@ -4,7 +4,8 @@ import streamlit as st
 import logging
 import inspect
 import os
-from typing import List
+
+from utils.entropy import generate_entropy_layers  # noqa: F401  (re-exported)
 
 
 def generate_nonce() -> str:
@@ -15,17 +16,6 @@ def keccak256(data: str) -> str:
     return hashlib.sha3_256(data.encode('utf-8')).hexdigest()
 
 
-def generate_entropy_layers(seed: str, layers: int) -> List[int]:
-    arr = []
-    cur = seed
-    for _ in range(layers):
-        h = keccak256(cur)
-        val = int(h[:8], 16)
-        arr.append(val)
-        cur = h
-    return arr
-
-
 def is_direct_page_access():
     """Check if a page is being accessed directly rather than through the main app.
 
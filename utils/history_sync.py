@@ -0,0 +1,82 @@
+"""
+Incremental, cursor-based transaction history sync.
+
+The node lists an account's transactions by sequence number, so the highest
+sequence number already synced is a natural watermark: a refresh asks only for
+``start=watermark`` onwards, one page at a time, and merges the new rows into
+a list that is already sorted newest-first.
+"""
+
+import bisect
+from typing import Any, Awaitable, Callable, Iterable, List, Optional, Set, Tuple
+
+# fetch_page(address, limit, start) -> list of raw transaction dicts or TransactionRecords
+FetchPage = Callable[[str, int, Optional[int]], Awaitable[List[Any]]]
+
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGES_PER_SYNC = 40
+
+
+def _sequence_number(raw) -> Optional[int]:
+    try:
+        return int(raw['sequence_number'] if isinstance(raw, dict) else raw.sequence_number)
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return None
+
+
+def advance_watermark(raw_txns: Iterable[Any], watermark: Optional[int]) -> Optional[int]:
+    """Return the next sequence number to fetch after ``raw_txns``."""
+    for raw in raw_txns:
+        seq = _sequence_number(raw)
+        if seq is not None and (watermark is None or seq + 1 > watermark):
+            watermark = seq + 1
+    return watermark
+
+
+async def fetch_new_transactions(fetch_page: FetchPage, address: str, watermark: Optional[int],
+                                 page_size: int = DEFAULT_PAGE_SIZE) -> Tuple[List[Any], int]:
+    """
+    Fetch only the transactions newer than ``watermark``.
+
+    Args:
+        fetch_page: Coroutine function returning one page of raw transactions
+        address: Account address
+        watermark: Next sequence number to fetch, or None on first sync
+        page_size: Page size for each request
+
+    Returns:
+        Tuple of (raw transactions, updated watermark)
+    """
+    if watermark is None:
+        # First sync: only the latest page, then continue incrementally
+        page = await fetch_page(address, page_size, None)
+        return page, advance_watermark(page, 0)
+
+    collected: List[Any] = []
+    for _ in range(MAX_PAGES_PER_SYNC):
+        page = await fetch_page(address, page_size, watermark)
+        collected.extend(page)
+        watermark = advance_watermark(page, watermark)
+        if len(page) < page_size:
+            break
+    return collected, watermark
+
+
+def _sort_key(txn) -> float:
+    # The list is kept newest-first, i.e. ascending in -timestamp
+    return -txn.timestamp
+
+
+def insert_transaction(transactions: List[Any], known_hashes: Set[str], txn) -> bool:
+    """Insert ``txn`` into the newest-first list unless its hash is known."""
+    if txn.txn_hash and txn.txn_hash in known_hashes:
+        return False
+    bisect.insort(transactions, txn, key=_sort_key)
+    if txn.txn_hash:
+        known_hashes.add(txn.txn_hash)
+    return True
+
+
+def merge_transactions(transactions: List[Any], known_hashes: Set[str], new_txns: Iterable[Any]) -> int:
+    """Merge ``new_txns`` into the sorted list; returns the number added."""
+    return sum(insert_transaction(transactions, known_hashes, txn) for txn in new_txns)
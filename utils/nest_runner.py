@@ -1,34 +1,114 @@
 """
-Clean implementation of asyncio with nest_asyncio for Streamlit applications.
+Process-wide asyncio runtime for Streamlit applications.
 
-This module provides a simple and clean way to run async functions in a Streamlit
-environment, where event loops can sometimes cause issues.
+Streamlit runs each script in its own thread, which used to mean patching
+loops with nest_asyncio and creating (and closing) event loops per call. That
+churn broke async clients whose connection pools are bound to a loop.
+
+This module instead runs one long-lived event loop on a daemon thread per
+process. Script threads hand coroutines to it with ``submit`` and get back a
+``concurrent.futures.Future``; ``async_to_sync`` blocks on that future.
 """
 
 import asyncio
+import atexit
+import concurrent.futures
 import functools
 import logging
-import nest_asyncio
-from typing import Any, Callable, TypeVar, Awaitable, cast
+import threading
+from typing import Awaitable, Optional, TypeVar
 
 T = TypeVar('T')
 
-# Apply nest_asyncio at module import time to enable nested event loops
-_nest_applied = False
-try:
-    if not _nest_applied:
-        nest_asyncio.apply()
-        _nest_applied = True
-        logging.info("nest_asyncio successfully applied")
-except Exception as e:
-    logging.warning(f"Failed to apply nest_asyncio: {e}")
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_thread: Optional[threading.Thread] = None
+_lock = threading.Lock()
 
-def run_async(func):
+
+def _run_loop(loop: asyncio.AbstractEventLoop, started: threading.Event) -> None:
+    asyncio.set_event_loop(loop)
+    loop.call_soon(started.set)
+    try:
+        loop.run_forever()
+    finally:
+        try:
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            if pending:
+                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            loop.close()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """
+    Return the process-wide background event loop, starting it on first use.
+
+    Returns:
+        The running background event loop
+    """
+    global _loop, _thread
+    loop = _loop
+    if loop is not None and not loop.is_closed():
+        return loop
+    with _lock:
+        if _loop is None or _loop.is_closed():
+            loop = asyncio.new_event_loop()
+            started = threading.Event()
+            thread = threading.Thread(
+                name="async-runtime", target=_run_loop, args=(loop, started), daemon=True
+            )
+            thread.start()
+            started.wait()
+            _loop, _thread = loop, thread
+            logging.info("Started background asyncio runtime")
+        return _loop
+
+
+def submit(coro: Awaitable[T], timeout: Optional[float] = None) -> "concurrent.futures.Future[T]":
+    """
+    Schedule a coroutine on the background loop.
+
+    Args:
+        coro: The coroutine to run
+        timeout: Optional limit in seconds; the coroutine is cancelled and the
+            future raises ``TimeoutError`` when it is exceeded
+
+    Returns:
+        A concurrent.futures.Future resolving to the coroutine's result
+    """
+    if timeout is not None:
+        coro = asyncio.wait_for(coro, timeout)
+    return asyncio.run_coroutine_threadsafe(coro, get_loop())
+
+
+def run_coroutine(coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+    """
+    Run a coroutine on the background loop and block until it finishes.
+
+    Args:
+        coro: A coroutine object to run
+        timeout: Optional limit in seconds
+
+    Returns:
+        The result of the coroutine
     """
-    A clean decorator to make async functions callable synchronously.
+    loop = get_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        # Blocking the runtime thread on itself would deadlock
+        raise RuntimeError("run_coroutine cannot be called from the background loop; await the coroutine instead")
+    return submit(coro, timeout).result()
+
 
-    This decorator properly handles async functions in Streamlit, preventing
-    "Event loop is closed" errors by using nest_asyncio.
+def run_async(func):
+    """
+    A decorator to make async functions callable synchronously.
 
     Args:
         func: The async function to decorate
@@ -50,49 +130,15 @@ def run_async(func):
         return run_coroutine(func(*args, **kwargs))
     return wrapper
 
-def run_coroutine(coro: Awaitable[T]) -> T:
-    """
-    Run a coroutine object safely with nest_asyncio.
-
-    Args:
-        coro: A coroutine object to run
-
-    Returns:
-        The result of the coroutine
-    """
-    try:
-        # Get the current event loop, or create one if it doesn't exist
-        try:
-            loop = asyncio.get_event_loop()
-            if loop.is_closed():
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-        except RuntimeError:
-            # "There is no current event loop in thread"
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-        # Run the coroutine and return the result
-        return loop.run_until_complete(coro)
-    except Exception as e:
-        if "cannot reuse already awaited coroutine" in str(e):
-            # This is a fatal error, we can't reuse the coroutine
-            logging.error(f"Cannot reuse coroutine: {e}")
-            raise ValueError("Cannot reuse the same coroutine object. Create a fresh coroutine for each call.")
-        else:
-            # If all else fails, create a new event loop and try again
-            logging.warning(f"Error in run_coroutine, retrying with new event loop: {e}")
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            return loop.run_until_complete(coro)
 
 # Convenience function for one-off coroutine runs
-def async_to_sync(coro: Awaitable[T]) -> T:
+def async_to_sync(coro: Awaitable[T], timeout: Optional[float] = None) -> T:
     """
     Run an async coroutine synchronously and return the result.
 
     Args:
         coro: The coroutine to run
+        timeout: Optional limit in seconds
 
     Returns:
         The result of the coroutine
@@ -100,4 +146,20 @@ def async_to_sync(coro: Awaitable[T]) -> T:
     Example:
         result = async_to_sync(client.get_balance("0x123"))
     """
-    return run_coroutine(coro)
\ No newline at end of file
+    return run_coroutine(coro, timeout)
+
+
+def shutdown(timeout: float = 5.0) -> None:
+    """Stop the background loop, cancelling any outstanding tasks."""
+    global _loop, _thread
+    with _lock:
+        loop, thread = _loop, _thread
+        _loop, _thread = None, None
+    if loop is None or loop.is_closed():
+        return
+    loop.call_soon_threadsafe(loop.stop)
+    if thread is not None and thread is not threading.current_thread():
+        thread.join(timeout)
+
+
+atexit.register(shutdown)
@@ -0,0 +1,271 @@
+"""
+Health-aware routing across several Aptos fullnodes.
+
+A NodeRouter keeps per-node health: an EWMA of response latency and of the
+error rate, plus a circuit breaker. After ``failure_threshold`` consecutive
+failures (transport errors, 429 or 5xx) a node is skipped for ``cooldown``
+seconds. After the cooldown one read is sent to it as a trial. Success closes
+the circuit; failure reopens it.
+
+RoutedRestClient plugs the router into the SDK at the httpx transport level,
+so every SDK call and every direct request on ``client.client`` is routed:
+
+* Reads (GET, view functions) go to the healthiest node. If no response
+  arrives within the hedge delay, the same read is also sent to the next
+  node and the first good response wins. A failing node is skipped
+  immediately.
+* Writes (transaction submission) go to the healthiest node only. They move
+  to another node only when the connection could not be made, so a lost
+  response can never cause a double submission.
+
+Configuration:
+
+    APTOS_NODE_URLS            comma-separated fullnode URLs (see utils.client_pool)
+    NODE_HEDGE_DELAY           fixed hedge delay in seconds (default: adaptive,
+                               3x the node's EWMA latency, clamped to 0.05-2s)
+    NODE_FAILURE_THRESHOLD     consecutive failures that open a circuit (default 3)
+    NODE_CIRCUIT_COOLDOWN      seconds a tripped node is skipped (default 30)
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence
+
+import httpx
+
+from utils.client_pool import NODE_URLS, DEFAULT_NODE_URL, PooledRestClient
+from utils.env import env_float, env_int
+
+# POST endpoints that only read state and may be hedged
+READ_POST_SUFFIXES = ("/view", "/transactions/simulate")
+
+EWMA_ALPHA = 0.3
+MIN_HEDGE_DELAY = 0.05
+MAX_HEDGE_DELAY = 2.0
+
+
+@dataclass
+class NodeHealth:
+    url: str
+    latency: Optional[float] = None  # EWMA seconds; None until the first response
+    error_rate: float = 0.0          # EWMA of failures in [0, 1]
+    consecutive_failures: int = 0
+    opened_at: Optional[float] = None  # circuit open since; None when closed
+
+    def score(self) -> float:
+        # Unmeasured nodes score 0 so they get tried early
+        return (self.latency or 0.0) * (1 + 10 * self.error_rate)
+
+
+def is_node_failure(response: httpx.Response) -> bool:
+    """Responses that say something about the node rather than the request."""
+    return response.status_code == 429 or response.status_code >= 500
+
+
+class NodeRouter:
+    """Tracks fullnode health and orders nodes for each request."""
+
+    def __init__(self, urls: Sequence[str], failure_threshold: Optional[int] = None,
+                 cooldown: Optional[float] = None, hedge_delay: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        if not urls:
+            raise ValueError("NodeRouter needs at least one node URL")
+        self.urls = [url.rstrip('/') for url in urls]
+        self.failure_threshold = failure_threshold or env_int('NODE_FAILURE_THRESHOLD', 3)
+        self.cooldown = cooldown if cooldown is not None else env_float('NODE_CIRCUIT_COOLDOWN', 30)
+        if hedge_delay is None and os.getenv('NODE_HEDGE_DELAY'):
+            hedge_delay = env_float('NODE_HEDGE_DELAY', None)
+        self.fixed_hedge_delay = hedge_delay
+        self._clock = clock
+        self._health: Dict[str, NodeHealth] = {url: NodeHealth(url) for url in self.urls}
+        self._lock = threading.Lock()
+
+    def ranked(self, probe: bool = True) -> List[str]:
+        """
+        Nodes to try, best first. Tripped nodes are left out while cooling down.
+
+        With ``probe``, one tripped node whose cooldown has elapsed is put first
+        as a trial request (at most one trial per cooldown period).
+        """
+        now = self._clock()
+        with self._lock:
+            order = sorted((h for h in self._health.values() if h.opened_at is None), key=NodeHealth.score)
+            if probe:
+                for health in self._health.values():
+                    if health.opened_at is not None and now - health.opened_at >= self.cooldown:
+                        health.opened_at = now
+                        order.insert(0, health)
+                        break
+            if not order:
+                # Everything is tripped: try the node that tripped longest ago
+                return [min(self._health.values(), key=lambda h: h.opened_at).url]
+            return [h.url for h in order]
+
+    def hedge_delay(self, url: str) -> float:
+        if self.fixed_hedge_delay is not None:
+            return self.fixed_hedge_delay
+        latency = self._health[url].latency
+        if latency is None:
+            return MAX_HEDGE_DELAY
+        return min(max(3 * latency, MIN_HEDGE_DELAY), MAX_HEDGE_DELAY)
+
+    def record_success(self, url: str, latency: float) -> None:
+        with self._lock:
+            health = self._health[url]
+            health.latency = latency if health.latency is None else (
+                EWMA_ALPHA * latency + (1 - EWMA_ALPHA) * health.latency)
+            health.error_rate *= 1 - EWMA_ALPHA
+            health.consecutive_failures = 0
+            if health.opened_at is not None:
+                logging.info(f"Node {url} recovered; closing circuit")
+            health.opened_at = None
+
+    def record_failure(self, url: str) -> None:
+        with self._lock:
+            health = self._health[url]
+            health.error_rate = EWMA_ALPHA + (1 - EWMA_ALPHA) * health.error_rate
+            health.consecutive_failures += 1
+            if health.consecutive_failures >= self.failure_threshold:
+                if health.opened_at is None:
+                    logging.warning(f"Node {url} failing; opening circuit for {self.cooldown}s")
+                # (Re)open; a failed trial request after the cooldown restarts it
+                health.opened_at = self._clock()
+
+    def health(self) -> Dict[str, NodeHealth]:
+        """Snapshot of per-node health, for diagnostics."""
+        with self._lock:
+            return {url: NodeHealth(**vars(h)) for url, h in self._health.items()}
+
+
+class RoutingTransport(httpx.AsyncBaseTransport):
+    """Rewrites requests for ``base_url`` onto the node chosen by the router."""
+
+    def __init__(self, router: NodeRouter, base_url: str, limits: httpx.Limits, http2: bool = False):
+        self.router = router
+        self.base_url = base_url.rstrip('/')
+        self._transports = {url: httpx.AsyncHTTPTransport(limits=limits, http2=http2) for url in router.urls}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        url = str(request.url)
+        if not url.startswith(self.base_url):
+            raise httpx.UnsupportedProtocol(f"RoutingTransport only serves {self.base_url}, got {url}")
+        suffix = url[len(self.base_url):]
+        if request.method == "GET" or request.url.path.endswith(READ_POST_SUFFIXES):
+            return await self._hedged(request, suffix, self.router.ranked())
+        # Never use a write as a circuit-breaker trial
+        return await self._write(request, suffix, self.router.ranked(probe=False))
+
+    async def aclose(self) -> None:
+        for transport in self._transports.values():
+            await transport.aclose()
+
+    async def _send(self, node: str, request: httpx.Request, suffix: str) -> httpx.Response:
+        headers = [(k, v) for k, v in request.headers.raw if k.lower() != b"host"]
+        routed = httpx.Request(request.method, node + suffix, headers=headers, content=request.content,
+                               extensions=request.extensions)
+        started = time.perf_counter()
+        try:
+            response = await self._transports[node].handle_async_request(routed)
+        except Exception:
+            self.router.record_failure(node)
+            raise
+        if is_node_failure(response):
+            self.router.record_failure(node)
+        else:
+            self.router.record_success(node, time.perf_counter() - started)
+        return response
+
+    async def _write(self, request: httpx.Request, suffix: str, nodes: List[str]) -> httpx.Response:
+        for index, node in enumerate(nodes):
+            try:
+                return await self._send(node, request, suffix)
+            except httpx.ConnectError:
+                # Nothing reached the node, so another one may take the write
+                if index == len(nodes) - 1:
+                    raise
+
+    async def _hedged(self, request: httpx.Request, suffix: str, nodes: List[str]) -> httpx.Response:
+        pending: Dict[asyncio.Task, str] = {}
+        remaining = list(nodes)
+        last_response: Optional[httpx.Response] = None
+        last_error: Optional[BaseException] = None
+
+        def launch() -> None:
+            node = remaining.pop(0)
+            pending[asyncio.ensure_future(self._send(node, request, suffix))] = node
+
+        launch()
+        try:
+            while pending:
+                delay = self.router.hedge_delay(next(iter(pending.values()))) if remaining else None
+                done, _ = await asyncio.wait(pending, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # Slow: hedge to the next node, keep the first request running
+                    launch()
+                    continue
+                for task in done:
+                    del pending[task]
+                    if task.exception() is not None:
+                        last_error = task.exception()
+                        continue
+                    response = task.result()
+                    if not is_node_failure(response):
+                        if last_response is not None:
+                            await last_response.aclose()
+                        return response
+                    if last_response is not None:
+                        await last_response.aclose()
+                    last_response = response
+                if remaining and not pending:
+                    launch()
+        finally:
+            for task in pending:
+                task.cancel()
+                task.add_done_callback(_close_late_response)
+
+        if last_response is not None:
+            return last_response
+        raise last_error
+
+
+def _close_late_response(task: asyncio.Task) -> None:
+    # A hedged request that finished after it lost the race
+    if not task.cancelled() and task.exception() is None:
+        asyncio.ensure_future(task.result().aclose())
+
+
+class RoutedRestClient(PooledRestClient):
+    """A pooled RestClient whose requests are spread over the router's nodes.
+
+    ``base_url`` is only a logical address (it keeps per-node caches such as
+    the balance and gas caches keyed consistently); each request is rewritten
+    onto the node the router picks.
+    """
+
+    def __init__(self, base_url: str, router: NodeRouter, **kwargs):
+        super().__init__(base_url, **kwargs)
+        self.router = router
+
+    def _make_http_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            transport=RoutingTransport(self.router, self.base_url, self._limits, self.client_config.http2),
+            timeout=self._timeout,
+            headers=self._headers,
+        )
+
+
+_router: Optional[NodeRouter] = None
+_router_lock = threading.Lock()
+
+
+def get_router() -> NodeRouter:
+    """The process-wide router over APTOS_NODE_URLS."""
+    global _router
+    with _router_lock:
+        if _router is None:
+            _router = NodeRouter(NODE_URLS or [DEFAULT_NODE_URL])
+        return _router
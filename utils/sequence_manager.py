@@ -0,0 +1,234 @@
+"""
+Process-wide sequence-number allocation for signing accounts.
+
+Fetching the sequence number from the node before every send costs a round
+trip, and two sessions sending from the same account (the system wallet) race
+on the same number. A SequenceNumberManager fetches the on-chain number once,
+then hands out numbers locally so many transfers can be in flight at once.
+Numbers whose transaction definitely never reached the mempool (never sent,
+no connection could be made, or rejected with a 4xx) are handed out again first, so a failed submission
+does not leave a gap, and a sequence-number error from the node triggers a
+resync. A number whose submission failed ambiguously (timeout, 5xx) is not
+reused while it can still commit: the node may have accepted it, and signing
+a second transaction with it would conflict with the first. Once its
+transaction has expired and the chain is still below it, it never will: the
+manager resyncs and rewinds to the on-chain number to fill the gap.
+
+All methods run on the shared background loop (utils.nest_runner).
+
+Configuration:
+
+    SEQUENCE_MAX_IN_FLIGHT       numbers handed out ahead of the chain (default 100)
+    SEQUENCE_IN_FLIGHT_TIMEOUT   seconds to wait for room before giving up (default 30)
+"""
+
+import asyncio
+import heapq
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+from aptos_sdk.async_client import ApiError, RestClient
+
+from utils.balance_cache import normalize_address
+from utils.env import env_float, env_int
+
+# Max transactions submitted ahead of the last on-chain sequence number
+# (the node's mempool parks at most 100 per account)
+MAX_IN_FLIGHT = env_int('SEQUENCE_MAX_IN_FLIGHT', 100)
+IN_FLIGHT_TIMEOUT = env_float('SEQUENCE_IN_FLIGHT_TIMEOUT', 30)
+IN_FLIGHT_POLL_INTERVAL = 0.5
+
+# Block timestamps trail wall-clock time; an expired transaction is only
+# written off this long after its expiration
+EXPIRATION_GRACE = 5.0
+
+SEQUENCE_ERROR_MARKERS = (
+    "SEQUENCE_NUMBER_TOO_OLD",
+    "SEQUENCE_NUMBER_TOO_NEW",
+    "SEQUENCE_NUMBER_TOO_BIG",
+    "INVALID_SEQ_NUMBER",
+)
+
+
+def is_sequence_error(error: Exception) -> bool:
+    """True if the node rejected a transaction because of its sequence number."""
+    return any(marker in str(error) for marker in SEQUENCE_ERROR_MARKERS)
+
+
+def is_rejection(error: Exception) -> bool:
+    """True if the node answered with a 4xx, so it definitely did not accept the transaction."""
+    return isinstance(error, ApiError) and 400 <= error.status_code < 500
+
+
+def is_connect_error(error: Exception) -> bool:
+    """True if no connection to the node was made, so the request was never sent."""
+    return isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
+
+
+class SequenceNumberManager:
+    """Hands out sequence numbers for one account without a node round trip each."""
+
+    def __init__(self, client: RestClient, address, max_in_flight: int = MAX_IN_FLIGHT,
+                 in_flight_timeout: float = IN_FLIGHT_TIMEOUT, clock: Callable[[], float] = time.time):
+        self.client = client
+        self.address = address
+        self.max_in_flight = max_in_flight
+        self.in_flight_timeout = in_flight_timeout
+        self._clock = clock
+        self._lock = asyncio.Lock()
+        self._next: Optional[int] = None
+        self._on_chain = 0
+        # Released numbers below _next, reused lowest first to fill gaps
+        self._free: List[int] = []
+        # Abandoned numbers -> expiration_timestamp_secs of their transaction
+        self._abandoned: Dict[int, float] = {}
+
+    async def next_sequence_number(self) -> int:
+        """
+        Reserve the next sequence number, syncing from the node on first use.
+
+        Raises:
+            TimeoutError: If ``max_in_flight`` numbers stay outstanding for
+                ``in_flight_timeout`` seconds
+        """
+        deadline = time.monotonic() + self.in_flight_timeout
+        while True:
+            async with self._lock:
+                if self._next is None:
+                    await self._sync()
+                else:
+                    await self._expire_abandoned()
+                seq = self._allocate()
+                if seq is None:
+                    self._on_chain = await self.client.account_sequence_number(self.address)
+                    seq = self._allocate()
+                if seq is not None:
+                    return seq
+            # Too far ahead of the chain; wait for earlier transactions to commit
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"{self._next - self._on_chain} transactions from {self.address} "
+                                   f"still pending after {self.in_flight_timeout}s")
+            await asyncio.sleep(min(IN_FLIGHT_POLL_INTERVAL, remaining))
+
+    def _allocate(self) -> Optional[int]:
+        while self._free:
+            seq = heapq.heappop(self._free)
+            if seq >= self._on_chain:
+                return seq
+        if self._next - self._on_chain >= self.max_in_flight:
+            return None
+        seq = self._next
+        self._next += 1
+        return seq
+
+    async def release(self, sequence_number: int, error: Optional[Exception] = None) -> None:
+        """
+        Report that the transaction using ``sequence_number`` was definitely not accepted.
+
+        Only call this if it was never sent or the node rejected it (see
+        ``is_connect_error`` and ``is_rejection``); use ``abandon`` when the
+        outcome is unknown. The number is handed out again by the next
+        allocation. If the node rejected it for its sequence number, resync
+        from the node instead; numbers still in flight are never rewound.
+        """
+        async with self._lock:
+            if self._next is None:
+                return
+            if error is not None and is_sequence_error(error):
+                if "SEQUENCE_NUMBER_TOO_OLD" in str(error):
+                    await self._sync(keep_in_flight=True)
+                else:
+                    await self._rewind(sequence_number)
+            elif sequence_number == self._next - 1:
+                self._next = sequence_number
+            elif sequence_number not in self._free:
+                heapq.heappush(self._free, sequence_number)
+
+    async def abandon(self, *sequence_numbers: int, expires_at: float) -> None:
+        """
+        Report that the submissions using ``sequence_numbers`` failed ambiguously.
+
+        The node may hold the transactions, so the numbers are not reused
+        while they can still commit. The chain position is refreshed without
+        rewinding numbers still in flight. If the chain has not reached a
+        number once ``expires_at`` (the transactions' expiration_timestamp_secs)
+        has passed, its transaction was lost and the next allocation rewinds
+        to the on-chain number.
+        """
+        async with self._lock:
+            if self._next is None:
+                return
+            for seq in sequence_numbers:
+                self._abandoned[seq] = max(expires_at, self._abandoned.get(seq, 0))
+            await self._sync(keep_in_flight=True)
+            logging.warning(f"Sequence numbers {list(sequence_numbers)} for {self.address} abandoned: outcome unknown")
+
+    async def _expire_abandoned(self) -> None:
+        now = self._clock()
+        expired = [seq for seq, expires_at in self._abandoned.items() if expires_at + EXPIRATION_GRACE <= now]
+        if not expired:
+            return
+        self._on_chain = await self.client.account_sequence_number(self.address)
+        lost = [seq for seq in expired if seq >= self._on_chain]
+        if lost:
+            # Nothing above a lost number can commit until it is filled
+            logging.warning(f"Abandoned sequence numbers {lost} for {self.address} expired; "
+                            f"rewinding to {self._on_chain}")
+            self._next = self._on_chain
+            self._free = []
+            self._abandoned.clear()
+        else:
+            for seq in expired:
+                del self._abandoned[seq]
+
+    async def resync(self) -> None:
+        """Drop the local counter and reload it from the node."""
+        async with self._lock:
+            await self._sync()
+
+    async def _rewind(self, released: int) -> None:
+        # Rewind to just above the highest number still in flight, or to the
+        # chain if it is ahead; numbers below that stay outstanding or free
+        self._on_chain = await self.client.account_sequence_number(self.address)
+        free = set(self._free)
+        free.add(released)
+        top = self._next - 1
+        while top >= self._on_chain and top in free:
+            top -= 1
+        self._next = max(self._on_chain, top + 1)
+        self._free = [seq for seq in free if self._on_chain <= seq < self._next]
+        heapq.heapify(self._free)
+        logging.info(f"Rewound sequence number for {self.address} to {self._next}")
+
+    async def _sync(self, keep_in_flight: bool = False) -> None:
+        # keep_in_flight: the chain moved past a number we handed out, but
+        # numbers above it may still be pending in the mempool; only move forward
+        self._on_chain = await self.client.account_sequence_number(self.address)
+        if keep_in_flight and self._next is not None:
+            self._next = max(self._next, self._on_chain)
+            self._free = [seq for seq in self._free if seq >= self._on_chain]
+            heapq.heapify(self._free)
+        else:
+            self._next = self._on_chain
+            self._free = []
+            self._abandoned.clear()
+        logging.info(f"Synced sequence number for {self.address}: {self._next}")
+
+
+_managers: Dict[Tuple[str, str], SequenceNumberManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_sequence_manager(client: RestClient, address) -> SequenceNumberManager:
+    """Return the process-wide manager for ``address`` on ``client``'s node."""
+    key = (client.base_url, normalize_address(address))
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None:
+            manager = SequenceNumberManager(client, address)
+            _managers[key] = manager
+        return manager
@@ -0,0 +1,194 @@
+"""
+Bulk verification of signed messages.
+
+Input is JSON Lines, one signed message per line, as exported by the
+"Sign Message" form:
+
+    {"public_key": "0x04…", "message": "hello", "signature": "0x…", "address": "0x…"}
+
+``public_key`` is a 32-byte ed25519 key or a 64/65-byte secp256k1 point, and
+``message`` is the UTF-8 text that was signed. ``address`` is optional; when
+given, it must be the account address derived from the public key.
+
+``verify_lines`` streams the input in chunks of raw lines to a process pool.
+Workers parse and verify their chunks, so throughput scales with cores.
+Results come back in input order, with a bounded number of chunks in flight,
+so arbitrarily large uploads are never held in memory. Each worker caches
+decoded public keys, and a batch from a few signers decodes each key once per
+worker.
+
+Configuration:
+
+    SIGNATURE_VERIFY_WORKERS   worker processes (default: CPU count)
+    SIGNATURE_VERIFY_CHUNK     lines per work unit (default 256)
+"""
+
+import concurrent.futures
+import json
+import multiprocessing
+import os
+import threading
+from collections import deque
+from functools import lru_cache
+from itertools import chain, islice
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from aptos_sdk import ed25519, secp256k1_ecdsa
+from aptos_sdk.account import Account
+from aptos_sdk.account_address import AccountAddress
+from aptos_sdk.asymmetric_crypto_wrapper import PublicKey as AnyPublicKey
+from cryptography.hazmat.primitives.asymmetric import ec
+from nacl.signing import VerifyKey
+
+from utils.crypto_backend import load_public_key, verify as verify_secp256k1
+from utils.env import env_int
+from utils.transfer_payload import address_bytes
+
+VERIFY_WORKERS = env_int('SIGNATURE_VERIFY_WORKERS', 0) or os.cpu_count() or 1
+VERIFY_CHUNK = env_int('SIGNATURE_VERIFY_CHUNK', 256)
+
+
+class VerificationResult(NamedTuple):
+    line: int                # 1-based line number in the input
+    valid: bool
+    address: Optional[str]   # address derived from the public key
+    error: Optional[str]     # why the row is invalid or could not be checked
+
+
+def _hex_bytes(value: str) -> bytes:
+    value = value.strip()
+    return bytes.fromhex(value[2:] if value.startswith('0x') else value)
+
+
+def public_key_hex(account: Account) -> str:
+    """Hex of an account's public key in the form ``verify_lines`` accepts."""
+    return "0x" + account.public_key().to_crypto_bytes().hex()
+
+
+@lru_cache(maxsize=4096)
+def _decode_public_key(public_key: str) -> Tuple[str, Any, str]:
+    """``(scheme, key, address)`` for a hex public key; cached per process."""
+    raw = _hex_bytes(public_key)
+    if len(raw) == ed25519.PublicKey.LENGTH:
+        key = ed25519.PublicKey(VerifyKey(raw))
+        return "ed25519", key, str(AccountAddress.from_key(key))
+    if len(raw) == 64:
+        raw = b"\x04" + raw
+    if len(raw) == 65 and raw[0] == 4:
+        key = secp256k1_ecdsa.PublicKey(ec.EllipticCurvePublicKey.from_encoded_point(ec.SECP256K1(), raw))
+        # Warm the backend's own key cache for the verifications that follow
+        load_public_key(raw)
+        return "secp256k1", raw, str(AccountAddress.from_key(AnyPublicKey(key)))
+    raise ValueError(f"unsupported public key length {len(raw)}")
+
+
+def verify_signature(public_key: str, message: Union[str, bytes], signature: str,
+                     address: Optional[str] = None) -> Tuple[bool, str]:
+    """
+    Verify one signature.
+
+    Args:
+        public_key: Hex ed25519 or secp256k1 public key
+        message: Signed message; text is UTF-8 encoded
+        signature: Hex 64-byte signature
+        address: Expected signer address, checked against the public key
+
+    Returns:
+        (valid, address derived from the public key)
+
+    Raises:
+        ValueError: if the key, signature or address is malformed, or the
+            address does not belong to the key
+    """
+    scheme, key, derived = _decode_public_key(public_key)
+    if address is not None and address_bytes(address) != address_bytes(derived):
+        raise ValueError("address does not match public key")
+    data = message.encode() if isinstance(message, str) else message
+    sig = _hex_bytes(signature)
+    if scheme == "ed25519":
+        return key.verify(data, ed25519.Signature(sig)), derived
+    return verify_secp256k1(key, data, sig), derived
+
+
+def _verify_line(line_no: int, text: str) -> VerificationResult:
+    address = None
+    try:
+        row = json.loads(text)
+        if not isinstance(row, dict):
+            raise ValueError("expected a JSON object")
+        missing = [name for name in ('public_key', 'message', 'signature') if not row.get(name)]
+        if missing:
+            raise ValueError(f"missing {', '.join(missing)}")
+        valid, address = verify_signature(row['public_key'], row['message'], row['signature'], row.get('address'))
+    except (ValueError, TypeError, AttributeError) as e:
+        return VerificationResult(line_no, False, address, str(e))
+    return VerificationResult(line_no, valid, address, None if valid else "signature does not verify")
+
+
+def _verify_chunk(chunk: List[Tuple[int, str]]) -> List[VerificationResult]:
+    return [_verify_line(line_no, text) for line_no, text in chunk]
+
+
+def _chunks(lines: Iterable[Union[str, bytes]], size: int) -> Iterator[List[Tuple[int, str]]]:
+    numbered = (
+        (line_no, line.decode('utf-8', errors='replace') if isinstance(line, bytes) else line)
+        for line_no, line in enumerate(lines, 1)
+    )
+    rows = ((line_no, text) for line_no, text in numbered if text.strip())
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+_pools: Dict[int, concurrent.futures.ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(workers: int = VERIFY_WORKERS) -> concurrent.futures.ProcessPoolExecutor:
+    """The process-wide verification pool with ``workers`` processes, started on first use."""
+    with _pools_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            # spawn: the app process runs threads (event loop, Streamlit), which fork would copy badly
+            pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            _pools[workers] = pool
+        return pool
+
+
+def verify_lines(lines: Iterable[Union[str, bytes]], workers: Optional[int] = None,
+                 chunk_size: Optional[int] = None) -> Iterator[VerificationResult]:
+    """
+    Verify a JSON Lines stream of signed messages.
+
+    Blank lines are skipped but still counted in line numbers. Input that fits
+    in one chunk, or ``workers=1``, is verified in this process.
+
+    Args:
+        lines: Text or byte lines, e.g. an open file
+        workers: Worker processes; defaults to SIGNATURE_VERIFY_WORKERS
+        chunk_size: Lines per work unit; defaults to SIGNATURE_VERIFY_CHUNK
+
+    Yields:
+        VerificationResult per non-blank line, in input order
+    """
+    workers = workers or VERIFY_WORKERS
+    chunks = _chunks(lines, chunk_size or VERIFY_CHUNK)
+    head = list(islice(chunks, 2))
+    if workers == 1 or len(head) < 2:
+        for chunk in chain(head, chunks):
+            yield from _verify_chunk(chunk)
+        return
+
+    pool = get_pool(workers)
+    pending = deque()
+    # Keep every worker busy with one chunk queued behind it, no more
+    max_pending = 2 * workers
+    for chunk in chain(head, chunks):
+        if len(pending) >= max_pending:
+            yield from pending.popleft().result()
+        pending.append(pool.submit(_verify_chunk, chunk))
+    while pending:
+        yield from pending.popleft().result()
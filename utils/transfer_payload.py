@@ -0,0 +1,125 @@
+"""
+Precompiled coin-transfer transactions.
+
+A ``0x1::coin::transfer<CoinType>`` payload is identical for every transfer
+except for the recipient and the amount. CoinTransferTemplate serializes the
+variant tag, module id, function name and type argument once. Each
+transaction is then produced as one ``bytes.join`` of cached pieces and
+packed integers: the RawTransaction BCS, the signed transaction and its hash.
+The output is byte-for-byte what the SDK's RawTransaction/SignedTransaction
+serialization produces.
+"""
+
+import hashlib
+import struct
+from functools import lru_cache
+from typing import NamedTuple, Union
+
+from aptos_sdk.account import Account
+from aptos_sdk.account_address import AccountAddress
+from aptos_sdk.authenticator import AccountAuthenticator, Authenticator, SingleSenderAuthenticator
+from aptos_sdk.bcs import Serializer
+from aptos_sdk.transactions import ModuleId, RawTransactionInternal, TransactionPayload
+from aptos_sdk.type_tag import StructTag, TypeTag
+
+from utils.balance import APT_COIN_TYPE
+from utils.crypto_backend import use_backend
+
+_RAW_TXN_PREHASH = hashlib.sha3_256(b"APTOS::RawTransaction").digest()
+# Transaction hash = sha3(prehash || UserTransaction variant || signed txn BCS)
+_USER_TXN_HASH_PREFIX = hashlib.sha3_256(b"APTOS::Transaction").digest() + b"\x00"
+
+_U64 = struct.Struct("<Q")
+# max_gas_amount, gas_unit_price, expiration_timestamp_secs, chain_id
+_TAIL = struct.Struct("<QQQB")
+
+# Entry function arguments are BCS byte vectors: a length prefix, then the value
+_ADDRESS_ARG = bytes([AccountAddress.LENGTH])
+_U64_ARG = bytes([_U64.size])
+
+
+@lru_cache(maxsize=4096)
+def address_bytes(address: str) -> bytes:
+    """The 32-byte form of an address string (cached; raises ValueError if invalid)."""
+    try:
+        return AccountAddress.from_str_relaxed(address).address
+    except RuntimeError as e:
+        # The SDK raises RuntimeError for an empty or over-long hex string
+        raise ValueError(f"Invalid address {address!r}: {e}") from e
+
+
+def _sender_bytes(sender: Union[AccountAddress, str]) -> bytes:
+    return sender.address if isinstance(sender, AccountAddress) else address_bytes(sender)
+
+
+class SignedTransfer(NamedTuple):
+    """BCS of a SignedTransaction and its hash, ready to submit."""
+    data: bytes
+    hash: str
+    expiration_timestamp_secs: int
+
+
+class _SerializedRawTransaction(RawTransactionInternal):
+    """Lets the SDK's signing (Account.sign_transaction) work on prebuilt BCS."""
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+    def prehash(self) -> bytes:
+        return _RAW_TXN_PREHASH
+
+    def serialize(self, serializer: Serializer) -> None:
+        serializer.fixed_bytes(self.data)
+
+
+def _transaction_authenticator(authenticator: AccountAuthenticator) -> Authenticator:
+    # Same wrapping as SignedTransaction.__init__
+    if authenticator.variant in (AccountAuthenticator.ED25519, AccountAuthenticator.MULTI_ED25519):
+        return Authenticator(authenticator.authenticator)
+    return Authenticator(SingleSenderAuthenticator(authenticator))
+
+
+class CoinTransferTemplate:
+    """Builds ``0x1::coin::transfer<coin_type>`` transactions from cached BCS."""
+
+    def __init__(self, coin_type: str = APT_COIN_TYPE):
+        self.coin_type = coin_type
+        serializer = Serializer()
+        serializer.uleb128(TransactionPayload.SCRIPT_FUNCTION)
+        ModuleId.from_str("0x1::coin").serialize(serializer)
+        serializer.str("transfer")
+        serializer.sequence([TypeTag(StructTag.from_str(coin_type))], Serializer.struct)
+        serializer.uleb128(2)  # argument count
+        self._payload_prefix = serializer.output()
+
+    def payload_bytes(self, recipient: str, amount_octas: int) -> bytes:
+        """BCS of the TransactionPayload."""
+        return b"".join((self._payload_prefix, _ADDRESS_ARG, address_bytes(recipient),
+                         _U64_ARG, _U64.pack(amount_octas)))
+
+    def raw_transaction_bytes(self, sender: Union[AccountAddress, str], sequence_number: int,
+                              recipient: str, amount_octas: int, max_gas_amount: int,
+                              gas_unit_price: int, expiration_timestamp_secs: int, chain_id: int) -> bytes:
+        """BCS of the complete RawTransaction, built in one pass."""
+        return b"".join((
+            _sender_bytes(sender),
+            _U64.pack(sequence_number),
+            self._payload_prefix,
+            _ADDRESS_ARG, address_bytes(recipient),
+            _U64_ARG, _U64.pack(amount_octas),
+            _TAIL.pack(max_gas_amount, gas_unit_price, expiration_timestamp_secs, chain_id),
+        ))
+
+    @staticmethod
+    def sign(account: Account, raw_transaction: bytes) -> SignedTransfer:
+        """Sign RawTransaction BCS; returns the SignedTransaction BCS and hash."""
+        authenticator = use_backend(account).sign_transaction(_SerializedRawTransaction(raw_transaction))
+        serializer = Serializer()
+        _transaction_authenticator(authenticator).serialize(serializer)
+        data = raw_transaction + serializer.output()
+        expiration = _TAIL.unpack_from(raw_transaction, len(raw_transaction) - _TAIL.size)[2]
+        return SignedTransfer(data, "0x" + hashlib.sha3_256(_USER_TXN_HASH_PREFIX + data).hexdigest(), expiration)
+
+
+# Shared template for APT transfers
+apt_transfer = CoinTransferTemplate()
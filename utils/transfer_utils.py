@@ -1,58 +1,163 @@
+import asyncio
 import logging
-from typing import Tuple, Optional
+import time
+from dataclasses import dataclass
+from typing import Iterable, List, Tuple, Optional
 
 from aptos_sdk.account import Account
-from aptos_sdk.transactions import EntryFunction
+from aptos_sdk.async_client import ApiError, RestClient
 from aptos_sdk.bcs import Serializer
 
+from utils.balance import apt_to_octas
+from utils.balance_cache import balance_cache
+from utils.client_pool import DEFAULT_NODE_URL, get_client
+from utils.confirmation_tracker import confirmation_tracker
+from utils.env import env_int
+from utils.gas import TRANSFER_MAX_GAS_AMOUNT, gas_estimator
+from utils.sequence_manager import get_sequence_manager, is_connect_error, is_rejection, is_sequence_error
+from utils.transfer_payload import SignedTransfer, address_bytes, apt_transfer
+
+# Transactions per /transactions/batch request (the node's default limit is 10)
+TRANSFER_BATCH_SIZE = env_int('TRANSFER_BATCH_SIZE', 10)
+
+SIGNED_TXN_CONTENT_TYPE = "application/x.aptos.signed_transaction+bcs"
+
+# Error text for a transaction accepted by the node but not yet committed
+UNCONFIRMED = "not confirmed yet; it may still commit"
+
+
+def is_unconfirmed(error: Optional[str]) -> bool:
+    """True if a transfer's error means it was sent but its outcome is not known yet."""
+    return error is not None and UNCONFIRMED in error
+
+
+async def sign_transfer(
+    client: RestClient,
+    sender_account: Account,
+    recipient_address: str,
+    amount_octas: int,
+    sequence_number: int,
+    speed: str = "normal"
+) -> SignedTransfer:
+    """Build and sign an APT transfer from the precompiled template, priced for ``speed``."""
+    gas = await gas_estimator.estimate(client)
+    raw_txn = apt_transfer.raw_transaction_bytes(
+        sender_account.address(),
+        sequence_number,
+        recipient_address,
+        amount_octas,
+        TRANSFER_MAX_GAS_AMOUNT,
+        gas.price(speed),
+        int(time.time()) + client.client_config.expiration_ttl,
+        await client.chain_id(),
+    )
+    return apt_transfer.sign(sender_account, raw_txn)
+
+
+async def _submit_signed(client: RestClient, signed: SignedTransfer) -> str:
+    """POST one signed transaction's BCS; returns the hash the node reports."""
+    response = await client.client.post(
+        f"{client.base_url}/transactions",
+        headers={"Content-Type": SIGNED_TXN_CONTENT_TYPE},
+        content=signed.data,
+    )
+    if response.status_code >= 400:
+        raise ApiError(response.text, response.status_code)
+    return response.json()["hash"]
+
+
+async def _node_has_transaction(client: RestClient, txn_hash: str) -> bool:
+    """True if the node knows ``txn_hash`` (pending or committed); False if not found or it can't say."""
+    try:
+        response = await client._get(endpoint=f"transactions/by_hash/{txn_hash}")
+    except Exception as e:
+        logging.debug(f"Lookup of {txn_hash} failed: {e}")
+        return False
+    return response.status_code == 200
+
+
 async def transfer_apt_async(
     sender_account: Account,
     recipient_address: str,
     amount_apt: float,
-    client_url: str = "https://testnet.aptoslabs.com/v1"
+    client_url: str = DEFAULT_NODE_URL,
+    wait: bool = False,
+    speed: str = "normal",
+    timeout: Optional[float] = None
 ) -> Tuple[bool, Optional[str], Optional[str]]:
     """
     Transfer APT from sender to recipient asynchronously.
 
+    The sequence number comes from the sender's process-wide
+    SequenceNumberManager, so concurrent transfers from one account do not
+    race or fetch it from the node each time. By default this returns as soon
+    as the node accepts the transaction; track it with
+    utils.confirmation_tracker to learn when it commits.
+
     Args:
         sender_account: The sender's Account object
         recipient_address: The recipient's address as a string
         amount_apt: Amount of APT to transfer
         client_url: The Aptos node URL
+        wait: Also wait (via the shared confirmation tracker) for the transaction to commit
+        speed: Gas price target: "deprioritized", "normal" or "prioritized"
+        timeout: With ``wait``, seconds to wait for the commit (default: until
+            the tracker gives up); check the error with ``is_unconfirmed``
 
     Returns:
         Tuple of (success_bool, transaction_hash, error_message)
     """
     try:
-        # Convert APT to octas
-        amount_in_octas = int(amount_apt * 100000000)
-
-        # Create BCS serializer for the amount
-        serializer = Serializer()
-        serializer.u64(amount_in_octas)
-        serialized_amount = serializer.output()
+        # Validate before reserving a sequence number
+        amount_octas = apt_to_octas(amount_apt)
+        address_bytes(recipient_address)
 
-        # Create transaction payload
-        payload = EntryFunction.natural(
-            "0x1::coin",
-            "transfer",
-            ["0x1::aptos_coin::AptosCoin"],
-            [recipient_address, serialized_amount]
-        )
+        # Shared pooled client and sequence numbers for this node
+        client = get_client(client_url)
+        sequence = get_sequence_manager(client, sender_account.address())
 
-        # Use async client directly
-        from aptos_sdk.async_client import RestClient
-        client = RestClient(client_url)
+        # One retry after a resync if the node rejects our sequence number
+        for attempt in range(2):
+            sequence_number = await sequence.next_sequence_number()
+            try:
+                signed = await sign_transfer(
+                    client, sender_account, recipient_address, amount_octas, sequence_number, speed
+                )
+            except Exception:
+                await sequence.release(sequence_number)  # nothing was sent
+                raise
+            try:
+                txn_hash = await _submit_signed(client, signed)
+                break
+            except Exception as e:
+                if is_rejection(e):
+                    await sequence.release(sequence_number, e)
+                    if attempt == 0 and is_sequence_error(e):
+                        logging.warning(f"Sequence number {sequence_number} rejected, retrying: {e}")
+                        continue
+                    raise
+                if is_connect_error(e):
+                    await sequence.release(sequence_number)  # never reached the node
+                    raise
+                # Timeout or server error after sending: the node may have accepted it
+                if await _node_has_transaction(client, signed.hash):
+                    txn_hash = signed.hash
+                    break
+                await sequence.abandon(sequence_number, expires_at=signed.expiration_timestamp_secs)
+                return False, signed.hash, f"Submission of {signed.hash} failed and may still land: {e}"
 
-        # Create and sign transaction
-        txn = await client.create_transaction(sender_account.address(), payload)
-        signed_txn = sender_account.sign_transaction(txn)
+        balance_cache.invalidate(sender_account.address(), recipient_address)
 
-        # Submit transaction
-        txn_hash = await client.submit_transaction(signed_txn)
-
-        # Wait for confirmation
-        await client.wait_for_transaction(txn_hash, timeout=30)
+        if wait:
+            confirmation = asyncio.wrap_future(confirmation_tracker.track(client, txn_hash))
+            try:
+                status = await asyncio.wait_for(asyncio.shield(confirmation), timeout)
+            except asyncio.TimeoutError:
+                status = "unknown"
+            if status == "unknown":
+                return False, txn_hash, f"Transaction {txn_hash} {UNCONFIRMED}"
+            if status != "completed":
+                return False, txn_hash, f"Transaction {txn_hash} {status}"
 
         return True, txn_hash, None
 
@@ -65,13 +170,151 @@ def transfer_apt_sync(
     sender_account: Account,
     recipient_address: str,
     amount_apt: float,
-    client_url: str = "https://testnet.aptoslabs.com/v1"
+    client_url: str = DEFAULT_NODE_URL,
+    wait: bool = False,
+    speed: str = "normal",
+    timeout: Optional[float] = None
 ) -> Tuple[bool, Optional[str], Optional[str]]:
     """
-    Synchronous wrapper using nest_asyncio
+    Synchronous wrapper running on the shared background event loop
     """
-    # Use our clean nest_asyncio implementation
     from utils.nest_runner import async_to_sync
     return async_to_sync(transfer_apt_async(
-        sender_account, recipient_address, amount_apt, client_url
-    ))
\ No newline at end of file
+        sender_account, recipient_address, amount_apt, client_url, wait, speed, timeout
+    ))
+
+
+
+@dataclass
+class BatchTransferResult:
+    """Outcome of one transfer in a batch; ``txn_hash`` is set even if rejected."""
+    recipient: str
+    amount_apt: float
+    txn_hash: Optional[str] = None
+    sequence_number: Optional[int] = None
+    accepted: bool = False
+    error: Optional[str] = None
+    uncertain: bool = False  # submission failed ambiguously; the node may still hold it
+
+
+async def _submit_batch(client: RestClient, signed_txns: List[SignedTransfer]) -> dict:
+    """POST signed transactions to /transactions/batch; returns {index: error message}."""
+    # BCS vector<SignedTransaction>: length prefix, then the elements back to back
+    serializer = Serializer()
+    serializer.uleb128(len(signed_txns))
+    response = await client.client.post(
+        f"{client.base_url}/transactions/batch",
+        headers={"Content-Type": SIGNED_TXN_CONTENT_TYPE},
+        content=b"".join([serializer.output()] + [signed.data for signed in signed_txns]),
+    )
+    if response.status_code >= 400:
+        raise ApiError(response.text, response.status_code)
+    failures = response.json().get("transaction_failures") or []
+    return {int(f["transaction_index"]): (f.get("error") or {}).get("message", "rejected") for f in failures}
+
+
+async def transfer_apt_batch_async(
+    sender_account: Account,
+    transfers: Iterable[Tuple[str, float]],
+    client_url: str = DEFAULT_NODE_URL,
+    batch_size: Optional[int] = None,
+    speed: str = "normal"
+) -> List[BatchTransferResult]:
+    """
+    Sign many APT transfers and submit them through the batch endpoint.
+
+    Sequence numbers are reserved up front from the sender's
+    SequenceNumberManager and transaction hashes are computed locally, so the
+    only node calls are one POST per ``batch_size`` transfers. This does not
+    wait for the transfers to commit.
+
+    Args:
+        sender_account: The sender's Account object
+        transfers: (recipient_address, amount_apt) pairs
+        client_url: The Aptos node URL
+        batch_size: Transactions per batch request (default TRANSFER_BATCH_SIZE)
+        speed: Gas price target: "deprioritized", "normal" or "prioritized"
+
+    Returns:
+        One BatchTransferResult per transfer, in input order
+    """
+    client = get_client(client_url)
+    sequence = get_sequence_manager(client, sender_account.address())
+    results = [BatchTransferResult(str(recipient), amount) for recipient, amount in transfers]
+
+    signed: List[Tuple[BatchTransferResult, SignedTransfer]] = []
+    for result in results:
+        try:
+            # Validate before reserving a sequence number
+            amount_octas = apt_to_octas(result.amount_apt)
+            address_bytes(result.recipient)
+        except Exception as e:
+            result.error = str(e)
+            continue
+        sequence_number = await sequence.next_sequence_number()
+        try:
+            signed_txn = await sign_transfer(
+                client, sender_account, result.recipient, amount_octas, sequence_number, speed
+            )
+        except Exception as e:
+            # Nothing was sent: the next transfer in the batch reuses the number, leaving no gap
+            await sequence.release(sequence_number)
+            result.error = str(e)
+            continue
+        result.sequence_number = sequence_number
+        result.txn_hash = signed_txn.hash
+        signed.append((result, signed_txn))
+
+    size = batch_size or TRANSFER_BATCH_SIZE
+
+    async def submit_chunk(chunk: List[Tuple[BatchTransferResult, SignedTransfer]]) -> None:
+        try:
+            failures = await _submit_batch(client, [signed_txn for _, signed_txn in chunk])
+        except Exception as e:
+            if is_rejection(e) or is_connect_error(e):
+                failures = {index: str(e) for index in range(len(chunk))}
+            else:
+                # Timeout or server error: whatever the node holds was accepted, the rest is unknown
+                held = await asyncio.gather(*(_node_has_transaction(client, t.hash) for _, t in chunk))
+                failures = {index: str(e) for index, found in enumerate(held) if not found}
+                for index in failures:
+                    chunk[index][0].uncertain = True
+        for index, (result, _) in enumerate(chunk):
+            if index in failures:
+                result.error = failures[index]
+            else:
+                result.accepted = True
+
+    await asyncio.gather(*(submit_chunk(signed[i:i + size]) for i in range(0, len(signed), size)))
+
+    # Hand rejected sequence numbers back, highest first so the counter can rewind;
+    # numbers with an unknown outcome are abandoned instead
+    for result in sorted(results, key=lambda r: -(r.sequence_number or 0)):
+        if result.sequence_number is not None and not result.accepted and not result.uncertain:
+            await sequence.release(result.sequence_number, ApiError(result.error, 400))
+    uncertain = [(result, signed_txn) for result, signed_txn in signed if result.uncertain]
+    if uncertain:
+        await sequence.abandon(*(result.sequence_number for result, _ in uncertain),
+                               expires_at=max(signed_txn.expiration_timestamp_secs for _, signed_txn in uncertain))
+
+    accepted = [r.recipient for r in results if r.accepted]
+    if accepted:
+        balance_cache.invalidate(sender_account.address(), *accepted)
+    logging.info(f"Batch transfer: {len(accepted)}/{len(results)} accepted")
+    return results
+
+
+def transfer_apt_batch_sync(
+    sender_account: Account,
+    transfers: Iterable[Tuple[str, float]],
+    client_url: str = DEFAULT_NODE_URL,
+    batch_size: Optional[int] = None,
+    speed: str = "normal"
+) -> List[BatchTransferResult]:
+    """
+    Synchronous wrapper running on the shared background event loop
+    """
+    from utils.nest_runner import async_to_sync
+    return async_to_sync(transfer_apt_batch_async(
+        sender_account, transfers, client_url, batch_size, speed
+    ))
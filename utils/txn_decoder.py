@@ -0,0 +1,198 @@
+"""
+Lean decoding of account transaction pages.
+
+A page of transactions from ``/accounts/{address}/transactions`` is mostly
+write-set ``changes``, ``events`` and signatures that the history view never
+uses. This module streams the response body through an incremental JSON
+parser and keeps only the fields the wallet needs, as compact
+TransactionRecord tuples. Neither the full document nor the per-transaction
+dicts are built.
+
+ijson (preferably its yajl2 C backend) is used when installed
+(``pip install 1p-wallet[fast-json]``). Without it, the decoder falls back to
+``json.loads`` on the buffered body and extracts the same records.
+"""
+
+import json
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from aptos_sdk.async_client import ApiError, RestClient
+
+try:
+    import ijson
+except ImportError:  # optional dependency
+    ijson = None
+
+
+class TransactionRecord(NamedTuple):
+    """The subset of a node transaction used by the wallet."""
+    hash: str
+    version: Optional[int]
+    type: str
+    sender: Optional[str]
+    sequence_number: Optional[int]
+    timestamp: int  # microseconds
+    success: Optional[bool]
+    function: Optional[str]
+    arguments: Tuple[Any, ...]  # scalar arguments; nested values are None
+
+
+def _int_or_none(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def record_from_dict(raw: Dict[str, Any]) -> TransactionRecord:
+    """Build a TransactionRecord from an already decoded transaction dict."""
+    payload = raw.get('payload') or {}
+    arguments = tuple(
+        arg if not isinstance(arg, (dict, list)) else None
+        for arg in payload.get('arguments') or ()
+    )
+    return TransactionRecord(
+        hash=raw.get('hash', ''),
+        version=_int_or_none(raw.get('version')),
+        type=raw.get('type', ''),
+        sender=raw.get('sender'),
+        sequence_number=_int_or_none(raw.get('sequence_number')),
+        timestamp=_int_or_none(raw.get('timestamp')) or 0,
+        success=raw.get('success'),
+        function=payload.get('function'),
+        arguments=arguments,
+    )
+
+
+_WANTED = frozenset(('hash', 'version', 'type', 'sender', 'sequence_number', 'timestamp', 'success'))
+_STARTS = frozenset(('start_map', 'start_array'))
+_ENDS = frozenset(('end_map', 'end_array'))
+
+# Nesting depth of the values we care about: [ {txn} ] -> txn fields at 2,
+# payload fields at 3, payload arguments at 4
+_TXN, _PAYLOAD, _ARGUMENT = 2, 3, 4
+
+
+class TransactionPageDecoder:
+    """
+    Push-based decoder: ``feed`` response chunks, then ``close`` for the records.
+
+    Uses ijson's basic (path-less) event stream when available and tracks the
+    nesting depth itself, which is much cheaper than ijson's prefixed events;
+    only the handful of wanted fields are ever materialized.
+    """
+
+    def __init__(self):
+        self.records: List[TransactionRecord] = []
+        self._fields: Dict[str, Any] = {}
+        self._arguments: List[Any] = []
+        self._depth = 0
+        self._key = None          # current key at transaction level
+        self._payload_key = None  # current key inside the payload
+        if ijson is not None:
+            self._events = ijson.sendable_list()
+            self._parser = ijson.basic_parse_coro(self._events)
+        else:
+            self._chunks: List[bytes] = []
+
+    def feed(self, chunk: bytes) -> None:
+        if ijson is None:
+            self._chunks.append(chunk)
+            return
+        self._parser.send(chunk)
+        self._consume()
+
+    def close(self) -> List[TransactionRecord]:
+        if ijson is None:
+            page = json.loads(b"".join(self._chunks))
+            self.records = [record_from_dict(raw) for raw in page]
+            return self.records
+        self._parser.close()
+        self._consume()
+        return self.records
+
+    def _consume(self) -> None:
+        depth, key, payload_key = self._depth, self._key, self._payload_key
+        fields, arguments = self._fields, self._arguments
+        for event, value in self._events:
+            if event == 'map_key':
+                if depth == _TXN:
+                    key = value
+                elif depth == _PAYLOAD and key == 'payload':
+                    payload_key = value
+            elif event in _STARTS:
+                if depth == _ARGUMENT and key == 'payload' and payload_key == 'arguments':
+                    arguments.append(None)  # nested argument (vector/struct)
+                depth += 1
+            elif event in _ENDS:
+                depth -= 1
+                if depth == 1 and event == 'end_map':
+                    self._finish_record()
+                    arguments = self._arguments
+                elif depth == _TXN:
+                    payload_key = None
+            elif depth == _TXN:
+                if key in _WANTED:
+                    fields[key] = value
+            elif key == 'payload':
+                if depth == _PAYLOAD and payload_key == 'function':
+                    fields['function'] = value
+                elif depth == _ARGUMENT and payload_key == 'arguments':
+                    arguments.append(value)
+        del self._events[:]
+        self._depth, self._key, self._payload_key = depth, key, payload_key
+
+    def _finish_record(self) -> None:
+        fields = self._fields
+        self.records.append(TransactionRecord(
+            hash=fields.get('hash', ''),
+            version=_int_or_none(fields.get('version')),
+            type=fields.get('type', ''),
+            sender=fields.get('sender'),
+            sequence_number=_int_or_none(fields.get('sequence_number')),
+            timestamp=_int_or_none(fields.get('timestamp')) or 0,
+            success=fields.get('success'),
+            function=fields.get('function'),
+            arguments=tuple(self._arguments),
+        ))
+        fields.clear()
+        self._arguments = []
+
+
+def decode_transactions(chunks: Iterable[bytes]) -> List[TransactionRecord]:
+    """Decode a transaction page given as an iterable of byte chunks."""
+    decoder = TransactionPageDecoder()
+    for chunk in chunks:
+        decoder.feed(chunk)
+    return decoder.close()
+
+
+async def fetch_transaction_records(client: RestClient, address, limit: int = 25,
+                                    start: Optional[int] = None) -> List[TransactionRecord]:
+    """
+    Fetch one page of an account's transactions as TransactionRecords.
+
+    Same request as ``RestClient.transactions_by_account``, but the body is
+    decoded while it streams in.
+
+    Args:
+        client: Aptos REST client
+        address: Account address
+        limit: Page size
+        start: Account sequence number to start from; latest page when omitted
+
+    Returns:
+        List of TransactionRecord in node order (oldest first)
+    """
+    params = {"limit": limit}
+    if start is not None:
+        params["start"] = start
+    url = f"{client.base_url}/accounts/{address}/transactions"
+    async with client.client.stream("GET", url, params=params) as response:
+        if response.status_code >= 400:
+            await response.aread()
+            raise ApiError(response.text, response.status_code)
+        decoder = TransactionPageDecoder()
+        async for chunk in response.aiter_bytes():
+            decoder.feed(chunk)
+        return decoder.close()